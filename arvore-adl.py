@@ -1,3 +1,12 @@
+import operator
+import sys
+from array import array
+from copy import copy
+
+from instrumentacao import ValorContado, ativar, desativar, medir_forma
+from serializacao import ChavesMapeadas, salvar_chaves
+
+
 class NoAVL:
     """
     Classe que representa um nó da árvore AVL.
@@ -23,9 +32,105 @@ class ArvoreAVL:
     tenham complexidade O(log n) no pior caso.
     """
     
+    # Na subida de rebalanceamento, se a altura de um nó não mudar,
+    # nenhum ancestral muda e a subida pode parar. Subclasses que guardam
+    # outras informações derivadas dos filhos precisam subir até a raiz.
+    _propagar_ate_raiz = False
+
+    # Um lote com pelo menos esta fração do tamanho da árvore é aplicado
+    # reconstruindo a árvore, em vez de uma descida por valor
+    _fracao_lote_grande = 0.5
+
     def __init__(self):
         self.raiz = None
-    
+        self._quantidade = 0        # Quantidade de valores (None = recontar)
+        self._modificacoes = 0      # Muda a cada alteração da estrutura (usado pelos cursores)
+
+    @classmethod
+    def construir(cls, valores):
+        """
+        Constrói uma árvore AVL perfeitamente balanceada a partir de um iterável.
+
+        Se os valores já vierem em ordem crescente, a construção é O(n):
+        o elemento do meio vira a raiz e cada metade vira uma subárvore,
+        sem nenhuma comparação de inserção ou rotação.
+
+        Entradas fora de ordem são ordenadas antes (O(n log n)) e valores
+        duplicados são descartados, mantendo a primeira ocorrência,
+        assim como acontece em inserir.
+        """
+        arvore = cls()
+        arvore._preencher_balanceada(valores)
+        return arvore
+
+    def _preencher_balanceada(self, valores):
+        """
+        Substitui o conteúdo desta árvore pela construção balanceada
+        descrita em construir.
+        """
+        valores = list(valores)
+
+        # Verifica em O(n) se a entrada já está estritamente crescente
+        ordenados = all(valores[i] < valores[i + 1] for i in range(len(valores) - 1))
+
+        if not ordenados:
+            # sorted é estável: entre valores iguais, o primeiro vem antes
+            valores = sorted(valores)
+            unicos = []
+            for valor in valores:
+                if not unicos or unicos[-1] < valor:
+                    unicos.append(valor)
+            valores = unicos
+
+        self.raiz = self._construir_recursivo(valores, 0, len(valores) - 1)
+        self._quantidade = len(valores)
+        self._modificacoes += 1
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Salva os valores num arquivo binário compacto: um cabeçalho seguido
+        do array ordenado dos valores, com largura fixa (ver serializacao.py).
+        tipo é o código do módulo array ('q' para inteiros de 64 bits).
+        """
+        salvar_chaves(caminho, self, tipo)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Reconstrói uma árvore salva por salvar em O(n), sem reinserir:
+        o arquivo é mapeado em memória e as chaves, que já estão em ordem,
+        vão direto para construir.
+
+        Para só consultar, sem construir nós, use ArvoreSomenteLeitura
+        (serializacao.py), que responde buscar com busca binária no arquivo.
+        """
+        with ChavesMapeadas(caminho) as chaves:
+            return cls.construir(chaves)
+
+    def _construir_recursivo(self, valores, inicio, fim):
+        """
+        Função auxiliar recursiva para a construção balanceada.
+        Cria o nó do meio do intervalo [inicio, fim] e liga as duas metades.
+        """
+        if inicio > fim:
+            return None
+
+        meio = (inicio + fim) // 2
+        no = self._criar_no(valores[meio])
+        no.esquerdo = self._construir_recursivo(valores, inicio, meio - 1)
+        no.direito = self._construir_recursivo(valores, meio + 1, fim)
+
+        # Filhos já têm altura correta, então basta atualizar este nó
+        self.atualizar_altura(no)
+        return no
+
+    def _criar_no(self, valor):
+        """
+        Cria um novo nó para a árvore.
+        Subclasses que guardam informações extras por nó sobrescrevem este método.
+        """
+        return NoAVL(valor)
+
     def obter_altura(self, no):
         """
         Retorna a altura de um nó.
@@ -57,8 +162,12 @@ class ArvoreAVL:
         A altura de um nó é 1 + a maior altura entre seus filhos.
         """
         if no:
-            no.altura = 1 + max(self.obter_altura(no.esquerdo), 
-                               self.obter_altura(no.direito))
+            # Lê as alturas direto dos filhos: esta função roda em toda
+            # rotação e em todo nível da subida do rebalanceamento
+            esquerdo = no.esquerdo
+            direito = no.direito
+            no.altura = 1 + max(esquerdo.altura if esquerdo else 0,
+                                direito.altura if direito else 0)
     
     def rotacao_direita(self, y):
         """
@@ -121,8 +230,58 @@ class ArvoreAVL:
     def inserir(self, valor):
         """
         Insere um valor na árvore AVL mantendo o balanceamento.
+        Retorna True se o valor foi inserido, False se ele já existia.
+        """
+        return self._inserir_iterativo(valor)[1]
+
+    def _inserir_iterativo(self, valor):
+        """
+        Versão iterativa da inserção.
+
+        Desce guardando o caminho numa pilha explícita (sem um frame Python
+        por nível) e depois sobe pela pilha rebalanceando.
+        Retorna o par (nó com o valor, True se o nó foi criado agora).
+        """
+        caminho = []
+        no = self.raiz
+        while no:
+            caminho.append(no)
+            if valor < no.valor:
+                no = no.esquerdo
+            elif valor > no.valor:
+                no = no.direito
+            else:
+                # Valores duplicados não são permitidos
+                return no, False
+
+        return self._anexar(caminho, valor)[0], True
+
+    def _anexar(self, caminho, valor):
+        """
+        Cria o nó de valor como filho do último nó do caminho (ou como raiz,
+        se o caminho estiver vazio) e rebalanceia subindo pelo caminho.
+
+        Retorna o trio (nó criado, caminho modificado, índice da rotação
+        mais próxima da raiz); os nós do caminho antes desse índice
+        continuam sendo os mesmos ancestrais.
         """
-        self.raiz = self._inserir_recursivo(self.raiz, valor)
+        novo = self._criar_no(valor)
+        if self._quantidade is not None:
+            self._quantidade += 1
+        self._modificacoes += 1
+
+        if not caminho:
+            self.raiz = novo
+            return novo, caminho, 0
+
+        caminho = self._caminho_mutavel(caminho)
+        pai = caminho[-1]
+        if valor < pai.valor:
+            pai.esquerdo = novo
+        else:
+            pai.direito = novo
+
+        return novo, caminho, self._rebalancear_caminho(caminho)
     
     def _inserir_recursivo(self, no, valor):
         """
@@ -137,7 +296,7 @@ class ArvoreAVL:
         
         # Passo 1: Inserção normal de BST
         if not no:
-            return NoAVL(valor)
+            return self._criar_no(valor)
         
         if valor < no.valor:
             no.esquerdo = self._inserir_recursivo(no.esquerdo, valor)
@@ -179,8 +338,321 @@ class ArvoreAVL:
     def remover(self, valor):
         """
         Remove um valor da árvore AVL mantendo o balanceamento.
+        Retorna True se o valor foi removido, False se ele não existia.
+        """
+        return self._remover_iterativo(valor)
+
+    def _remover_iterativo(self, valor):
+        """
+        Versão iterativa da remoção, com a mesma pilha de caminho da inserção.
+        """
+        caminho = []
+        no = self.raiz
+        while no:
+            if valor < no.valor:
+                caminho.append(no)
+                no = no.esquerdo
+            elif valor > no.valor:
+                caminho.append(no)
+                no = no.direito
+            else:
+                break
+
+        if not no:
+            return False
+
+        self._remover_no(caminho, no)
+        return True
+
+    def _remover_no(self, caminho, no):
+        """
+        Remove o nó dado, sendo caminho a pilha de seus ancestrais,
+        e rebalanceia subindo pelo caminho.
+
+        Retorna o par (caminho modificado, índice da rotação mais próxima
+        da raiz). O caminho pode ter ganho os nós até o sucessor inorder.
+        """
+        if self._quantidade is not None:
+            self._quantidade -= 1
+        self._modificacoes += 1
+
+        if no.esquerdo and no.direito:
+            # Nó com dois filhos: o sucessor inorder (menor valor da
+            # subárvore direita) toma o lugar do valor removido
+            caminho.append(no)
+            indice = len(caminho) - 1
+            sucessor = no.direito
+            while sucessor.esquerdo:
+                caminho.append(sucessor)
+                sucessor = sucessor.esquerdo
+
+            caminho = self._caminho_mutavel(caminho)
+            self._copiar_dados(caminho[indice], sucessor)
+
+            # O sucessor não tem filho esquerdo: é desligado pelo direito
+            no = sucessor
+            substituto = sucessor.direito
+        else:
+            # Nó com apenas um filho ou nenhum filho
+            substituto = no.esquerdo or no.direito
+            caminho = self._caminho_mutavel(caminho)
+
+        if not caminho:
+            self.raiz = substituto
+            return caminho, 0
+
+        pai = caminho[-1]
+        if pai.esquerdo is no:
+            pai.esquerdo = substituto
+        else:
+            pai.direito = substituto
+
+        return caminho, self._rebalancear_caminho(caminho)
+
+    def _caminho_mutavel(self, caminho):
+        """
+        Retorna os nós do caminho prontos para serem modificados.
+        Aqui é o próprio caminho; a versão persistente troca os nós por cópias.
+        """
+        return caminho
+
+    def _rebalancear_caminho(self, caminho):
+        """
+        Sobe pela pilha de nós visitados atualizando alturas e aplicando
+        rotações onde o fator de balanceamento passar de 1.
+
+        As alturas são lidas direto dos filhos, sem chamar obter_altura.
+        Se a altura de uma subárvore não mudou, os ancestrais também não
+        mudam e a subida termina ali mesmo.
+
+        Retorna o índice, no caminho, da rotação mais próxima da raiz
+        (ou len(caminho), se não houve rotação).
+        """
+        propagar = self._propagar_ate_raiz
+        atualizar = self.atualizar_altura
+        primeira_rotacao = len(caminho)
+
+        for i in range(len(caminho) - 1, -1, -1):
+            no = caminho[i]
+            altura_antiga = no.altura
+
+            esquerdo = no.esquerdo
+            direito = no.direito
+            altura_esquerda = esquerdo.altura if esquerdo else 0
+            altura_direita = direito.altura if direito else 0
+
+            if propagar:
+                atualizar(no)
+            else:
+                no.altura = 1 + (altura_esquerda if altura_esquerda > altura_direita
+                                 else altura_direita)
+
+            fator_balanceamento = altura_esquerda - altura_direita
+            if fator_balanceamento > 1 or fator_balanceamento < -1:
+                nova_raiz = self._balancear(no, fator_balanceamento)
+
+                # Religa a subárvore rotacionada ao pai (ou à raiz)
+                if i == 0:
+                    self.raiz = nova_raiz
+                elif caminho[i - 1].esquerdo is no:
+                    caminho[i - 1].esquerdo = nova_raiz
+                else:
+                    caminho[i - 1].direito = nova_raiz
+                no = nova_raiz
+                primeira_rotacao = i
+
+            if not propagar and no.altura == altura_antiga:
+                break
+
+        return primeira_rotacao
+
+    def _balancear(self, no, fator_balanceamento):
+        """
+        Aplica a rotação adequada a um nó desbalanceado e retorna a nova
+        raiz da subárvore. O caso é escolhido pelo fator do filho mais alto,
+        o que cobre tanto a inserção quanto a remoção.
+        """
+        if fator_balanceamento > 1:
+            # Caso 3: Rotação dupla esquerda-direita (Left-Right case)
+            if self.obter_fator_balanceamento(no.esquerdo) < 0:
+                no.esquerdo = self.rotacao_esquerda(no.esquerdo)
+            # Caso 1: Rotação simples à direita (Left-Left case)
+            return self.rotacao_direita(no)
+
+        # Caso 4: Rotação dupla direita-esquerda (Right-Left case)
+        if self.obter_fator_balanceamento(no.direito) > 0:
+            no.direito = self.rotacao_direita(no.direito)
+        # Caso 2: Rotação simples à esquerda (Right-Right case)
+        return self.rotacao_esquerda(no)
+
+    def inserir_muitos(self, valores):
+        """
+        Insere um lote de valores. Retorna quantos foram de fato inseridos.
+
+        O lote é ordenado primeiro. Se ele for grande em relação à árvore
+        (pelo menos _fracao_lote_grande do tamanho dela), a árvore é
+        reconstruída em O(n + k) intercalando o lote com a sequência
+        inorder atual. Caso contrário, os valores são inseridos em ordem
+        e cada descida reaproveita o trecho do caminho anterior que ainda
+        pode conter o próximo valor, em vez de recomeçar pela raiz.
+        """
+        lote = sorted(valores)
+        if not lote:
+            return 0
+        if len(lote) >= self._fracao_lote_grande * len(self):
+            return self._reconstruir_com_lote(lote, inserir=True)
+        return self._inserir_ordenados(lote)
+
+    def remover_muitos(self, valores):
+        """
+        Remove um lote de valores. Retorna quantos foram de fato removidos.
+        Usa as mesmas estratégias de inserir_muitos.
+        """
+        lote = sorted(valores)
+        if not lote or not self.raiz:
+            return 0
+        if len(lote) >= self._fracao_lote_grande * len(self):
+            return self._reconstruir_com_lote(lote, inserir=False)
+        return self._remover_ordenados(lote)
+
+    def _inserir_ordenados(self, lote):
+        """
+        Insere valores em ordem crescente reaproveitando o prefixo comum
+        dos caminhos de busca.
+
+        limites[i] é o limite superior (exclusivo) dos valores que cabem
+        na subárvore de caminho[i], ou None se não houver. Como o lote vem
+        em ordem crescente, o limite inferior já está garantido, então
+        basta desempilhar enquanto o valor não couber e descer dali.
+        Depois de uma rotação, só os ancestrais acima dela continuam válidos.
+        """
+        inseridos = 0
+        caminho = []
+        limites = []
+        for valor in lote:
+            while limites and limites[-1] is not None and not valor < limites[-1]:
+                caminho.pop()
+                limites.pop()
+
+            if caminho:
+                no = caminho.pop()
+                limite = limites.pop()
+            else:
+                no = self.raiz
+                limite = None
+
+            while no:
+                caminho.append(no)
+                limites.append(limite)
+                if valor < no.valor:
+                    limite = no.valor
+                    no = no.esquerdo
+                elif valor > no.valor:
+                    no = no.direito
+                else:
+                    break
+
+            if no:
+                # Valor já existe
+                continue
+
+            _, caminho, primeira_rotacao = self._anexar(caminho, valor)
+            del caminho[primeira_rotacao:]
+            del limites[primeira_rotacao:]
+            inseridos += 1
+        return inseridos
+
+    def _remover_ordenados(self, lote):
+        """
+        Remove valores em ordem crescente reaproveitando o prefixo comum
+        dos caminhos de busca, como _inserir_ordenados.
+        """
+        removidos = 0
+        caminho = []
+        limites = []
+        for valor in lote:
+            while limites and limites[-1] is not None and not valor < limites[-1]:
+                caminho.pop()
+                limites.pop()
+
+            if caminho:
+                no = caminho.pop()
+                limite = limites.pop()
+            else:
+                no = self.raiz
+                limite = None
+
+            while no:
+                if valor < no.valor:
+                    caminho.append(no)
+                    limites.append(limite)
+                    limite = no.valor
+                    no = no.esquerdo
+                elif valor > no.valor:
+                    caminho.append(no)
+                    limites.append(limite)
+                    no = no.direito
+                else:
+                    break
+
+            if not no:
+                continue
+
+            profundidade = len(caminho)
+            caminho, primeira_rotacao = self._remover_no(caminho, no)
+
+            # Descarta o trecho até o sucessor e tudo abaixo de uma rotação
+            corte = min(profundidade, primeira_rotacao)
+            del caminho[corte:]
+            del limites[corte:]
+            removidos += 1
+        return removidos
+
+    def _reconstruir_com_lote(self, lote, inserir):
+        """
+        Intercala o lote ordenado com os nós da árvore em ordem e religa
+        o resultado como uma árvore perfeitamente balanceada.
+        Os nós existentes são reaproveitados (com os dados que guardam).
+        """
+        nos = [self._copiar(no) for no in self._iterar_nos()]
+        resultado = []
+        alterados = 0
+        i = 0
+        for valor in lote:
+            while i < len(nos) and nos[i].valor < valor:
+                resultado.append(nos[i])
+                i += 1
+
+            existe = i < len(nos) and not valor < nos[i].valor
+            if inserir:
+                # Duplicados (na árvore ou no próprio lote) são ignorados
+                if not existe and (not resultado or resultado[-1].valor < valor):
+                    resultado.append(self._criar_no(valor))
+                    alterados += 1
+            elif existe:
+                i += 1
+                alterados += 1
+        resultado.extend(nos[i:])
+
+        self.raiz = self._religar_balanceada(resultado, 0, len(resultado) - 1)
+        self._quantidade = len(resultado)
+        self._modificacoes += 1
+        return alterados
+
+    def _religar_balanceada(self, nos, inicio, fim):
+        """
+        Liga os nós de nos[inicio..fim] (já em ordem) como uma subárvore
+        perfeitamente balanceada e retorna a sua raiz.
         """
-        self.raiz = self._remover_recursivo(self.raiz, valor)
+        if inicio > fim:
+            return None
+
+        meio = (inicio + fim) // 2
+        no = nos[meio]
+        no.esquerdo = self._religar_balanceada(nos, inicio, meio - 1)
+        no.direito = self._religar_balanceada(nos, meio + 1, fim)
+        self.atualizar_altura(no)
+        return no
     
     def _remover_recursivo(self, no, valor):
         """
@@ -211,7 +683,7 @@ class ArvoreAVL:
             temp = self._obter_menor_valor(no.direito)
             
             # Copiar o valor do sucessor inorder para este nó
-            no.valor = temp.valor
+            self._copiar_dados(no, temp)
             
             # Remover o sucessor inorder
             no.direito = self._remover_recursivo(no.direito, temp.valor)
@@ -264,7 +736,38 @@ class ArvoreAVL:
         Busca um valor na árvore.
         Retorna True se encontrado, False caso contrário.
         """
-        return self._buscar_recursivo(self.raiz, valor)
+        no = self.raiz
+        while no:
+            if valor < no.valor:
+                no = no.esquerdo
+            elif valor > no.valor:
+                no = no.direito
+            else:
+                return True
+        return False
+    
+    def _buscar_no(self, valor):
+        """
+        Busca iterativa que retorna o próprio nó com o valor, ou None.
+        """
+        no = self.raiz
+        while no:
+            if valor < no.valor:
+                no = no.esquerdo
+            elif valor > no.valor:
+                no = no.direito
+            else:
+                return no
+        return None
+
+    def _copiar_dados(self, destino, origem):
+        """
+        Copia para destino os dados guardados em origem.
+        Usado na remoção de um nó com dois filhos, quando o sucessor
+        inorder toma o lugar do valor removido. Subclasses que guardam
+        mais dados por nó copiam também esses campos.
+        """
+        destino.valor = origem.valor
     
     def _buscar_recursivo(self, no, valor):
         """
@@ -330,6 +833,400 @@ class ArvoreAVL:
             self._postorder_recursivo(no.direito, resultado)
             resultado.append(no.valor)
     
+    def __len__(self):
+        """
+        Retorna a quantidade de valores na árvore.
+        Depois de split, join e das operações de conjunto a quantidade é
+        recontada (em O(n)) no primeiro len().
+        """
+        if self._quantidade is None:
+            self._quantidade = sum(1 for _ in self._iterar_nos())
+        return self._quantidade
+
+    def __contains__(self, valor):
+        return self.buscar(valor)
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, sob demanda.
+        """
+        for no in self._iterar_nos():
+            yield no.valor
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, sob demanda.
+        """
+        for no in self._iterar_nos(reverso=True):
+            yield no.valor
+
+    def iter_inorder(self):
+        """
+        Versão preguiçosa de percorrer_inorder: gera os valores em ordem
+        crescente sem montar a lista inteira.
+        """
+        return iter(self)
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi, em ordem crescente
+        (ou decrescente, se reverse for True).
+
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+        O primeiro valor é encontrado em O(log n) e os seguintes são
+        produzidos sob demanda, então o custo cresce com a quantidade de
+        valores consumidos, e não com o tamanho da árvore.
+        """
+        for no in self._iterar_nos(lo, hi, reverse):
+            yield no.valor
+
+    def _iterar_nos(self, lo=None, hi=None, reverso=False):
+        """
+        Gera os nós com valor em [lo, hi] em ordem, usando uma pilha
+        explícita com no máximo O(log n) nós.
+
+        A pilha guarda os ancestrais ainda não visitados: depois de visitar
+        um nó, basta empilhar o caminho até o menor valor da sua subárvore
+        direita (ou o maior da esquerda, no percurso reverso).
+        """
+        pilha = []
+        no = self.raiz
+
+        if not reverso:
+            # Busca inicial: empilha apenas os nós >= lo no caminho até lo
+            while no:
+                if lo is not None and no.valor < lo:
+                    no = no.direito
+                else:
+                    pilha.append(no)
+                    no = no.esquerdo
+
+            while pilha:
+                no = pilha.pop()
+                if hi is not None and no.valor > hi:
+                    return
+                yield no
+
+                no = no.direito
+                while no:
+                    pilha.append(no)
+                    no = no.esquerdo
+        else:
+            # Busca inicial: empilha apenas os nós <= hi no caminho até hi
+            while no:
+                if hi is not None and no.valor > hi:
+                    no = no.esquerdo
+                else:
+                    pilha.append(no)
+                    no = no.direito
+
+            while pilha:
+                no = pilha.pop()
+                if lo is not None and no.valor < lo:
+                    return
+                yield no
+
+                no = no.esquerdo
+                while no:
+                    pilha.append(no)
+                    no = no.direito
+
+    def cursor(self, valor=None):
+        """
+        Retorna um CursorAVL posicionado no menor valor >= valor
+        (ou no menor valor da árvore, se valor for None).
+        """
+        return CursorAVL(self, valor)
+
+    def iter_preorder(self):
+        """
+        Versão preguiçosa de percorrer_preorder (raiz, esquerda, direita).
+        """
+        pilha = [self.raiz] if self.raiz else []
+        while pilha:
+            no = pilha.pop()
+            yield no.valor
+
+            # O direito entra primeiro para que o esquerdo saia antes
+            if no.direito:
+                pilha.append(no.direito)
+            if no.esquerdo:
+                pilha.append(no.esquerdo)
+
+    def iter_postorder(self):
+        """
+        Versão preguiçosa de percorrer_postorder (esquerda, direita, raiz).
+        """
+        pilha = []
+        ultimo_visitado = None
+        no = self.raiz
+        while no or pilha:
+            while no:
+                pilha.append(no)
+                no = no.esquerdo
+
+            topo = pilha[-1]
+            if topo.direito and topo.direito is not ultimo_visitado:
+                # A subárvore direita ainda não foi percorrida
+                no = topo.direito
+            else:
+                yield topo.valor
+                ultimo_visitado = pilha.pop()
+
+    def _de_raiz(self, raiz):
+        """
+        Cria uma árvore do mesmo tipo desta, com a raiz dada.
+        """
+        arvore = type(self)()
+        arvore.raiz = raiz
+        arvore._quantidade = None
+        return arvore
+
+    def _esvaziar(self):
+        """
+        Deixa a árvore vazia depois que seus nós foram passados adiante.
+        """
+        self.raiz = None
+        self._quantidade = 0
+        self._modificacoes += 1
+
+    def _copiar(self, no):
+        """
+        Retorna o nó que pode ser modificado no lugar de no.
+        Aqui os nós são reaproveitados; a versão persistente retorna uma cópia.
+        """
+        return no
+
+    def _rebalancear_no(self, no):
+        """
+        Atualiza a altura de um nó e o rotaciona se ele ficou desbalanceado.
+        Retorna a nova raiz da subárvore.
+        """
+        self.atualizar_altura(no)
+        fator_balanceamento = self.obter_fator_balanceamento(no)
+        if fator_balanceamento > 1 or fator_balanceamento < -1:
+            return self._balancear(no, fator_balanceamento)
+        return no
+
+    def _juntar(self, esquerda, meio, direita):
+        """
+        Junta duas subárvores AVL e um nó do meio, com todos os valores de
+        esquerda < meio.valor < todos os valores de direita.
+
+        Se as alturas diferem por no máximo 1, o nó do meio vira a raiz.
+        Caso contrário, ele desce pela borda da árvore mais alta até uma
+        subárvore com altura próxima à da mais baixa, e o rebalanceamento
+        sobe pelo mesmo caminho. O custo é O(|diferença de alturas| + 1).
+        """
+        altura_esquerda = self.obter_altura(esquerda)
+        altura_direita = self.obter_altura(direita)
+
+        if altura_esquerda > altura_direita + 1:
+            return self._juntar_direita(esquerda, meio, direita)
+        if altura_direita > altura_esquerda + 1:
+            return self._juntar_esquerda(esquerda, meio, direita)
+
+        meio = self._copiar(meio)
+        meio.esquerdo = esquerda
+        meio.direito = direita
+        self.atualizar_altura(meio)
+        return meio
+
+    def _juntar_direita(self, esquerda, meio, direita):
+        """
+        Caso de _juntar em que a esquerda é mais alta: desce pela borda
+        direita da esquerda.
+        """
+        if self.obter_altura(esquerda.direito) <= self.obter_altura(direita) + 1:
+            meio = self._copiar(meio)
+            meio.esquerdo = esquerda.direito
+            meio.direito = direita
+            self.atualizar_altura(meio)
+            novo_direito = meio
+        else:
+            novo_direito = self._juntar_direita(esquerda.direito, meio, direita)
+
+        esquerda = self._copiar(esquerda)
+        esquerda.direito = novo_direito
+        return self._rebalancear_no(esquerda)
+
+    def _juntar_esquerda(self, esquerda, meio, direita):
+        """
+        Caso de _juntar em que a direita é mais alta: desce pela borda
+        esquerda da direita.
+        """
+        if self.obter_altura(direita.esquerdo) <= self.obter_altura(esquerda) + 1:
+            meio = self._copiar(meio)
+            meio.esquerdo = esquerda
+            meio.direito = direita.esquerdo
+            self.atualizar_altura(meio)
+            novo_esquerdo = meio
+        else:
+            novo_esquerdo = self._juntar_esquerda(esquerda, meio, direita.esquerdo)
+
+        direita = self._copiar(direita)
+        direita.esquerdo = novo_esquerdo
+        return self._rebalancear_no(direita)
+
+    def _juntar_sem_meio(self, esquerda, direita):
+        """
+        Junta duas subárvores sem nó do meio: o maior nó da esquerda é
+        destacado e faz esse papel.
+        """
+        if not esquerda:
+            return direita
+        resto, ultimo = self._separar_ultimo(esquerda)
+        return self._juntar(resto, ultimo, direita)
+
+    def _separar_ultimo(self, no):
+        """
+        Destaca o maior nó da subárvore.
+        Retorna o par (subárvore sem ele, nó destacado).
+        """
+        if not no.direito:
+            return no.esquerdo, no
+        resto, ultimo = self._separar_ultimo(no.direito)
+        return self._juntar(no.esquerdo, no, resto), ultimo
+
+    def _dividir(self, no, valor):
+        """
+        Divide a subárvore em torno de valor.
+        Retorna a tripla (subárvore dos menores, nó igual a valor ou None,
+        subárvore dos maiores). Cada nível da descida faz um _juntar cujo
+        custo é a diferença de alturas, então o total é O(log n).
+        """
+        if not no:
+            return None, None, None
+
+        if valor < no.valor:
+            menores, igual, maiores = self._dividir(no.esquerdo, valor)
+            return menores, igual, self._juntar(maiores, no, no.direito)
+        if valor > no.valor:
+            menores, igual, maiores = self._dividir(no.direito, valor)
+            return self._juntar(no.esquerdo, no, menores), igual, maiores
+        return no.esquerdo, no, no.direito
+
+    def split(self, valor):
+        """
+        Divide a árvore em O(log n) e retorna o par (menores, maiores):
+        menores com os valores < valor e maiores com os valores >= valor.
+
+        Os nós são reaproveitados pelas duas novas árvores, então esta
+        árvore fica vazia.
+        """
+        menores, igual, maiores = self._dividir(self.raiz, valor)
+        if igual:
+            maiores = self._juntar(None, igual, maiores)
+
+        self._esvaziar()
+        return self._de_raiz(menores), self._de_raiz(maiores)
+
+    @classmethod
+    def join(cls, esquerda, direita):
+        """
+        Junta duas árvores em O(log n), desde que todos os valores de
+        esquerda sejam menores que todos os valores de direita.
+        Retorna a nova árvore; esquerda e direita ficam vazias.
+        """
+        if esquerda.raiz and direita.raiz:
+            maior = esquerda.raiz
+            while maior.direito:
+                maior = maior.direito
+            menor = direita.raiz
+            while menor.esquerdo:
+                menor = menor.esquerdo
+            if not maior.valor < menor.valor:
+                raise ValueError("os valores da esquerda devem ser menores que os da direita")
+
+        raiz = esquerda._juntar_sem_meio(esquerda.raiz, direita.raiz)
+        esquerda._esvaziar()
+        direita._esvaziar()
+        return esquerda._de_raiz(raiz)
+
+    def union(self, outra):
+        """
+        Retorna a união desta árvore com outra (para valores repetidos,
+        fica o nó desta árvore).
+
+        Cada nó desta árvore divide a outra e as metades são unidas
+        recursivamente e juntadas de volta, com custo O(m log(n/m + 1)),
+        sendo m e n os tamanhos da menor e da maior árvore.
+        Os nós das duas árvores são reaproveitados, então ambas ficam vazias.
+        """
+        raiz = self._unir(self.raiz, outra.raiz)
+        self._esvaziar()
+        outra._esvaziar()
+        return self._de_raiz(raiz)
+
+    def _unir(self, primeira, segunda):
+        if not primeira:
+            return segunda
+        if not segunda:
+            return primeira
+
+        esquerdo, direito = primeira.esquerdo, primeira.direito
+        menores, _, maiores = self._dividir(segunda, primeira.valor)
+        return self._juntar(self._unir(esquerdo, menores),
+                            primeira,
+                            self._unir(direito, maiores))
+
+    def intersection(self, outra):
+        """
+        Retorna a interseção desta árvore com outra, com o mesmo esquema
+        de divisão e junção de union. Ambas as árvores ficam vazias.
+        """
+        raiz = self._intersectar(self.raiz, outra.raiz)
+        self._esvaziar()
+        outra._esvaziar()
+        return self._de_raiz(raiz)
+
+    def _intersectar(self, primeira, segunda):
+        if not primeira or not segunda:
+            return None
+
+        esquerdo, direito = primeira.esquerdo, primeira.direito
+        menores, igual, maiores = self._dividir(segunda, primeira.valor)
+        esquerda = self._intersectar(esquerdo, menores)
+        direita = self._intersectar(direito, maiores)
+        if igual:
+            return self._juntar(esquerda, primeira, direita)
+        return self._juntar_sem_meio(esquerda, direita)
+
+    def difference(self, outra):
+        """
+        Retorna os valores desta árvore que não estão em outra, com o mesmo
+        esquema de divisão e junção de union. Ambas as árvores ficam vazias.
+        """
+        raiz = self._subtrair(self.raiz, outra.raiz)
+        self._esvaziar()
+        outra._esvaziar()
+        return self._de_raiz(raiz)
+
+    def _subtrair(self, primeira, segunda):
+        if not primeira or not segunda:
+            return primeira
+
+        esquerdo, direito = segunda.esquerdo, segunda.direito
+        menores, _, maiores = self._dividir(primeira, segunda.valor)
+        return self._juntar_sem_meio(self._subtrair(menores, esquerdo),
+                                     self._subtrair(maiores, direito))
+
+    def ativar_estatisticas(self):
+        """
+        Liga os contadores de buscas, comparações e rotações por caso
+        (ver instrumentacao.py) e retorna o objeto Estatisticas.
+
+        A classe do objeto passa a ser uma subclasse com InstrumentacaoAVL;
+        árvores sem estatísticas ligadas não pagam nenhum custo extra.
+        """
+        return ativar(self, InstrumentacaoAVL)
+
+    def desativar_estatisticas(self):
+        """
+        Desliga os contadores e devolve a árvore à sua classe original.
+        """
+        desativar(self, InstrumentacaoAVL)
+
     def imprimir_arvore(self):
         """
         Imprime a estrutura da árvore de forma visual.
@@ -362,9 +1259,1472 @@ class ArvoreAVL:
                 self._imprimir_recursivo(filho, novo_prefixo, eh_ultimo_filho)
 
 
-def exemplo_uso():
+class CursorAVL:
     """
-    Função de demonstração do uso da árvore AVL.
+    Cursor sobre uma ArvoreAVL que lembra a sua posição entre consultas.
+
+    O cursor guarda o caminho da raiz até o nó atual e, para cada nó do
+    caminho, o intervalo aberto (lo, hi) de valores que cabem na sua
+    subárvore. Assim:
+
+    - next e prev andam para o sucessor/antecessor em O(1) amortizado;
+    - seek(valor) sobe só até o primeiro ancestral cuja subárvore pode
+      conter valor e desce a partir dali. Para um alvo a d posições de
+      distância, isso costuma custar O(log d) em vez de O(log n); no pior
+      caso (alvo do outro lado de um ancestral alto) volta a O(log n).
+
+    Isso favorece acessos sequenciais, janelas deslizantes e junções por
+    intercalação entre duas árvores. Se a árvore for alterada, o cursor
+    percebe na próxima operação e se reposiciona pela raiz no valor em
+    que estava (ou no seguinte, se ele tiver sido removido).
+
+    Ao passar do fim ou do início, o cursor fica fora da árvore (valor
+    None) até o próximo seek.
+    """
+
+    def __init__(self, arvore, valor=None):
+        self.arvore = arvore
+        self._pilha = []            # Trios (nó, lo, hi) da raiz até o nó atual
+        self._valor = None          # Valor na posição atual
+        self._modificacoes = arvore._modificacoes
+        if valor is None:
+            self._descer_ao_menor(arvore.raiz, None, None)
+            self._posicionar()
+        else:
+            self.seek(valor)
+
+    @property
+    def valor(self):
+        """
+        Valor na posição atual, ou None se o cursor estiver fora da árvore.
+
+        O valor fica guardado no próprio cursor, e não é lido do nó no topo
+        da pilha: ao remover um nó com dois filhos, a árvore copia o
+        sucessor para dentro desse nó, e o cursor perderia a sua posição.
+        """
+        return self._valor
+
+    def _posicionar(self):
+        """
+        Guarda o valor do nó no topo da pilha como a posição atual e o retorna.
+        """
+        self._valor = self._pilha[-1][0].valor if self._pilha else None
+        return self._valor
+
+    def _sincronizar(self):
+        """
+        Reposiciona o cursor pela raiz se a árvore mudou desde a última operação.
+
+        Retorna True se o valor em que o cursor estava foi removido: nesse
+        caso o cursor já ficou no valor seguinte (ou fora da árvore, se não
+        houver seguinte), e next não deve avançar de novo.
+        """
+        if self._modificacoes == self.arvore._modificacoes:
+            return False
+        valor = self._valor
+        self._modificacoes = self.arvore._modificacoes
+        self._pilha = []
+        if valor is None:
+            return False
+        return self.seek(valor) != valor
+
+    def _descer_ao_menor(self, no, lo, hi):
+        """
+        Empilha o caminho de no até o menor valor da sua subárvore.
+        """
+        pilha = self._pilha
+        while no:
+            pilha.append((no, lo, hi))
+            hi = no.valor
+            no = no.esquerdo
+
+    def _descer_ao_maior(self, no, lo, hi):
+        """
+        Empilha o caminho de no até o maior valor da sua subárvore.
+        """
+        pilha = self._pilha
+        while no:
+            pilha.append((no, lo, hi))
+            lo = no.valor
+            no = no.direito
+
+    def next(self):
+        """
+        Avança para o sucessor e retorna o novo valor (None no fim).
+        """
+        if self._sincronizar():
+            return self._valor      # O reposicionamento já parou no sucessor
+        pilha = self._pilha
+        if not pilha:
+            return None
+
+        no, _, hi = pilha[-1]
+        if no.direito:
+            self._descer_ao_menor(no.direito, no.valor, hi)
+        else:
+            # Sobe enquanto estiver vindo de um filho direito
+            filho = pilha.pop()[0]
+            while pilha and pilha[-1][0].direito is filho:
+                filho = pilha.pop()[0]
+        return self._posicionar()
+
+    def prev(self):
+        """
+        Volta para o antecessor e retorna o novo valor (None no início).
+        """
+        removido = self._sincronizar()
+        pilha = self._pilha
+        if not pilha:
+            if removido:
+                # O valor removido era o maior: o antecessor é o novo máximo
+                self._descer_ao_maior(self.arvore.raiz, None, None)
+                return self._posicionar()
+            return None
+
+        no, lo, _ = pilha[-1]
+        if no.esquerdo:
+            self._descer_ao_maior(no.esquerdo, lo, no.valor)
+        else:
+            # Sobe enquanto estiver vindo de um filho esquerdo
+            filho = pilha.pop()[0]
+            while pilha and pilha[-1][0].esquerdo is filho:
+                filho = pilha.pop()[0]
+        return self._posicionar()
+
+    def seek(self, valor):
+        """
+        Posiciona o cursor no menor valor >= valor e o retorna
+        (None se todos os valores forem menores).
+        """
+        self._sincronizar()
+        pilha = self._pilha
+
+        # Sobe até o primeiro ancestral cuja subárvore pode conter valor
+        while pilha:
+            _, lo, hi = pilha[-1]
+            if (lo is None or lo < valor) and (hi is None or valor < hi):
+                break
+            pilha.pop()
+
+        if pilha:
+            no, lo, hi = pilha.pop()
+        else:
+            no, lo, hi = self.arvore.raiz, None, None
+
+        # Desce como numa busca comum, empilhando o caminho
+        while no:
+            pilha.append((no, lo, hi))
+            if valor < no.valor:
+                hi = no.valor
+                no = no.esquerdo
+            elif valor > no.valor:
+                lo = no.valor
+                no = no.direito
+            else:
+                return self._posicionar()
+
+        # Sem valor igual: o menor valor maior é o ancestral mais próximo
+        # em que a busca desceu pela esquerda
+        while pilha and pilha[-1][0].valor < valor:
+            pilha.pop()
+        return self._posicionar()
+
+    def __iter__(self):
+        """
+        Gera os valores a partir da posição atual, avançando o cursor.
+        """
+        valor = self.valor
+        while valor is not None:
+            yield valor
+            valor = self.next()
+
+
+class InstrumentacaoAVL:
+    """
+    Mixin usado por ArvoreAVL.ativar_estatisticas: conta as comparações
+    de cada busca e as rotações por caso (LL, RR, LR, RL) antes de
+    delegar para a classe original da árvore.
+    """
+
+    def buscar(self, valor):
+        self.estatisticas.buscas += 1
+        return super().buscar(ValorContado(valor, self.estatisticas))
+
+    def _balancear(self, no, fator_balanceamento):
+        if fator_balanceamento > 1:
+            caso = 'LR' if self.obter_fator_balanceamento(no.esquerdo) < 0 else 'LL'
+        else:
+            caso = 'RL' if self.obter_fator_balanceamento(no.direito) > 0 else 'RR'
+        self.estatisticas.rotacoes[caso] += 1
+        return super()._balancear(no, fator_balanceamento)
+
+    def relatorio_estatisticas(self, com_forma=True):
+        """
+        Retorna os contadores e, se com_forma for True, a altura e a
+        profundidade média atuais da árvore.
+        """
+        if not com_forma:
+            return self.estatisticas.resumo()
+        return self.estatisticas.resumo(*medir_forma(self.raiz, 'esquerdo', 'direito'))
+
+
+class NoAVLEstatistica(NoAVL):
+    """
+    Nó da árvore AVL com estatística de ordem.
+    Além dos campos do NoAVL, guarda o tamanho da subárvore enraizada nele.
+    """
+    def __init__(self, valor):
+        super().__init__(valor)
+        self.tamanho = 1            # Quantidade de nós na subárvore (o próprio nó conta)
+
+
+class ArvoreAVLEstatistica(ArvoreAVL):
+    """
+    Árvore AVL aumentada com o tamanho de cada subárvore.
+
+    O campo tamanho é recalculado em atualizar_altura, que já é chamada
+    nas rotações, na inserção e na remoção. Com ele, as consultas por
+    posição (rank, select e count_range) descem uma única vez pela árvore
+    em O(log n), sem montar a lista do percurso inorder.
+    """
+
+    # O tamanho muda em todos os ancestrais, mesmo quando a altura não muda
+    _propagar_ate_raiz = True
+
+    def _criar_no(self, valor):
+        return NoAVLEstatistica(valor)
+
+    def obter_tamanho(self, no):
+        """
+        Retorna o tamanho da subárvore de um nó.
+        Se o nó for None (inexistente), retorna 0.
+        """
+        if not no:
+            return 0
+        return no.tamanho
+
+    def atualizar_altura(self, no):
+        """
+        Atualiza a altura e o tamanho de um nó com base em seus filhos.
+        """
+        if no:
+            super().atualizar_altura(no)
+            no.tamanho = 1 + self.obter_tamanho(no.esquerdo) + self.obter_tamanho(no.direito)
+
+    def __len__(self):
+        return self.obter_tamanho(self.raiz)
+
+    def rank(self, valor):
+        """
+        Retorna quantos valores da árvore são estritamente menores que valor.
+        Se valor estiver na árvore, esta é a sua posição (começando em 0).
+        """
+        posicao = 0
+        no = self.raiz
+        while no:
+            if valor <= no.valor:
+                no = no.esquerdo
+            else:
+                # O nó e toda a sua subárvore esquerda são menores
+                posicao += self.obter_tamanho(no.esquerdo) + 1
+                no = no.direito
+        return posicao
+
+    def select(self, k):
+        """
+        Retorna o k-ésimo menor valor da árvore, com k começando em 0.
+        Índices negativos contam a partir do maior valor, como em listas.
+        """
+        tamanho = len(self)
+        if k < 0:
+            k += tamanho
+        if k < 0 or k >= tamanho:
+            raise IndexError("posição fora da árvore")
+
+        no = self.raiz
+        while True:
+            tamanho_esquerdo = self.obter_tamanho(no.esquerdo)
+            if k < tamanho_esquerdo:
+                no = no.esquerdo
+            elif k == tamanho_esquerdo:
+                return no.valor
+            else:
+                k -= tamanho_esquerdo + 1
+                no = no.direito
+
+    def count_range(self, lo, hi):
+        """
+        Conta os valores v da árvore com lo <= v <= hi.
+        """
+        if hi < lo:
+            return 0
+
+        # Quantidade de valores menores ou iguais a hi
+        ate_hi = 0
+        no = self.raiz
+        while no:
+            if hi < no.valor:
+                no = no.esquerdo
+            else:
+                ate_hi += self.obter_tamanho(no.esquerdo) + 1
+                no = no.direito
+
+        return ate_hi - self.rank(lo)
+
+
+class NoAVLAgregado(NoAVL):
+    """
+    Nó da árvore AVL com um agregado (soma, mínimo, máximo...) de todos
+    os valores da subárvore enraizada nele.
+    """
+    def __init__(self, valor, agregado):
+        super().__init__(valor)
+        self.agregado = agregado    # Agregado da subárvore (o próprio nó incluído)
+
+
+class ArvoreAVLAgregada(ArvoreAVL):
+    """
+    Árvore AVL com um agregado por subárvore, para consultas de intervalo.
+
+    O agregado é definido por um monoide: combinar(a, b) precisa ser
+    associativa e neutro é o seu elemento neutro. extrair(valor) dá a
+    contribuição de cada valor (por padrão, o próprio valor). Exemplos:
+
+    - soma: ArvoreAVLAgregada()  (combinar=operator.add, neutro=0)
+    - mínimo: ArvoreAVLAgregada(min, float('inf'))
+    - máximo: ArvoreAVLAgregada(max, float('-inf'))
+
+    O agregado de cada nó é recalculado em atualizar_altura, que já roda
+    nas rotações e na subida do rebalanceamento, então aggregate(lo, hi)
+    responde em O(log n) combinando subárvores inteiras.
+    """
+
+    # O agregado muda em todos os ancestrais, mesmo quando a altura não muda
+    _propagar_ate_raiz = True
+
+    def __init__(self, combinar=operator.add, neutro=0, extrair=None):
+        super().__init__()
+        self.combinar = combinar
+        self.neutro = neutro
+        self.extrair = extrair if extrair is not None else (lambda valor: valor)
+
+    @classmethod
+    def construir(cls, valores, combinar=operator.add, neutro=0, extrair=None):
+        """
+        Constrói a árvore balanceada em O(n) (com valores ordenados),
+        como ArvoreAVL.construir, usando o monoide dado.
+        """
+        arvore = cls(combinar, neutro, extrair)
+        arvore._preencher_balanceada(valores)
+        return arvore
+
+    def _de_raiz(self, raiz):
+        arvore = type(self)(self.combinar, self.neutro, self.extrair)
+        arvore.raiz = raiz
+        arvore._quantidade = None
+        return arvore
+
+    def _criar_no(self, valor):
+        return NoAVLAgregado(valor, self.extrair(valor))
+
+    def atualizar_altura(self, no):
+        """
+        Atualiza a altura e o agregado de um nó com base em seus filhos,
+        sempre na ordem esquerda, nó, direita.
+        """
+        if no:
+            super().atualizar_altura(no)
+            agregado = self.extrair(no.valor)
+            if no.esquerdo:
+                agregado = self.combinar(no.esquerdo.agregado, agregado)
+            if no.direito:
+                agregado = self.combinar(agregado, no.direito.agregado)
+            no.agregado = agregado
+
+    def aggregate(self, lo=None, hi=None):
+        """
+        Retorna o agregado dos valores v com lo <= v <= hi, em O(log n).
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+
+        Primeiro desce até o nó onde os caminhos de lo e hi se separam.
+        Depois, do lado esquerdo, soma as subárvores inteiras à direita do
+        caminho de lo; do lado direito, as subárvores à esquerda do de hi.
+        """
+        no = self.raiz
+        while no:
+            if lo is not None and no.valor < lo:
+                no = no.direito
+            elif hi is not None and no.valor > hi:
+                no = no.esquerdo
+            else:
+                break
+
+        if not no:
+            return self.neutro
+
+        resultado = self.combinar(self._agregar_a_partir(no.esquerdo, lo),
+                                  self.extrair(no.valor))
+        return self.combinar(resultado, self._agregar_ate(no.direito, hi))
+
+    def _agregar_a_partir(self, no, lo):
+        """
+        Agregado dos valores >= lo na subárvore de no.
+        """
+        resultado = self.neutro
+        while no:
+            if lo is None:
+                return self.combinar(no.agregado, resultado)
+
+            if no.valor < lo:
+                no = no.direito
+            else:
+                # O nó e sua subárvore direita entram; o que ainda falta
+                # (na subárvore esquerda) fica à esquerda do que já foi somado
+                parte = self.extrair(no.valor)
+                if no.direito:
+                    parte = self.combinar(parte, no.direito.agregado)
+                resultado = self.combinar(parte, resultado)
+                no = no.esquerdo
+        return resultado
+
+    def _agregar_ate(self, no, hi):
+        """
+        Agregado dos valores <= hi na subárvore de no.
+        """
+        resultado = self.neutro
+        while no:
+            if hi is None:
+                return self.combinar(resultado, no.agregado)
+
+            if no.valor > hi:
+                no = no.esquerdo
+            else:
+                parte = self.extrair(no.valor)
+                if no.esquerdo:
+                    parte = self.combinar(no.esquerdo.agregado, parte)
+                resultado = self.combinar(resultado, parte)
+                no = no.direito
+        return resultado
+
+
+class NoIntervalo(NoAVL):
+    """
+    Nó da árvore de intervalos: o valor é a tupla (inicio, fim) e o nó
+    guarda também o maior fim de todos os intervalos da sua subárvore.
+    """
+    def __init__(self, valor):
+        super().__init__(valor)
+        self.maior_fim = valor[1]   # Maior fim entre os intervalos da subárvore
+
+
+class ArvoreIntervalos(ArvoreAVL):
+    """
+    Árvore de intervalos sobre o balanceamento da árvore AVL.
+
+    Cada valor é um intervalo fechado (inicio, fim). As tuplas são
+    comparadas primeiro pelo início, então a árvore fica ordenada pelo
+    início dos intervalos (intervalos com o mesmo início são ordenados
+    pelo fim). O campo maior_fim é recalculado em atualizar_altura e
+    acompanha as mesmas rotações da ArvoreAVL.
+
+    Nas consultas, uma subárvore cujo maior_fim fica antes do início da
+    consulta é descartada inteira, e o percurso termina no primeiro
+    intervalo que começa depois do fim da consulta.
+    """
+
+    # O maior fim muda em todos os ancestrais, mesmo quando a altura não muda
+    _propagar_ate_raiz = True
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Não suportado: o formato binário de ArvoreAVL.salvar guarda números
+        de largura fixa, e os valores desta árvore são pares (inicio, fim).
+        """
+        raise TypeError("ArvoreIntervalos não pode ser salva: o formato binário não guarda intervalos")
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Não suportado, pelo mesmo motivo de salvar.
+        """
+        raise TypeError("ArvoreIntervalos não pode ser carregada: o formato binário não guarda intervalos")
+
+    def _criar_no(self, valor):
+        inicio, fim = valor
+        if fim < inicio:
+            raise ValueError(f"intervalo inválido: fim {fim} antes do início {inicio}")
+        return NoIntervalo(valor)
+
+    def atualizar_altura(self, no):
+        """
+        Atualiza a altura e o maior fim de um nó com base em seus filhos.
+        """
+        if no:
+            super().atualizar_altura(no)
+            maior_fim = no.valor[1]
+            if no.esquerdo and no.esquerdo.maior_fim > maior_fim:
+                maior_fim = no.esquerdo.maior_fim
+            if no.direito and no.direito.maior_fim > maior_fim:
+                maior_fim = no.direito.maior_fim
+            no.maior_fim = maior_fim
+
+    def algum_sobreposto(self, inicio, fim=None):
+        """
+        Retorna um intervalo que se sobrepõe a [inicio, fim] (ou ao ponto
+        inicio, se fim for None), ou None se não houver nenhum. O(log n).
+        """
+        if fim is None:
+            fim = inicio
+
+        no = self.raiz
+        while no:
+            comeco, final = no.valor
+            if comeco <= fim and inicio <= final:
+                return no.valor
+
+            # Se algum intervalo da esquerda alcança o início da consulta,
+            # a esquerda tem uma resposta ou nenhum intervalo à direita tem
+            if no.esquerdo and no.esquerdo.maior_fim >= inicio:
+                no = no.esquerdo
+            else:
+                no = no.direito
+        return None
+
+    def sobrepostos(self, inicio, fim=None):
+        """
+        Gera, em ordem de início, todos os intervalos que se sobrepõem a
+        [inicio, fim] (ou ao ponto inicio, se fim for None).
+
+        Percorre em ordem com uma pilha explícita, pulando subárvores com
+        maior_fim < inicio e parando no primeiro intervalo que começa
+        depois de fim. Com k intervalos na resposta, o custo no pior caso
+        é O(min(n, k log n)), e não O(log n + k): uma subárvore que não é
+        pulada pode ter o maior_fim vindo de um intervalo que começa depois
+        de fim, e a descida até ele não devolve nada.
+        """
+        if fim is None:
+            fim = inicio
+
+        pilha = []
+        no = self.raiz
+        while no or pilha:
+            while no and no.maior_fim >= inicio:
+                pilha.append(no)
+                no = no.esquerdo
+
+            if not pilha:
+                return
+
+            no = pilha.pop()
+            comeco, final = no.valor
+            if comeco > fim:
+                return
+            if final >= inicio:
+                yield no.valor
+            no = no.direito
+
+
+class NoMapaAVL(NoAVL):
+    """
+    Nó do mapa ordenado: o valor do NoAVL é a chave, e o conteúdo
+    associado a ela fica no próprio nó.
+    """
+    def __init__(self, valor, conteudo=None):
+        super().__init__(valor)
+        self.conteudo = conteudo    # Dado associado à chave
+
+
+class MapaAVL(ArvoreAVL):
+    """
+    Mapa ordenado (chave -> conteúdo) sobre a árvore AVL.
+
+    Cada nó guarda a chave no campo valor e o dado associado em conteudo,
+    então não é preciso manter um dict paralelo. Inserção, busca e remoção
+    usam os mesmos caminhos iterativos, rotações e rebalanceamento da
+    ArvoreAVL: cada operação do mapa é uma única descida O(log n).
+    """
+
+    @classmethod
+    def construir(cls, pares):
+        """
+        Constrói um mapa balanceado a partir de pares (chave, conteúdo).
+        Com as chaves já em ordem crescente, a construção é O(n).
+        Se uma chave se repetir, vale o último conteúdo, como em mapa[chave] = conteudo.
+        """
+        pares = list(pares)
+        if not all(pares[i][0] < pares[i + 1][0] for i in range(len(pares) - 1)):
+            unicos = []
+            for par in sorted(pares, key=lambda par: par[0]):
+                if unicos and not unicos[-1][0] < par[0]:
+                    unicos[-1] = par
+                else:
+                    unicos.append(par)
+            pares = unicos
+
+        mapa = cls()
+        mapa.raiz = mapa._construir_recursivo([chave for chave, _ in pares], 0, len(pares) - 1)
+        for no, (_, conteudo) in zip(mapa._iterar_nos(), pares):
+            no.conteudo = conteudo
+        mapa._quantidade = len(pares)
+        return mapa
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Não suportado: o formato binário de ArvoreAVL.salvar só guarda as
+        chaves, e os conteúdos seriam perdidos sem aviso.
+        """
+        raise TypeError("MapaAVL não pode ser salvo: o formato binário guarda só as chaves")
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Não suportado, pelo mesmo motivo de salvar.
+        """
+        raise TypeError("MapaAVL não pode ser carregado: o formato binário guarda só as chaves")
+
+    def _criar_no(self, valor):
+        return NoMapaAVL(valor)
+
+    def _copiar_dados(self, destino, origem):
+        destino.valor = origem.valor
+        destino.conteudo = origem.conteudo
+
+    def __contains__(self, chave):
+        return self._buscar_no(chave) is not None
+
+    def __getitem__(self, chave):
+        no = self._buscar_no(chave)
+        if no is None:
+            raise KeyError(chave)
+        return no.conteudo
+
+    def __setitem__(self, chave, conteudo):
+        no, _ = self._inserir_iterativo(chave)
+        no.conteudo = conteudo
+
+    def __delitem__(self, chave):
+        if not self.remover(chave):
+            raise KeyError(chave)
+
+    def inserir(self, chave, conteudo=None):
+        """
+        Insere a chave com o conteúdo dado, se ela ainda não existir.
+        Retorna True se a chave foi inserida, False se ela já existia
+        (nesse caso o conteúdo antigo é mantido).
+        """
+        no, criado = self._inserir_iterativo(chave)
+        if criado:
+            no.conteudo = conteudo
+        return criado
+
+    def get(self, chave, padrao=None):
+        """
+        Retorna o conteúdo da chave, ou padrao se ela não existir.
+        """
+        no = self._buscar_no(chave)
+        return padrao if no is None else no.conteudo
+
+    def setdefault(self, chave, padrao=None):
+        """
+        Retorna o conteúdo da chave. Se ela não existir, insere com o
+        conteúdo padrao e o retorna, na mesma descida.
+        """
+        no, criado = self._inserir_iterativo(chave)
+        if criado:
+            no.conteudo = padrao
+        return no.conteudo
+
+    def keys(self, lo=None, hi=None, reverse=False):
+        """
+        Gera as chaves k com lo <= k <= hi, em ordem, sob demanda.
+        """
+        return self.iter_range(lo, hi, reverse)
+
+    def values(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os conteúdos das chaves k com lo <= k <= hi, em ordem de chave.
+        """
+        for no in self._iterar_nos(lo, hi, reverse):
+            yield no.conteudo
+
+    def items(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os pares (chave, conteúdo) com lo <= chave <= hi, em ordem.
+        Como em iter_range, o primeiro par é encontrado em O(log n) e os
+        demais são produzidos sob demanda.
+        """
+        for no in self._iterar_nos(lo, hi, reverse):
+            yield no.valor, no.conteudo
+
+
+class NoMultiAVL(NoAVL):
+    """
+    Nó do multiconjunto: guarda um valor e quantas vezes ele aparece.
+    """
+    def __init__(self, valor):
+        super().__init__(valor)
+        self.contagem = 1           # Quantidade de ocorrências do valor
+
+
+class MultiConjuntoAVL(ArvoreAVL):
+    """
+    Multiconjunto (conjunto com repetições) sobre a árvore AVL.
+
+    Em vez de um nó por ocorrência, cada valor distinto tem um único nó
+    com a sua contagem. A memória cresce com a quantidade de valores
+    distintos, e inserir um valor que já existe só incrementa a contagem,
+    sem alocar nó e sem rotação.
+
+    len() é o total de ocorrências; distintos() é a quantidade de nós.
+    Como em collections.Counter, iterar percorre os valores distintos e
+    elementos() repete cada valor pela sua contagem. Também como no
+    Counter (|, & e -), union fica com a maior contagem de cada valor,
+    intersection com a menor e difference subtrai as contagens.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._total = 0             # Total de ocorrências (None = recontar)
+
+    @classmethod
+    def construir(cls, valores):
+        """
+        Constrói o multiconjunto balanceado a partir de um iterável com
+        repetições. Com os valores já em ordem, a construção é O(n).
+        """
+        valores = list(valores)
+        if not all(not valores[i + 1] < valores[i] for i in range(len(valores) - 1)):
+            valores = sorted(valores)
+
+        distintos = []
+        contagens = []
+        for valor in valores:
+            if distintos and not distintos[-1] < valor:
+                contagens[-1] += 1
+            else:
+                distintos.append(valor)
+                contagens.append(1)
+
+        multiconjunto = cls()
+        multiconjunto._preencher_balanceada(distintos)
+        for no, contagem in zip(multiconjunto._iterar_nos(), contagens):
+            no.contagem = contagem
+        multiconjunto._total = len(valores)
+        return multiconjunto
+
+    def _criar_no(self, valor):
+        return NoMultiAVL(valor)
+
+    def _copiar_dados(self, destino, origem):
+        destino.valor = origem.valor
+        destino.contagem = origem.contagem
+
+    def _de_raiz(self, raiz):
+        multiconjunto = super()._de_raiz(raiz)
+        multiconjunto._total = None
+        return multiconjunto
+
+    def _esvaziar(self):
+        super()._esvaziar()
+        self._total = 0
+
+    def _unir(self, primeira, segunda):
+        if not primeira:
+            return segunda
+        if not segunda:
+            return primeira
+
+        esquerdo, direito = primeira.esquerdo, primeira.direito
+        menores, igual, maiores = self._dividir(segunda, primeira.valor)
+        if igual and igual.contagem > primeira.contagem:
+            primeira.contagem = igual.contagem
+        return self._juntar(self._unir(esquerdo, menores),
+                            primeira,
+                            self._unir(direito, maiores))
+
+    def _intersectar(self, primeira, segunda):
+        if not primeira or not segunda:
+            return None
+
+        esquerdo, direito = primeira.esquerdo, primeira.direito
+        menores, igual, maiores = self._dividir(segunda, primeira.valor)
+        esquerda = self._intersectar(esquerdo, menores)
+        direita = self._intersectar(direito, maiores)
+        if igual:
+            primeira.contagem = min(primeira.contagem, igual.contagem)
+            return self._juntar(esquerda, primeira, direita)
+        return self._juntar_sem_meio(esquerda, direita)
+
+    def _subtrair(self, primeira, segunda):
+        if not primeira or not segunda:
+            return primeira
+
+        esquerdo, direito = segunda.esquerdo, segunda.direito
+        menores, igual, maiores = self._dividir(primeira, segunda.valor)
+        esquerda = self._subtrair(menores, esquerdo)
+        direita = self._subtrair(maiores, direito)
+        if igual and igual.contagem > segunda.contagem:
+            # Sobram ocorrências: o nó fica com a diferença das contagens
+            igual.contagem -= segunda.contagem
+            return self._juntar(esquerda, igual, direita)
+        return self._juntar_sem_meio(esquerda, direita)
+
+    def __len__(self):
+        if self._total is None:
+            self._total = sum(no.contagem for no in self._iterar_nos())
+        return self._total
+
+    def distintos(self):
+        """
+        Retorna a quantidade de valores distintos (nós da árvore).
+        """
+        return super().__len__()
+
+    def inserir(self, valor, quantidade=1):
+        """
+        Acrescenta quantidade ocorrências do valor e retorna a nova contagem.
+        Se o valor já existe, só a contagem do nó muda.
+        Lança ValueError se quantidade não for positiva.
+        """
+        if quantidade <= 0:
+            raise ValueError(f"a quantidade deve ser positiva, não {quantidade}")
+        no, criado = self._inserir_iterativo(valor)
+        if criado:
+            no.contagem = quantidade
+        else:
+            no.contagem += quantidade
+        if self._total is not None:
+            self._total += quantidade
+        return no.contagem
+
+    def remover(self, valor, quantidade=1):
+        """
+        Retira até quantidade ocorrências do valor e retorna quantas foram
+        de fato retiradas. O nó só sai da árvore quando a contagem zera.
+        Lança ValueError se quantidade não for positiva.
+        """
+        if quantidade <= 0:
+            raise ValueError(f"a quantidade deve ser positiva, não {quantidade}")
+        return self._retirar(valor, quantidade)
+
+    def remover_todos(self, valor):
+        """
+        Retira todas as ocorrências do valor e retorna quantas eram.
+        """
+        return self._retirar(valor, None)
+
+    def _retirar(self, valor, quantidade):
+        """
+        Retira quantidade ocorrências (todas, se quantidade for None) com
+        uma única descida: a contagem diminui no próprio nó, e só quando
+        ela zera o nó é removido pelo caminho já guardado.
+        """
+        caminho = []
+        no = self.raiz
+        while no:
+            if valor < no.valor:
+                caminho.append(no)
+                no = no.esquerdo
+            elif valor > no.valor:
+                caminho.append(no)
+                no = no.direito
+            else:
+                break
+
+        if not no:
+            return 0
+
+        if quantidade is not None and no.contagem > quantidade:
+            no.contagem -= quantidade
+            retiradas = quantidade
+        else:
+            retiradas = no.contagem
+            self._remover_no(caminho, no)
+
+        if self._total is not None:
+            self._total -= retiradas
+        return retiradas
+
+    def contar(self, valor):
+        """
+        Retorna quantas vezes o valor aparece (0 se não aparecer).
+        """
+        no = self._buscar_no(valor)
+        return 0 if no is None else no.contagem
+
+    def inserir_muitos(self, valores):
+        """
+        Acrescenta um lote de ocorrências. Repetições dentro do lote são
+        agrupadas antes, com uma única descida por valor distinto.
+        Retorna o total de ocorrências acrescentadas.
+        """
+        lote = sorted(valores)
+        i = 0
+        while i < len(lote):
+            j = i + 1
+            while j < len(lote) and not lote[i] < lote[j]:
+                j += 1
+            self.inserir(lote[i], j - i)
+            i = j
+        return len(lote)
+
+    def remover_muitos(self, valores):
+        """
+        Retira um lote de ocorrências, agrupando repetições como em
+        inserir_muitos. Retorna o total de ocorrências retiradas.
+        """
+        lote = sorted(valores)
+        retiradas = 0
+        i = 0
+        while i < len(lote):
+            j = i + 1
+            while j < len(lote) and not lote[i] < lote[j]:
+                j += 1
+            retiradas += self.remover(lote[i], j - i)
+            i = j
+        return retiradas
+
+    def items(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os pares (valor, contagem) com lo <= valor <= hi, em ordem.
+        """
+        for no in self._iterar_nos(lo, hi, reverse):
+            yield no.valor, no.contagem
+
+    def elementos(self):
+        """
+        Gera cada valor em ordem, repetido pela sua contagem.
+        """
+        for no in self._iterar_nos():
+            for _ in range(no.contagem):
+                yield no.valor
+
+
+class ArvoreAVLPersistente(ArvoreAVL):
+    """
+    Árvore AVL persistente, por cópia de caminho.
+
+    Nenhum nó que já faz parte de uma versão é modificado: inserção e
+    remoção copiam apenas os O(log n) nós do caminho que tocam (e os nós
+    envolvidos em rotações), e a nova raiz passa a apontar para essas
+    cópias. O resto da árvore é compartilhado entre as versões.
+
+    Com isso, snapshot() é O(1): a versão capturada guarda a raiz atual,
+    que continua válida e iterável enquanto novas atualizações acontecem,
+    sem cópia global e sem travas para os leitores.
+    """
+
+    def _copiar(self, no):
+        """
+        Retorna uma cópia rasa do nó (os filhos continuam compartilhados).
+        """
+        return copy(no)
+
+    def _caminho_mutavel(self, caminho):
+        """
+        Troca cada nó do caminho por uma cópia e religa as cópias entre si,
+        a partir de uma nova raiz. Os nós originais ficam intactos.
+        """
+        copias = []
+        anterior = None
+        for no in caminho:
+            copia = self._copiar(no)
+            if anterior is None:
+                self.raiz = copia
+            elif anterior.esquerdo is no:
+                anterior.esquerdo = copia
+            else:
+                anterior.direito = copia
+            copias.append(copia)
+            anterior = copia
+        return copias
+
+    def rotacao_direita(self, y):
+        """
+        Rotação à direita sobre cópias de y e do seu filho esquerdo.
+        Na remoção, a rotação pode envolver o lado que não está no caminho.
+        """
+        y = self._copiar(y)
+        y.esquerdo = self._copiar(y.esquerdo)
+        return super().rotacao_direita(y)
+
+    def rotacao_esquerda(self, x):
+        """
+        Rotação à esquerda sobre cópias de x e do seu filho direito.
+        """
+        x = self._copiar(x)
+        x.direito = self._copiar(x.direito)
+        return super().rotacao_esquerda(x)
+
+    def snapshot(self):
+        """
+        Retorna, em O(1), uma versão da árvore com o conteúdo atual.
+        A versão não é afetada por atualizações posteriores desta árvore
+        (e vice-versa).
+        """
+        versao = type(self)()
+        versao.raiz = self.raiz
+        versao._quantidade = self._quantidade
+        return versao
+
+
+class ArvoreAVLCompacta:
+    """
+    Árvore AVL com os nós guardados em colunas paralelas do módulo array.
+
+    Em vez de um objeto NoAVL por valor, cada nó é um índice inteiro nas
+    colunas _valores, _esquerdo, _direito e _altura. O índice 0 é um nó
+    sentinela com altura 0 e faz o papel de None, o que dispensa os testes
+    de filho inexistente nas contas de altura.
+
+    Os valores precisam caber no tipo da coluna _valores (por padrão 'q',
+    inteiros de 64 bits). Em troca, cada valor ocupa poucos bytes (em vez
+    de centenas) e o coletor de lixo não tem nenhum objeto para percorrer.
+    Nós removidos entram numa lista livre, encadeada pela própria coluna
+    _esquerdo, e são reaproveitados pelas próximas inserções.
+
+    Oferece a API básica da ArvoreAVL: construir, salvar/carregar,
+    inserir, remover, buscar, in, len, iteração, iter_range e percursos.
+    Lotes (inserir_muitos/remover_muitos), cursores, split/join e as
+    operações de conjunto existem só na ArvoreAVL.
+    """
+
+    def __init__(self, tipo='q'):
+        self.tipo = tipo                    # Código de tipo das chaves no módulo array
+        self._valores = array(tipo, [0])    # Valor de cada nó
+        self._esquerdo = array('i', [0])    # Índice do filho esquerdo (0 = nenhum)
+        self._direito = array('i', [0])     # Índice do filho direito (0 = nenhum)
+        self._altura = array('b', [0])      # Altura de cada nó (o sentinela tem altura 0)
+        self._livre = 0                     # Início da lista de nós livres
+        self._quantidade = 0
+        self.raiz = 0
+
+    @classmethod
+    def construir(cls, valores, tipo='q'):
+        """
+        Constrói uma árvore perfeitamente balanceada a partir de um iterável,
+        como ArvoreAVL.construir. Com a entrada já ordenada, é O(n).
+
+        O i-ésimo menor valor ocupa o índice i + 1, então as colunas são
+        preenchidas de uma vez e só os filhos e as alturas são calculados.
+        """
+        valores = list(valores)
+        if not all(valores[i] < valores[i + 1] for i in range(len(valores) - 1)):
+            unicos = []
+            for valor in sorted(valores):
+                if not unicos or unicos[-1] < valor:
+                    unicos.append(valor)
+            valores = unicos
+
+        arvore = cls(tipo)
+        quantidade = len(valores)
+        arvore._valores.extend(valores)
+        arvore._esquerdo.extend([0] * quantidade)
+        arvore._direito.extend([0] * quantidade)
+        arvore._altura.extend([0] * quantidade)
+        arvore._quantidade = quantidade
+        arvore.raiz = arvore._construir_recursivo(1, quantidade)
+        return arvore
+
+    def salvar(self, caminho):
+        """
+        Salva os valores no formato binário de ArvoreAVL.salvar, com o tipo
+        da coluna de valores desta árvore.
+        """
+        salvar_chaves(caminho, self, self.tipo)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Reconstrói uma árvore salva por salvar em O(n), com o tipo gravado
+        no cabeçalho do arquivo.
+        """
+        with ChavesMapeadas(caminho) as chaves:
+            return cls.construir(chaves, chaves.tipo)
+
+    def _construir_recursivo(self, inicio, fim):
+        """
+        Liga os índices [inicio, fim] como uma subárvore balanceada
+        e retorna o índice da sua raiz.
+        """
+        if inicio > fim:
+            return 0
+
+        meio = (inicio + fim) // 2
+        esquerdo = self._construir_recursivo(inicio, meio - 1)
+        direito = self._construir_recursivo(meio + 1, fim)
+        self._esquerdo[meio] = esquerdo
+        self._direito[meio] = direito
+        self._altura[meio] = 1 + max(self._altura[esquerdo], self._altura[direito])
+        return meio
+
+    def __len__(self):
+        return self._quantidade
+
+    def __contains__(self, valor):
+        return self.buscar(valor)
+
+    def memoria_em_bytes(self):
+        """
+        Retorna quantos bytes as colunas ocupam, incluindo os nós livres
+        e a folga de crescimento dos arrays.
+        """
+        return sum(sys.getsizeof(coluna) for coluna in
+                   (self._valores, self._esquerdo, self._direito, self._altura))
+
+    def _alocar(self, valor):
+        """
+        Retorna o índice de um nó novo com o valor dado, reaproveitando
+        um nó da lista livre quando houver.
+        """
+        no = self._livre
+        if no:
+            self._valores[no] = valor
+            self._livre = self._esquerdo[no]
+            self._esquerdo[no] = 0
+            self._altura[no] = 1
+        else:
+            self._valores.append(valor)
+            no = len(self._valores) - 1
+            self._esquerdo.append(0)
+            self._direito.append(0)
+            self._altura.append(1)
+        return no
+
+    def _liberar(self, no):
+        """
+        Devolve um nó para a lista livre.
+        """
+        self._esquerdo[no] = self._livre
+        self._direito[no] = 0
+        self._altura[no] = 0
+        self._livre = no
+
+    def obter_altura(self, no):
+        """
+        Retorna a altura de um nó (0 para o sentinela).
+        """
+        return self._altura[no]
+
+    def obter_fator_balanceamento(self, no):
+        """
+        Calcula o fator de balanceamento de um nó, como na ArvoreAVL.
+        """
+        return self._altura[self._esquerdo[no]] - self._altura[self._direito[no]]
+
+    def atualizar_altura(self, no):
+        """
+        Atualiza a altura de um nó baseada nas alturas de seus filhos.
+        """
+        altura = self._altura
+        altura[no] = 1 + max(altura[self._esquerdo[no]], altura[self._direito[no]])
+
+    def rotacao_direita(self, y):
+        """
+        Rotação simples à direita sobre índices (mesmo desenho da ArvoreAVL).
+        """
+        x = self._esquerdo[y]
+        self._esquerdo[y] = self._direito[x]
+        self._direito[x] = y
+        self.atualizar_altura(y)
+        self.atualizar_altura(x)
+        return x
+
+    def rotacao_esquerda(self, x):
+        """
+        Rotação simples à esquerda sobre índices (mesmo desenho da ArvoreAVL).
+        """
+        y = self._direito[x]
+        self._direito[x] = self._esquerdo[y]
+        self._esquerdo[y] = x
+        self.atualizar_altura(x)
+        self.atualizar_altura(y)
+        return y
+
+    def inserir(self, valor):
+        """
+        Insere um valor na árvore mantendo o balanceamento.
+        Retorna True se o valor foi inserido, False se ele já existia.
+        """
+        valores = self._valores
+        esquerdo = self._esquerdo
+        direito = self._direito
+
+        caminho = []
+        no = self.raiz
+        while no:
+            caminho.append(no)
+            atual = valores[no]
+            if valor < atual:
+                no = esquerdo[no]
+            elif valor > atual:
+                no = direito[no]
+            else:
+                return False
+
+        novo = self._alocar(valor)
+        self._quantidade += 1
+        if not caminho:
+            self.raiz = novo
+            return True
+
+        pai = caminho[-1]
+        if valor < valores[pai]:
+            esquerdo[pai] = novo
+        else:
+            direito[pai] = novo
+
+        self._rebalancear_caminho(caminho)
+        return True
+
+    def remover(self, valor):
+        """
+        Remove um valor da árvore mantendo o balanceamento.
+        Retorna True se o valor foi removido, False se ele não existia.
+        """
+        valores = self._valores
+        esquerdo = self._esquerdo
+        direito = self._direito
+
+        caminho = []
+        no = self.raiz
+        while no:
+            atual = valores[no]
+            if valor < atual:
+                caminho.append(no)
+                no = esquerdo[no]
+            elif valor > atual:
+                caminho.append(no)
+                no = direito[no]
+            else:
+                break
+
+        if not no:
+            return False
+
+        if esquerdo[no] and direito[no]:
+            # Nó com dois filhos: copia o sucessor inorder e remove o sucessor
+            caminho.append(no)
+            sucessor = direito[no]
+            while esquerdo[sucessor]:
+                caminho.append(sucessor)
+                sucessor = esquerdo[sucessor]
+            valores[no] = valores[sucessor]
+            no = sucessor
+            substituto = direito[sucessor]
+        else:
+            substituto = esquerdo[no] or direito[no]
+
+        if not caminho:
+            self.raiz = substituto
+        else:
+            pai = caminho[-1]
+            if esquerdo[pai] == no:
+                esquerdo[pai] = substituto
+            else:
+                direito[pai] = substituto
+
+        self._liberar(no)
+        self._quantidade -= 1
+        self._rebalancear_caminho(caminho)
+        return True
+
+    def _rebalancear_caminho(self, caminho):
+        """
+        Sobe pela pilha de índices atualizando alturas e rotacionando,
+        com a mesma parada antecipada da ArvoreAVL.
+        """
+        esquerdo = self._esquerdo
+        direito = self._direito
+        altura = self._altura
+
+        for i in range(len(caminho) - 1, -1, -1):
+            no = caminho[i]
+            altura_antiga = altura[no]
+            altura_esquerda = altura[esquerdo[no]]
+            altura_direita = altura[direito[no]]
+            altura[no] = 1 + (altura_esquerda if altura_esquerda > altura_direita
+                              else altura_direita)
+
+            fator_balanceamento = altura_esquerda - altura_direita
+            if fator_balanceamento > 1 or fator_balanceamento < -1:
+                if fator_balanceamento > 1:
+                    if self.obter_fator_balanceamento(esquerdo[no]) < 0:
+                        esquerdo[no] = self.rotacao_esquerda(esquerdo[no])
+                    nova_raiz = self.rotacao_direita(no)
+                else:
+                    if self.obter_fator_balanceamento(direito[no]) > 0:
+                        direito[no] = self.rotacao_direita(direito[no])
+                    nova_raiz = self.rotacao_esquerda(no)
+
+                if i == 0:
+                    self.raiz = nova_raiz
+                elif esquerdo[caminho[i - 1]] == no:
+                    esquerdo[caminho[i - 1]] = nova_raiz
+                else:
+                    direito[caminho[i - 1]] = nova_raiz
+                no = nova_raiz
+
+            if altura[no] == altura_antiga:
+                break
+
+    def buscar(self, valor):
+        """
+        Busca um valor na árvore.
+        Retorna True se encontrado, False caso contrário.
+        """
+        valores = self._valores
+        esquerdo = self._esquerdo
+        direito = self._direito
+
+        no = self.raiz
+        while no:
+            atual = valores[no]
+            if valor < atual:
+                no = esquerdo[no]
+            elif valor > atual:
+                no = direito[no]
+            else:
+                return True
+        return False
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, sob demanda.
+        """
+        return self.iter_range()
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, sob demanda.
+        """
+        return self.iter_range(reverse=True)
+
+    def iter_inorder(self):
+        """
+        Versão preguiçosa de percorrer_inorder.
+        """
+        return self.iter_range()
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi em ordem, sob demanda,
+        como ArvoreAVL.iter_range.
+        """
+        valores = self._valores
+        # No percurso reverso os papéis dos filhos e dos limites se invertem
+        if reverse:
+            primeiro, segundo = self._direito, self._esquerdo
+        else:
+            primeiro, segundo = self._esquerdo, self._direito
+
+        pilha = []
+        no = self.raiz
+        while no:
+            if reverse:
+                fora = hi is not None and valores[no] > hi
+            else:
+                fora = lo is not None and valores[no] < lo
+            if fora:
+                no = segundo[no]
+            else:
+                pilha.append(no)
+                no = primeiro[no]
+
+        while pilha:
+            no = pilha.pop()
+            valor = valores[no]
+            if reverse:
+                if lo is not None and valor < lo:
+                    return
+            elif hi is not None and valor > hi:
+                return
+            yield valor
+
+            no = segundo[no]
+            while no:
+                pilha.append(no)
+                no = primeiro[no]
+
+    def iter_preorder(self):
+        """
+        Versão preguiçosa de percorrer_preorder (raiz, esquerda, direita).
+        """
+        pilha = [self.raiz] if self.raiz else []
+        while pilha:
+            no = pilha.pop()
+            yield self._valores[no]
+            if self._direito[no]:
+                pilha.append(self._direito[no])
+            if self._esquerdo[no]:
+                pilha.append(self._esquerdo[no])
+
+    def iter_postorder(self):
+        """
+        Versão preguiçosa de percorrer_postorder (esquerda, direita, raiz).
+        """
+        pilha = []
+        ultimo_visitado = 0
+        no = self.raiz
+        while no or pilha:
+            while no:
+                pilha.append(no)
+                no = self._esquerdo[no]
+
+            topo = pilha[-1]
+            direito = self._direito[topo]
+            if direito and direito != ultimo_visitado:
+                no = direito
+            else:
+                yield self._valores[topo]
+                ultimo_visitado = pilha.pop()
+
+    def percorrer_inorder(self):
+        """
+        Retorna uma lista com os valores em ordem crescente.
+        """
+        return list(self.iter_range())
+
+    def percorrer_preorder(self):
+        """
+        Retorna uma lista com os valores em pré-ordem (raiz, esquerda, direita).
+        """
+        return list(self.iter_preorder())
+
+    def percorrer_postorder(self):
+        """
+        Retorna uma lista com os valores em pós-ordem (esquerda, direita, raiz).
+        """
+        return list(self.iter_postorder())
+
+    def imprimir_arvore(self):
+        """
+        Imprime a estrutura da árvore de forma visual.
+        """
+        if not self.raiz:
+            print("Árvore vazia")
+            return
+
+        print("Estrutura da árvore AVL (compacta):")
+        self._imprimir_recursivo(self.raiz, "", True)
+
+    def _imprimir_recursivo(self, no, prefixo, eh_ultimo):
+        """
+        Função auxiliar recursiva para impressão visual da árvore.
+        """
+        if no:
+            print(f"{prefixo}{'└── ' if eh_ultimo else '├── '}{self._valores[no]} "
+                  f"(h:{self._altura[no]}, fb:{self.obter_fator_balanceamento(no)})")
+
+            filhos = [filho for filho in (self._esquerdo[no], self._direito[no]) if filho]
+            for i, filho in enumerate(filhos):
+                novo_prefixo = prefixo + ("    " if eh_ultimo else "│   ")
+                self._imprimir_recursivo(filho, novo_prefixo, i == len(filhos) - 1)
+
+
+def exemplo_uso():
+    """
+    Função de demonstração do uso da árvore AVL.
     """
     print("=== Demonstração da Árvore AVL ===\n")
     
@@ -387,6 +2747,12 @@ def exemplo_uso():
     print("Preorder:", arvore.percorrer_preorder())
     print("Postorder:", arvore.percorrer_postorder())
     
+    # Testando percurso sob demanda
+    print("\n=== Percursos Sob Demanda ===")
+    print("iter_range(20, 45):", list(arvore.iter_range(20, 45)))
+    print("iter_range(20, 45, reverse=True):", list(arvore.iter_range(20, 45, reverse=True)))
+    print("reversed:", list(reversed(arvore)))
+
     # Testando busca
     print("\n=== Testes de Busca ===")
     valores_busca = [25, 15, 50]
@@ -403,6 +2769,112 @@ def exemplo_uso():
         arvore.imprimir_arvore()
         print("Inorder após remoção:", arvore.percorrer_inorder())
 
+    # Testando estatísticas de ordem
+    print("\n=== Estatísticas de Ordem ===")
+    arvore_ordem = ArvoreAVLEstatistica.construir([15, 3, 42, 8, 23, 4, 16])
+    print("Valores:", arvore_ordem.percorrer_inorder())
+    print("rank(16):", arvore_ordem.rank(16))
+    print("select(0) (menor):", arvore_ordem.select(0))
+    print("select(3) (mediana):", arvore_ordem.select(3))
+    print("count_range(4, 20):", arvore_ordem.count_range(4, 20))
+
+    # Testando o mapa ordenado
+    print("\n=== Mapa Ordenado ===")
+    mapa = MapaAVL()
+    for chave, conteudo in [(30, "trinta"), (10, "dez"), (20, "vinte"), (40, "quarenta")]:
+        mapa[chave] = conteudo
+    mapa[20] = "VINTE"
+    print("mapa[20]:", mapa[20])
+    print("get(25, '-'):", mapa.get(25, "-"))
+    print("setdefault(25, 'vinte e cinco'):", mapa.setdefault(25, "vinte e cinco"))
+    del mapa[10]
+    print("items(15, 35):", list(mapa.items(15, 35)))
+
+    # Testando divisão, junção e operações de conjunto
+    print("\n=== Divisão e Junção ===")
+    menores, maiores = ArvoreAVL.construir(range(1, 11)).split(6)
+    print("split(6):", list(menores), list(maiores))
+    print("join:", list(ArvoreAVL.join(menores, maiores)))
+    pares = ArvoreAVL.construir(range(0, 20, 2))
+    triplos = ArvoreAVL.construir(range(0, 20, 3))
+    print("Pares ∩ múltiplos de 3:", list(pares.intersection(triplos)))
+
+    # Testando versões persistentes
+    print("\n=== Árvore AVL Persistente ===")
+    persistente = ArvoreAVLPersistente.construir(valores)
+    versao = persistente.snapshot()
+    persistente.inserir(35)
+    persistente.remover(10)
+    print("Versão capturada:", list(versao))
+    print("Versão atual:", list(persistente))
+
+    # Testando o armazenamento compacto
+    print("\n=== Árvore AVL Compacta (colunas array) ===")
+    arvore_compacta = ArvoreAVLCompacta()
+    for valor in valores:
+        arvore_compacta.inserir(valor)
+    arvore_compacta.remover(30)
+    arvore_compacta.imprimir_arvore()
+    print(f"Memória das colunas: {arvore_compacta.memoria_em_bytes()} bytes")
+
+    # Testando agregados por intervalo
+    print("\n=== Agregados por Intervalo ===")
+    somas = ArvoreAVLAgregada.construir(range(1, 101))
+    maximos = ArvoreAVLAgregada.construir([7, 3, 9, 1, 5], combinar=max, neutro=float("-inf"))
+    print("Soma de 10 a 20:", somas.aggregate(10, 20))
+    print("Máximo até 6:", maximos.aggregate(hi=6))
+
+    # Testando a árvore de intervalos
+    print("\n=== Árvore de Intervalos ===")
+    intervalos = ArvoreIntervalos()
+    for intervalo in [(15, 20), (10, 30), (17, 19), (5, 20), (12, 15), (30, 40)]:
+        intervalos.inserir(intervalo)
+    print("Sobrepostos ao ponto 16:", list(intervalos.sobrepostos(16)))
+    print("Sobrepostos a [21, 35]:", list(intervalos.sobrepostos(21, 35)))
+
+    # Testando o multiconjunto
+    print("\n=== Multiconjunto ===")
+    eventos = MultiConjuntoAVL()
+    eventos.inserir_muitos(["login", "erro", "login", "login", "logout", "erro"])
+    eventos.remover("erro")
+    print("Contagens:", list(eventos.items()))
+    print(f"Total: {len(eventos)}, distintos: {eventos.distintos()}")
+
+    # Testando cursores
+    print("\n=== Cursores ===")
+    cursor_pares = ArvoreAVL.construir(range(0, 60, 2)).cursor()
+    cursor_triplos = ArvoreAVL.construir(range(0, 60, 3)).cursor()
+    comuns = []
+    # Junção por intercalação: cada cursor salta até o valor do outro
+    while cursor_pares.valor is not None and cursor_triplos.valor is not None:
+        if cursor_pares.valor == cursor_triplos.valor:
+            comuns.append(cursor_pares.valor)
+            cursor_pares.next()
+        elif cursor_pares.valor < cursor_triplos.valor:
+            cursor_pares.seek(cursor_triplos.valor)
+        else:
+            cursor_triplos.seek(cursor_pares.valor)
+    print("Valores comuns:", comuns)
+
+    # Testando as estatísticas opcionais
+    print("\n=== Estatísticas ===")
+    instrumentada = ArvoreAVL()
+    instrumentada.ativar_estatisticas()
+    for valor in range(1, 32):
+        instrumentada.inserir(valor)
+    for valor in (1, 16, 31, 40):
+        instrumentada.buscar(valor)
+    relatorio = instrumentada.relatorio_estatisticas()
+    print("Rotações por caso:", relatorio["rotacoes"])
+    print(f"Comparações por busca: {relatorio['comparacoes_por_busca']:.1f}, "
+          f"altura: {relatorio['altura']}, profundidade média: {relatorio['profundidade_media']:.2f}")
+    instrumentada.desativar_estatisticas()
+
+    # Testando construção em lote
+    print("\n=== Construção a partir de valores ordenados ===")
+    arvore_lote = ArvoreAVL.construir(range(1, 16))
+    arvore_lote.imprimir_arvore()
+
 
 if __name__ == "__main__":
     exemplo_uso()
\ No newline at end of file
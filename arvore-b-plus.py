@@ -0,0 +1,468 @@
+from bisect import bisect_left, bisect_right
+
+from serializacao import ChavesMapeadas, salvar_chaves
+
+
+class NoFolhaBPlus:
+    """
+    Folha da árvore B+: guarda as chaves em uma lista ordenada e aponta
+    para as folhas vizinhas, formando uma lista duplamente ligada.
+    """
+    __slots__ = ('chaves', 'proxima', 'anterior')
+
+    def __init__(self, chaves=None):
+        self.chaves = chaves if chaves is not None else []
+        self.proxima = None
+        self.anterior = None
+
+
+class NoInternoBPlus:
+    """
+    Nó interno da árvore B+: chaves[i] separa filhos[i] de filhos[i + 1].
+    Todo valor de filhos[i] é menor que chaves[i] e todo valor de
+    filhos[i + 1] é maior ou igual a chaves[i].
+    """
+    __slots__ = ('chaves', 'filhos')
+
+    def __init__(self, chaves=None, filhos=None):
+        self.chaves = chaves if chaves is not None else []
+        self.filhos = filhos if filhos is not None else []
+
+
+class ArvoreBPlus:
+    """
+    Implementação de uma árvore B+ com fan-out configurável.
+
+    Os valores ficam todos nas folhas; os nós internos só guardam chaves
+    separadoras para guiar a busca. Cada nó tem até ordem filhos (ou
+    ordem chaves, nas folhas), e dentro dele a posição é achada com
+    bisect sobre uma lista Python. Assim, com 1 milhão de chaves e
+    ordem 64, uma busca visita 4 nós em vez dos ~20 de uma árvore
+    binária, e o trabalho dentro de cada nó é feito em C pelo bisect.
+
+    As folhas são ligadas entre si, então percursos em ordem e consultas
+    por intervalo andam de folha em folha sem voltar para a raiz.
+
+    A API segue a da ArvoreAVL: os valores são únicos, inserir e remover
+    retornam se a árvore mudou e buscar retorna True/False.
+    """
+
+    def __init__(self, ordem=64):
+        if ordem < 3:
+            raise ValueError(f"a ordem deve ser pelo menos 3, não {ordem}")
+        self.ordem = ordem
+        self.raiz = NoFolhaBPlus()
+        self._quantidade = 0
+        # Ocupação mínima de nós que não são a raiz
+        self._min_chaves = ordem // 2           # Folhas
+        self._min_filhos = (ordem + 1) // 2     # Nós internos
+
+    def __len__(self):
+        """
+        Retorna a quantidade de valores na árvore.
+        """
+        return self._quantidade
+
+    def __contains__(self, valor):
+        """
+        Permite usar "valor in arvore".
+        """
+        return self.buscar(valor)
+
+    @classmethod
+    def construir(cls, valores, ordem=64):
+        """
+        Constrói a árvore a partir de um iterável, sem inserir um a um.
+
+        Se os valores já vierem em ordem crescente, a construção é O(n):
+        as folhas são preenchidas em sequência e cada nível interno é
+        montado a partir do nível de baixo. Entradas fora de ordem são
+        ordenadas antes e valores repetidos são descartados.
+        """
+        valores = list(valores)
+        if any(valores[i + 1] <= valores[i] for i in range(len(valores) - 1)):
+            unicos = []
+            for valor in sorted(valores):
+                if not unicos or unicos[-1] < valor:
+                    unicos.append(valor)
+            valores = unicos
+
+        arvore = cls(ordem)
+        if not valores:
+            return arvore
+
+        # Folhas: pedaços de tamanho parecido, todos com pelo menos _min_chaves
+        folhas = [NoFolhaBPlus(pedaco) for pedaco in arvore._dividir_em_grupos(valores)]
+        for anterior, proxima in zip(folhas, folhas[1:]):
+            anterior.proxima = proxima
+            proxima.anterior = anterior
+
+        # Cada nível guarda os nós e o menor valor da subárvore de cada um
+        nivel = folhas
+        minimos = [folha.chaves[0] for folha in folhas]
+        while len(nivel) > 1:
+            pais = []
+            minimos_pais = []
+            inicio = 0
+            for grupo in arvore._dividir_em_grupos(nivel):
+                fim = inicio + len(grupo)
+                pais.append(NoInternoBPlus(minimos[inicio + 1:fim], grupo))
+                minimos_pais.append(minimos[inicio])
+                inicio = fim
+            nivel, minimos = pais, minimos_pais
+
+        arvore.raiz = nivel[0]
+        arvore._quantidade = len(valores)
+        return arvore
+
+    def _dividir_em_grupos(self, itens):
+        """
+        Divide itens em pedaços consecutivos de até ordem elementos, com
+        tamanhos que diferem no máximo em 1 (e, por isso, todos acima da
+        ocupação mínima quando há mais de um pedaço).
+        """
+        grupos = -(-len(itens) // self.ordem)
+        base, sobra = divmod(len(itens), grupos)
+        pedacos = []
+        inicio = 0
+        for i in range(grupos):
+            fim = inicio + base + (1 if i < sobra else 0)
+            pedacos.append(itens[inicio:fim])
+            inicio = fim
+        return pedacos
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Salva os valores num arquivo binário compacto: um cabeçalho seguido
+        do array ordenado dos valores, com largura fixa (ver serializacao.py).
+        """
+        salvar_chaves(caminho, self, tipo)
+
+    @classmethod
+    def carregar(cls, caminho, ordem=64):
+        """
+        Reconstrói uma árvore salva por salvar em O(n), usando construir
+        sobre as chaves mapeadas em memória.
+        """
+        with ChavesMapeadas(caminho) as chaves:
+            return cls.construir(list(chaves), ordem)
+
+    def _folha_de(self, valor):
+        """
+        Desce da raiz até a folha onde valor está ou deveria estar.
+        """
+        no = self.raiz
+        while type(no) is NoInternoBPlus:
+            no = no.filhos[bisect_right(no.chaves, valor)]
+        return no
+
+    def buscar(self, valor):
+        """
+        Busca um valor na árvore.
+        Retorna True se encontrado, False caso contrário.
+        """
+        chaves = self._folha_de(valor).chaves
+        i = bisect_left(chaves, valor)
+        return i < len(chaves) and chaves[i] == valor
+
+    def inserir(self, valor):
+        """
+        Insere um valor na árvore B+.
+        Retorna True se o valor foi inserido, False se ele já existia.
+
+        A descida guarda o caminho (nó, índice do filho). Se a folha passar
+        de ordem chaves, ela é dividida ao meio e a primeira chave da
+        metade direita sobe como separadora; a divisão pode se propagar
+        pelos nós internos até criar uma nova raiz.
+        """
+        caminho = []
+        no = self.raiz
+        while type(no) is NoInternoBPlus:
+            i = bisect_right(no.chaves, valor)
+            caminho.append((no, i))
+            no = no.filhos[i]
+
+        chaves = no.chaves
+        i = bisect_left(chaves, valor)
+        if i < len(chaves) and chaves[i] == valor:
+            return False
+        chaves.insert(i, valor)
+        self._quantidade += 1
+
+        if len(chaves) <= self.ordem:
+            return True
+
+        # Divide a folha cheia; a nova folha entra na lista ligada
+        meio = len(chaves) // 2
+        nova = NoFolhaBPlus(chaves[meio:])
+        del chaves[meio:]
+        nova.proxima = no.proxima
+        nova.anterior = no
+        if no.proxima:
+            no.proxima.anterior = nova
+        no.proxima = nova
+        separadora = nova.chaves[0]
+
+        # Sobe inserindo a separadora e dividindo os nós internos cheios
+        while caminho:
+            pai, i = caminho.pop()
+            pai.chaves.insert(i, separadora)
+            pai.filhos.insert(i + 1, nova)
+            if len(pai.filhos) <= self.ordem:
+                return True
+
+            meio = len(pai.filhos) // 2
+            # A chave do meio sobe; ela não fica em nenhuma das metades
+            separadora = pai.chaves[meio - 1]
+            nova = NoInternoBPlus(pai.chaves[meio:], pai.filhos[meio:])
+            del pai.chaves[meio - 1:]
+            del pai.filhos[meio:]
+            no = pai
+
+        # A raiz foi dividida: a árvore cresce um nível
+        self.raiz = NoInternoBPlus([separadora], [no, nova])
+        return True
+
+    def remover(self, valor):
+        """
+        Remove um valor da árvore B+.
+        Retorna True se o valor foi removido, False se ele não existia.
+
+        Se a folha ficar abaixo da ocupação mínima, ela pega uma chave
+        emprestada de uma irmã ou se funde com ela; a fusão tira uma
+        separadora do pai, que pode ficar vazio demais e repetir o processo.
+        As separadoras não precisam ser atualizadas quando a chave removida
+        era a primeira da folha: elas continuam separando as subárvores.
+        """
+        caminho = []
+        no = self.raiz
+        while type(no) is NoInternoBPlus:
+            i = bisect_right(no.chaves, valor)
+            caminho.append((no, i))
+            no = no.filhos[i]
+
+        chaves = no.chaves
+        i = bisect_left(chaves, valor)
+        if i == len(chaves) or chaves[i] != valor:
+            return False
+        del chaves[i]
+        self._quantidade -= 1
+
+        if caminho and len(chaves) < self._min_chaves:
+            self._corrigir_folha(no, caminho)
+        return True
+
+    def _corrigir_folha(self, folha, caminho):
+        """
+        Recupera a ocupação mínima de uma folha, pegando emprestado de uma
+        irmã ou fundindo as duas, e corrige os nós internos acima dela.
+        """
+        pai, i = caminho.pop()
+        esquerda = pai.filhos[i - 1] if i > 0 else None
+        direita = pai.filhos[i + 1] if i + 1 < len(pai.filhos) else None
+
+        if esquerda and len(esquerda.chaves) > self._min_chaves:
+            folha.chaves.insert(0, esquerda.chaves.pop())
+            pai.chaves[i - 1] = folha.chaves[0]
+            return
+        if direita and len(direita.chaves) > self._min_chaves:
+            folha.chaves.append(direita.chaves.pop(0))
+            pai.chaves[i] = direita.chaves[0]
+            return
+
+        # Nenhuma irmã pode emprestar: funde com uma delas
+        if esquerda:
+            esquerda.chaves.extend(folha.chaves)
+            self._desligar_folha(folha)
+            del pai.chaves[i - 1]
+            del pai.filhos[i]
+        else:
+            folha.chaves.extend(direita.chaves)
+            self._desligar_folha(direita)
+            del pai.chaves[i]
+            del pai.filhos[i + 1]
+
+        self._corrigir_interno(pai, caminho)
+
+    def _desligar_folha(self, folha):
+        """
+        Tira uma folha da lista ligada de folhas.
+        """
+        if folha.anterior:
+            folha.anterior.proxima = folha.proxima
+        if folha.proxima:
+            folha.proxima.anterior = folha.anterior
+
+    def _corrigir_interno(self, no, caminho):
+        """
+        Sobe pelo caminho recuperando a ocupação mínima dos nós internos.
+        Na rotação com uma irmã, a separadora do pai desce e a chave da
+        ponta da irmã sobe no lugar dela.
+        """
+        while caminho:
+            if len(no.filhos) >= self._min_filhos:
+                return
+
+            pai, i = caminho.pop()
+            esquerda = pai.filhos[i - 1] if i > 0 else None
+            direita = pai.filhos[i + 1] if i + 1 < len(pai.filhos) else None
+
+            if esquerda and len(esquerda.filhos) > self._min_filhos:
+                no.chaves.insert(0, pai.chaves[i - 1])
+                pai.chaves[i - 1] = esquerda.chaves.pop()
+                no.filhos.insert(0, esquerda.filhos.pop())
+                return
+            if direita and len(direita.filhos) > self._min_filhos:
+                no.chaves.append(pai.chaves[i])
+                pai.chaves[i] = direita.chaves.pop(0)
+                no.filhos.append(direita.filhos.pop(0))
+                return
+
+            if esquerda:
+                esquerda.chaves.append(pai.chaves[i - 1])
+                esquerda.chaves.extend(no.chaves)
+                esquerda.filhos.extend(no.filhos)
+                del pai.chaves[i - 1]
+                del pai.filhos[i]
+            else:
+                no.chaves.append(pai.chaves[i])
+                no.chaves.extend(direita.chaves)
+                no.filhos.extend(direita.filhos)
+                del pai.chaves[i]
+                del pai.filhos[i + 1]
+            no = pai
+
+        # Uma raiz interna com um único filho é descartada
+        if type(self.raiz) is NoInternoBPlus and len(self.raiz.filhos) == 1:
+            self.raiz = self.raiz.filhos[0]
+
+    def _folha_extrema(self, ultima=False):
+        """
+        Retorna a primeira (ou a última) folha da lista ligada.
+        """
+        no = self.raiz
+        while type(no) is NoInternoBPlus:
+            no = no.filhos[-1 if ultima else 0]
+        return no
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, andando pelas folhas.
+        """
+        folha = self._folha_extrema()
+        while folha:
+            yield from folha.chaves
+            folha = folha.proxima
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, andando pelas folhas.
+        """
+        folha = self._folha_extrema(ultima=True)
+        while folha:
+            yield from reversed(folha.chaves)
+            folha = folha.anterior
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi, em ordem crescente
+        (ou decrescente, se reverse for True).
+
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+        A primeira folha é achada com uma descida e depois o percurso
+        segue pela lista ligada, copiando fatias inteiras de cada folha.
+        """
+        if not reverse:
+            if lo is None:
+                folha, i = self._folha_extrema(), 0
+            else:
+                folha = self._folha_de(lo)
+                i = bisect_left(folha.chaves, lo)
+            while folha:
+                chaves = folha.chaves
+                if hi is not None and chaves and chaves[-1] > hi:
+                    yield from chaves[i:bisect_right(chaves, hi)]
+                    return
+                yield from chaves[i:]
+                folha, i = folha.proxima, 0
+        else:
+            if hi is None:
+                folha = self._folha_extrema(ultima=True)
+                fim = len(folha.chaves)
+            else:
+                folha = self._folha_de(hi)
+                fim = bisect_right(folha.chaves, hi)
+            while folha:
+                chaves = folha.chaves
+                if lo is not None and chaves and chaves[0] < lo:
+                    yield from reversed(chaves[bisect_left(chaves, lo):fim])
+                    return
+                yield from reversed(chaves[:fim])
+                folha = folha.anterior
+                if folha:
+                    fim = len(folha.chaves)
+
+    def iter_inorder(self):
+        """
+        Versão preguiçosa de percorrer_inorder.
+        """
+        return iter(self)
+
+    def percorrer_inorder(self):
+        """
+        Retorna uma lista com os valores em ordem crescente.
+        """
+        return list(self)
+
+    def obter_altura(self):
+        """
+        Retorna a quantidade de níveis da árvore (1 quando a raiz é folha).
+        """
+        altura = 1
+        no = self.raiz
+        while type(no) is NoInternoBPlus:
+            no = no.filhos[0]
+            altura += 1
+        return altura
+
+    def imprimir_arvore(self, no=None, nivel=0):
+        """
+        Imprime a árvore nível a nível, com um nó por linha.
+        """
+        if no is None:
+            no = self.raiz
+        if type(no) is NoInternoBPlus:
+            print(" " * (nivel * 4) + f"{no.chaves}")
+            for filho in no.filhos:
+                self.imprimir_arvore(filho, nivel + 1)
+        else:
+            print(" " * (nivel * 4) + f"Folha {no.chaves}")
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    arvore = ArvoreBPlus(ordem=4)
+
+    valores = [10, 20, 5, 6, 12, 30, 7, 17, 3, 25, 1, 15]
+    print("Inserindo valores:", valores)
+    for valor in valores:
+        arvore.inserir(valor)
+
+    print("\nÁrvore B+ resultante (ordem 4):")
+    arvore.imprimir_arvore()
+
+    print("\nEm ordem:", arvore.percorrer_inorder())
+    print("iter_range(6, 20):", list(arvore.iter_range(6, 20)))
+    print("iter_range(6, 20, reverse=True):", list(arvore.iter_range(6, 20, reverse=True)))
+
+    print("\nTestes de busca:")
+    for valor in [12, 13]:
+        print(f"Buscar {valor}: {'Encontrado' if arvore.buscar(valor) else 'Não encontrado'}")
+
+    print("\nRemovendo 6, 7 e 10:")
+    for valor in [6, 7, 10]:
+        arvore.remover(valor)
+    arvore.imprimir_arvore()
+
+    print("\nConstrução direta com 1..20 (ordem 4):")
+    ArvoreBPlus.construir(range(1, 21), ordem=4).imprimir_arvore()
@@ -1,11 +1,29 @@
+from instrumentacao import ValorContado, ativar, desativar, medir_forma
+from serializacao import ChavesMapeadas, salvar_chaves
+
+
+# Cores guardadas como bool: as verificações da correção viram comparações
+# de identidade (is) em vez de comparações de strings
+VERMELHO = True
+PRETO = False
+
+# Nomes usados ao exibir as cores (percorrer_em_ordem, imprimir_arvore)
+NOMES_COR = {VERMELHO: 'VERMELHO', PRETO: 'PRETO'}
+
+
 class No:
     """
     Classe que representa um nó da árvore Red-Black.
     Cada nó tem uma cor (vermelho ou preto) e ponteiros para pai, filhos esquerdo e direito.
+
+    Com __slots__ o nó não carrega um __dict__, o que reduz bastante a
+    memória por nó e deixa o acesso aos campos um pouco mais rápido.
     """
-    def __init__(self, valor, cor='VERMELHO'):
+    __slots__ = ('valor', 'cor', 'pai', 'esquerda', 'direita')
+
+    def __init__(self, valor, cor=VERMELHO):
         self.valor = valor
-        self.cor = cor  # 'VERMELHO' ou 'PRETO'
+        self.cor = cor  # VERMELHO (True) ou PRETO (False)
         self.pai = None
         self.esquerda = None
         self.direita = None
@@ -24,16 +42,99 @@ class ArvoreRedBlack:
     
     def __init__(self):
         # Nó NIL (sentinela) - representa folhas vazias, sempre preto
-        self.NIL = No(None, 'PRETO')
+        self.NIL = No(None, PRETO)
         self.raiz = self.NIL
+        self._quantidade = 0
+
+    def __len__(self):
+        """
+        Retorna a quantidade de valores na árvore.
+        """
+        return self._quantidade
     
+    def salvar(self, caminho, tipo='q'):
+        """
+        Salva os valores num arquivo binário compacto: um cabeçalho seguido
+        do array ordenado dos valores, com largura fixa (ver serializacao.py).
+        """
+        salvar_chaves(caminho, self.iter_em_ordem(), tipo)
+
+    @classmethod
+    def construir(cls, valores):
+        """
+        Constrói uma árvore Red-Black válida a partir de um iterável, sem
+        passar por inserir e _corrigir_insercao.
+
+        Se os valores já vierem em ordem crescente, a construção é O(n).
+        Entradas fora de ordem são ordenadas antes (O(n log n)). Valores
+        repetidos são mantidos, assim como acontece em inserir.
+        """
+        valores = list(valores)
+        if any(valores[i + 1] < valores[i] for i in range(len(valores) - 1)):
+            valores.sort()
+        arvore = cls()
+        arvore._construir_balanceada(valores)
+        return arvore
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Reconstrói uma árvore salva por salvar em O(n), sem reinserir:
+        o arquivo é mapeado em memória e as chaves, já em ordem, são
+        ligadas diretamente numa árvore balanceada.
+        """
+        arvore = cls()
+        with ChavesMapeadas(caminho) as chaves:
+            arvore._construir_balanceada(list(chaves))
+        return arvore
+
+    def _construir_balanceada(self, valores):
+        """
+        Monta a árvore a partir de valores em ordem crescente, em O(n).
+
+        O valor do meio vira a raiz e cada metade vira uma subárvore, então
+        todos os níveis ficam completos, exceto talvez o último. Se esse
+        último nível estiver incompleto, os nós dele ficam vermelhos e todos
+        os outros pretos: assim todo caminho até uma folha NIL passa pelo
+        mesmo número de nós pretos e nenhum nó vermelho tem filho vermelho.
+        """
+        # Altura da árvore de altura mínima com len(valores) nós
+        altura = len(valores).bit_length()
+        completa = (len(valores) + 1) & len(valores) == 0   # n = 2^k - 1
+        profundidade_vermelha = -1 if completa else altura - 1
+        self.raiz = self._construir_recursivo(valores, 0, len(valores) - 1,
+                                              0, profundidade_vermelha, None)
+        self._quantidade = len(valores)
+
+    def _construir_recursivo(self, valores, inicio, fim, profundidade,
+                             profundidade_vermelha, pai):
+        """
+        Função auxiliar recursiva de _construir_balanceada.
+        """
+        if inicio > fim:
+            return self.NIL
+
+        meio = (inicio + fim) // 2
+        if profundidade == profundidade_vermelha:
+            cor = VERMELHO
+        else:
+            cor = PRETO
+
+        no = No(valores[meio], cor)
+        no.pai = pai
+        no.esquerda = self._construir_recursivo(valores, inicio, meio - 1,
+                                                profundidade + 1, profundidade_vermelha, no)
+        no.direita = self._construir_recursivo(valores, meio + 1, fim,
+                                               profundidade + 1, profundidade_vermelha, no)
+        return no
+
     def inserir(self, valor):
         """
         Insere um novo valor na árvore Red-Black.
         Primeiro insere como em uma BST normal, depois corrige as propriedades Red-Black.
         """
         # Cria um novo nó vermelho (novos nós sempre começam vermelhos)
-        novo_no = No(valor, 'VERMELHO')
+        novo_no = No(valor, VERMELHO)
         novo_no.esquerda = self.NIL
         novo_no.direita = self.NIL
         
@@ -41,7 +142,7 @@ class ArvoreRedBlack:
         pai = None
         atual = self.raiz
         
-        while atual != self.NIL:
+        while atual is not self.NIL:
             pai = atual
             if novo_no.valor < atual.valor:
                 atual = atual.esquerda
@@ -59,6 +160,7 @@ class ArvoreRedBlack:
             pai.esquerda = novo_no
         else:
             pai.direita = novo_no
+        self._quantidade += 1
         
         # Corrige as propriedades Red-Black após a inserção
         self._corrigir_insercao(novo_no)
@@ -67,54 +169,249 @@ class ArvoreRedBlack:
         """
         Corrige as propriedades Red-Black após uma inserção.
         O problema surge quando inserimos um nó vermelho com pai vermelho.
+
+        O pai e o avô ficam em variáveis locais para não repetir as
+        cadeias no.pai.pai a cada verificação.
         """
+        pai = no.pai
         # Continua enquanto o pai existe e é vermelho (violação da propriedade 4)
-        while no.pai and no.pai.cor == 'VERMELHO':
+        while pai is not None and pai.cor is VERMELHO:
+            avo = pai.pai  # Existe: um pai vermelho nunca é a raiz
+
             # Caso 1: O pai é filho esquerdo do avô
-            if no.pai == no.pai.pai.esquerda:
-                tio = no.pai.pai.direita  # Tio é o irmão do pai
+            if pai is avo.esquerda:
+                tio = avo.direita  # Tio é o irmão do pai
                 
                 # Caso 1a: Tio é vermelho
-                if tio.cor == 'VERMELHO':
-                    no.pai.cor = 'PRETO'           # Pai vira preto
-                    tio.cor = 'PRETO'              # Tio vira preto
-                    no.pai.pai.cor = 'VERMELHO'    # Avô vira vermelho
-                    no = no.pai.pai                # Continua verificando do avô
+                if tio.cor is VERMELHO:
+                    pai.cor = PRETO            # Pai vira preto
+                    tio.cor = PRETO            # Tio vira preto
+                    avo.cor = VERMELHO         # Avô vira vermelho
+                    no = avo                   # Continua verificando do avô
+                    pai = no.pai
                 else:
                     # Caso 1b: Tio é preto e nó é filho direito
-                    if no == no.pai.direita:
-                        no = no.pai
-                        self._rotacao_esquerda(no)
+                    if no is pai.direita:
+                        self._rotacao_esquerda(pai)
+                        pai = no               # O nó subiu para o lugar do pai
                     
                     # Caso 1c: Tio é preto e nó é filho esquerdo
-                    no.pai.cor = 'PRETO'
-                    no.pai.pai.cor = 'VERMELHO'
-                    self._rotacao_direita(no.pai.pai)
+                    pai.cor = PRETO
+                    avo.cor = VERMELHO
+                    self._rotacao_direita(avo)
+                    break                      # O pai agora é preto
             
             # Caso 2: O pai é filho direito do avô (simétrico ao caso 1)
             else:
-                tio = no.pai.pai.esquerda
+                tio = avo.esquerda
                 
                 # Caso 2a: Tio é vermelho
-                if tio.cor == 'VERMELHO':
-                    no.pai.cor = 'PRETO'
-                    tio.cor = 'PRETO'
-                    no.pai.pai.cor = 'VERMELHO'
-                    no = no.pai.pai
+                if tio.cor is VERMELHO:
+                    pai.cor = PRETO
+                    tio.cor = PRETO
+                    avo.cor = VERMELHO
+                    no = avo
+                    pai = no.pai
                 else:
                     # Caso 2b: Tio é preto e nó é filho esquerdo
-                    if no == no.pai.esquerda:
-                        no = no.pai
-                        self._rotacao_direita(no)
+                    if no is pai.esquerda:
+                        self._rotacao_direita(pai)
+                        pai = no
                     
                     # Caso 2c: Tio é preto e nó é filho direito
-                    no.pai.cor = 'PRETO'
-                    no.pai.pai.cor = 'VERMELHO'
-                    self._rotacao_esquerda(no.pai.pai)
+                    pai.cor = PRETO
+                    avo.cor = VERMELHO
+                    self._rotacao_esquerda(avo)
+                    break
         
         # A raiz sempre deve ser preta (propriedade 2)
-        self.raiz.cor = 'PRETO'
+        self.raiz.cor = PRETO
     
+    def remover(self, valor):
+        """
+        Remove uma ocorrência do valor da árvore Red-Black.
+        Retorna True se o valor foi removido, False se ele não existia.
+
+        Segue a remoção de uma BST: um nó com dois filhos troca de lugar
+        com o seu sucessor (o menor da subárvore direita), que tem no máximo
+        um filho. Se o nó que de fato saiu da árvore era preto, os caminhos
+        que passavam por ele perderam um nó preto, e _corrigir_remocao
+        restaura as propriedades com no máximo três rotações.
+        """
+        no = self.buscar(valor)
+        if no is None:
+            return False
+        self._remover_no(no)
+        return True
+
+    def _remover_no(self, no):
+        """
+        Tira o nó dado da árvore e corrige as propriedades Red-Black.
+        """
+        removido = no                   # Nó que de fato sai da posição
+        cor_original = removido.cor
+
+        if no.esquerda is self.NIL:
+            substituto = no.direita
+            self._transplante(no, no.direita)
+        elif no.direita is self.NIL:
+            substituto = no.esquerda
+            self._transplante(no, no.esquerda)
+        else:
+            # Dois filhos: o sucessor ocupa o lugar do nó removido
+            removido = self._minimo(no.direita)
+            cor_original = removido.cor
+            substituto = removido.direita
+
+            if removido.pai is no:
+                substituto.pai = removido       # Vale mesmo se substituto for NIL
+            else:
+                self._transplante(removido, removido.direita)
+                removido.direita = no.direita
+                removido.direita.pai = removido
+
+            self._transplante(no, removido)
+            removido.esquerda = no.esquerda
+            removido.esquerda.pai = removido
+            removido.cor = no.cor
+
+        self._quantidade -= 1
+
+        # Remover um nó preto desequilibra a contagem de pretos (propriedade 5)
+        if cor_original is PRETO:
+            self._corrigir_remocao(substituto)
+
+    def remover_muitos(self, valores):
+        """
+        Remove uma ocorrência de cada valor do lote.
+        Retorna quantos valores foram de fato removidos.
+
+        Lotes pequenos são removidos um a um, em O(k log n). Se o lote for
+        grande em relação à árvore (pelo menos metade do tamanho dela), é
+        mais barato intercalar o lote ordenado com o percurso em ordem e
+        reconstruir a árvore com os que sobraram, em O(n + k log k).
+        """
+        lote = sorted(valores)
+        if not lote or self.raiz is self.NIL:
+            return 0
+
+        if len(lote) < len(self) // 2:
+            return sum(1 for valor in lote if self.remover(valor))
+
+        restantes = []
+        i = 0
+        for valor in self.iter_em_ordem():
+            while i < len(lote) and lote[i] < valor:
+                i += 1
+            if i < len(lote) and lote[i] == valor:
+                i += 1                  # Consome a ocorrência do lote
+            else:
+                restantes.append(valor)
+
+        removidos = len(self) - len(restantes)
+        self._construir_balanceada(restantes)
+        return removidos
+
+    def _transplante(self, antigo, novo):
+        """
+        Coloca a subárvore novo no lugar da subárvore antigo, ligando-a ao
+        pai de antigo. novo pode ser o NIL: o pai dele é atualizado mesmo
+        assim, porque _corrigir_remocao sobe a partir dele.
+        """
+        if antigo.pai is None:
+            self.raiz = novo
+        elif antigo is antigo.pai.esquerda:
+            antigo.pai.esquerda = novo
+        else:
+            antigo.pai.direita = novo
+        novo.pai = antigo.pai
+
+    def _minimo(self, no):
+        """
+        Retorna o nó com o menor valor da subárvore de no.
+        """
+        while no.esquerda is not self.NIL:
+            no = no.esquerda
+        return no
+
+    def _maximo(self, no):
+        """
+        Retorna o nó com o maior valor da subárvore de no.
+        """
+        while no.direita is not self.NIL:
+            no = no.direita
+        return no
+
+    def _corrigir_remocao(self, no):
+        """
+        Corrige as propriedades Red-Black após uma remoção.
+        no carrega um preto "extra" (ocupa o lugar de um nó preto removido);
+        o objetivo é empurrar esse preto para cima ou absorvê-lo com rotações.
+        """
+        while no is not self.raiz and no.cor is PRETO:
+            pai = no.pai  # As rotações abaixo mantêm no como filho de pai
+            # Caso 1: O nó é filho esquerdo
+            if no is pai.esquerda:
+                irmao = pai.direita
+
+                # Caso 1a: Irmão vermelho - rotaciona para ter irmão preto
+                if irmao.cor is VERMELHO:
+                    irmao.cor = PRETO
+                    pai.cor = VERMELHO
+                    self._rotacao_esquerda(pai)
+                    irmao = pai.direita
+
+                # Caso 1b: Irmão preto com os dois filhos pretos - sobe o preto extra
+                if irmao.esquerda.cor is PRETO and irmao.direita.cor is PRETO:
+                    irmao.cor = VERMELHO
+                    no = pai
+                else:
+                    # Caso 1c: Só o filho esquerdo do irmão é vermelho
+                    if irmao.direita.cor is PRETO:
+                        irmao.esquerda.cor = PRETO
+                        irmao.cor = VERMELHO
+                        self._rotacao_direita(irmao)
+                        irmao = pai.direita
+
+                    # Caso 1d: Filho direito do irmão vermelho - absorve o preto extra
+                    irmao.cor = pai.cor
+                    pai.cor = PRETO
+                    irmao.direita.cor = PRETO
+                    self._rotacao_esquerda(pai)
+                    no = self.raiz
+
+            # Caso 2: O nó é filho direito (simétrico ao caso 1)
+            else:
+                irmao = pai.esquerda
+
+                # Caso 2a: Irmão vermelho
+                if irmao.cor is VERMELHO:
+                    irmao.cor = PRETO
+                    pai.cor = VERMELHO
+                    self._rotacao_direita(pai)
+                    irmao = pai.esquerda
+
+                # Caso 2b: Irmão preto com os dois filhos pretos
+                if irmao.esquerda.cor is PRETO and irmao.direita.cor is PRETO:
+                    irmao.cor = VERMELHO
+                    no = pai
+                else:
+                    # Caso 2c: Só o filho direito do irmão é vermelho
+                    if irmao.esquerda.cor is PRETO:
+                        irmao.direita.cor = PRETO
+                        irmao.cor = VERMELHO
+                        self._rotacao_esquerda(irmao)
+                        irmao = pai.esquerda
+
+                    # Caso 2d: Filho esquerdo do irmão vermelho
+                    irmao.cor = pai.cor
+                    pai.cor = PRETO
+                    irmao.esquerda.cor = PRETO
+                    self._rotacao_direita(pai)
+                    no = self.raiz
+
+        no.cor = PRETO
+
     def _rotacao_esquerda(self, no):
         """
         Realiza uma rotação à esquerda no nó especificado.
@@ -126,19 +423,20 @@ class ArvoreRedBlack:
                    b   c                   a   b
         """
         y = no.direita              # y é o filho direito de x
-        no.direita = y.esquerda     # Subárvore b vira filho direito de x
-        
-        if y.esquerda != self.NIL:
-            y.esquerda.pai = no     # Atualiza o pai de b
-        
-        y.pai = no.pai              # y assume a posição de x
+        b = y.esquerda
+        pai = no.pai
+
+        no.direita = b              # Subárvore b vira filho direito de x
+        if b is not self.NIL:
+            b.pai = no              # Atualiza o pai de b
         
-        if no.pai is None:
+        y.pai = pai                 # y assume a posição de x
+        if pai is None:
             self.raiz = y           # Se x era raiz, y vira raiz
-        elif no == no.pai.esquerda:
-            no.pai.esquerda = y     # Se x era filho esquerdo, y vira filho esquerdo
+        elif no is pai.esquerda:
+            pai.esquerda = y        # Se x era filho esquerdo, y vira filho esquerdo
         else:
-            no.pai.direita = y      # Se x era filho direito, y vira filho direito
+            pai.direita = y         # Se x era filho direito, y vira filho direito
         
         y.esquerda = no             # x vira filho esquerdo de y
         no.pai = y                  # Atualiza o pai de x
@@ -154,19 +452,20 @@ class ArvoreRedBlack:
                  a   b                       b   c
         """
         x = no.esquerda             # x é o filho esquerdo de y
-        no.esquerda = x.direita     # Subárvore b vira filho esquerdo de y
-        
-        if x.direita != self.NIL:
-            x.direita.pai = no      # Atualiza o pai de b
-        
-        x.pai = no.pai              # x assume a posição de y
+        b = x.direita
+        pai = no.pai
+
+        no.esquerda = b             # Subárvore b vira filho esquerdo de y
+        if b is not self.NIL:
+            b.pai = no              # Atualiza o pai de b
         
-        if no.pai is None:
+        x.pai = pai                 # x assume a posição de y
+        if pai is None:
             self.raiz = x           # Se y era raiz, x vira raiz
-        elif no == no.pai.direita:
-            no.pai.direita = x      # Se y era filho direito, x vira filho direito
+        elif no is pai.direita:
+            pai.direita = x         # Se y era filho direito, x vira filho direito
         else:
-            no.pai.esquerda = x     # Se y era filho esquerdo, x vira filho esquerdo
+            pai.esquerda = x        # Se y era filho esquerdo, x vira filho esquerdo
         
         x.direita = no              # y vira filho direito de x
         no.pai = x                  # Atualiza o pai de y
@@ -177,7 +476,7 @@ class ArvoreRedBlack:
         Funciona igual a uma BST normal, já que a ordenação é mantida.
         """
         atual = self.raiz
-        while atual != self.NIL:
+        while atual is not self.NIL:
             if valor == atual.valor:
                 return atual
             elif valor < atual.valor:
@@ -186,22 +485,268 @@ class ArvoreRedBlack:
                 atual = atual.direita
         return None
     
+    def minimo(self):
+        """
+        Retorna o menor valor da árvore, ou None se ela estiver vazia.
+        """
+        if self.raiz is self.NIL:
+            return None
+        return self._minimo(self.raiz).valor
+
+    def maximo(self):
+        """
+        Retorna o maior valor da árvore, ou None se ela estiver vazia.
+        """
+        if self.raiz is self.NIL:
+            return None
+        return self._maximo(self.raiz).valor
+
+    def pop_min(self):
+        """
+        Remove e retorna o menor valor. Lança IndexError se a árvore estiver vazia.
+        """
+        if self.raiz is self.NIL:
+            raise IndexError("pop_min em árvore vazia")
+        no = self._minimo(self.raiz)
+        self._remover_no(no)
+        return no.valor
+
+    def pop_max(self):
+        """
+        Remove e retorna o maior valor. Lança IndexError se a árvore estiver vazia.
+        """
+        if self.raiz is self.NIL:
+            raise IndexError("pop_max em árvore vazia")
+        no = self._maximo(self.raiz)
+        self._remover_no(no)
+        return no.valor
+
+    def floor(self, valor):
+        """
+        Retorna o maior valor <= valor, ou None se não houver.
+        """
+        nil = self.NIL
+        atual = self.raiz
+        resultado = None
+        while atual is not nil:
+            if atual.valor > valor:
+                atual = atual.esquerda
+            else:
+                resultado = atual.valor     # Candidato; procura um maior à direita
+                atual = atual.direita
+        return resultado
+
+    def ceiling(self, valor):
+        """
+        Retorna o menor valor >= valor, ou None se não houver.
+        """
+        nil = self.NIL
+        atual = self.raiz
+        resultado = None
+        while atual is not nil:
+            if atual.valor < valor:
+                atual = atual.direita
+            else:
+                resultado = atual.valor     # Candidato; procura um menor à esquerda
+                atual = atual.esquerda
+        return resultado
+
+    def lower(self, valor):
+        """
+        Retorna o maior valor estritamente menor que valor, ou None se não houver.
+        """
+        nil = self.NIL
+        atual = self.raiz
+        resultado = None
+        while atual is not nil:
+            if atual.valor < valor:
+                resultado = atual.valor
+                atual = atual.direita
+            else:
+                atual = atual.esquerda
+        return resultado
+
+    def higher(self, valor):
+        """
+        Retorna o menor valor estritamente maior que valor, ou None se não houver.
+        """
+        nil = self.NIL
+        atual = self.raiz
+        resultado = None
+        while atual is not nil:
+            if atual.valor > valor:
+                resultado = atual.valor
+                atual = atual.esquerda
+            else:
+                atual = atual.direita
+        return resultado
+
+    def validar(self):
+        """
+        Verifica todas as invariantes da árvore e lança ValueError descrevendo
+        a primeira violação encontrada. Retorna True se a árvore for válida.
+
+        Confere a ordem dos valores, os ponteiros pai, a cor da raiz e do
+        NIL, a ausência de vermelhos seguidos, a altura preta igual em todos
+        os caminhos e a contagem de __len__. Usa uma pilha explícita, então
+        funciona em árvores grandes sem esbarrar no limite de recursão.
+        """
+        nil = self.NIL
+        if nil.cor is not PRETO:
+            raise ValueError("o nó NIL deve ser preto")
+        if self.raiz is nil:
+            if self._quantidade != 0:
+                raise ValueError(f"árvore vazia com tamanho {self._quantidade}")
+            return True
+        if self.raiz.pai is not None:
+            raise ValueError("a raiz não pode ter pai")
+        if self.raiz.cor is not PRETO:
+            raise ValueError("a raiz deve ser preta")
+
+        altura_preta = None
+        quantidade = 0
+        # Cada item: (nó, limite inferior, limite superior, pretos acima do nó)
+        pilha = [(self.raiz, None, None, 0)]
+        while pilha:
+            no, lo, hi, pretos = pilha.pop()
+            if no is nil:
+                # Todo caminho até uma folha deve ter a mesma altura preta
+                if altura_preta is None:
+                    altura_preta = pretos
+                elif pretos != altura_preta:
+                    raise ValueError(f"alturas pretas diferentes: {altura_preta} e {pretos}")
+                continue
+
+            quantidade += 1
+            if no.cor is not VERMELHO and no.cor is not PRETO:
+                raise ValueError(f"cor inválida no nó {no.valor}: {no.cor!r}")
+            if (lo is not None and no.valor < lo) or (hi is not None and no.valor > hi):
+                raise ValueError(f"o valor {no.valor} está fora da ordem")
+            for filho in (no.esquerda, no.direita):
+                if filho is None:
+                    raise ValueError(f"o nó {no.valor} aponta para None em vez do NIL")
+                if filho is not nil and filho.pai is not no:
+                    raise ValueError(f"ponteiro pai incorreto no filho de {no.valor}")
+                if no.cor is VERMELHO and filho.cor is VERMELHO:
+                    raise ValueError(f"o nó vermelho {no.valor} tem filho vermelho")
+
+            pretos += no.cor is PRETO
+            pilha.append((no.esquerda, lo, no.valor, pretos))
+            pilha.append((no.direita, no.valor, hi, pretos))
+
+        if quantidade != self._quantidade:
+            raise ValueError(f"__len__ indica {self._quantidade} valores, mas há {quantidade}")
+        return True
+
     def percorrer_em_ordem(self, no=None):
         """
         Percorre a árvore em ordem (esquerda, raiz, direita).
-        Retorna uma lista com os valores em ordem crescente.
+        Retorna uma lista com os pares (valor, cor) em ordem crescente.
+        Se no for dado, percorre apenas a subárvore dele.
         """
-        if no is None:
-            no = self.raiz
-        
-        resultado = []
-        if no != self.NIL:
-            resultado.extend(self.percorrer_em_ordem(no.esquerda))
-            resultado.append((no.valor, no.cor))
-            resultado.extend(self.percorrer_em_ordem(no.direita))
-        
-        return resultado
+        return [(atual.valor, NOMES_COR[atual.cor]) for atual in self._iterar_nos(raiz=no)]
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, sob demanda.
+        """
+        for no in self._iterar_nos():
+            yield no.valor
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, sob demanda.
+        """
+        for no in self._iterar_nos(reverso=True):
+            yield no.valor
+
+    def iter_em_ordem(self, lo=None, hi=None, reverse=False, com_cor=False):
+        """
+        Versão preguiçosa de percorrer_em_ordem: gera os valores v com
+        lo <= v <= hi em ordem crescente (ou decrescente, se reverse for
+        True), ou os pares (valor, cor) se com_cor for True.
+
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+        O percurso inteiro custa O(n) e usa só uma pilha de O(log n) nós,
+        sem recursão e sem montar listas intermediárias.
+        """
+        if com_cor:
+            for no in self._iterar_nos(lo, hi, reverse):
+                yield no.valor, NOMES_COR[no.cor]
+        else:
+            for no in self._iterar_nos(lo, hi, reverse):
+                yield no.valor
+
+    def _iterar_nos(self, lo=None, hi=None, reverso=False, raiz=None):
+        """
+        Gera os nós com valor em [lo, hi] em ordem, usando uma pilha
+        explícita com os ancestrais ainda não visitados.
+
+        Depois de visitar um nó, basta empilhar o caminho até o menor valor
+        da sua subárvore direita (ou o maior da esquerda, no percurso
+        reverso). raiz limita o percurso a uma subárvore.
+        """
+        nil = self.NIL
+        pilha = []
+        no = self.raiz if raiz is None else raiz
+
+        if not reverso:
+            # Busca inicial: empilha apenas os nós >= lo no caminho até lo
+            while no is not nil:
+                if lo is not None and no.valor < lo:
+                    no = no.direita
+                else:
+                    pilha.append(no)
+                    no = no.esquerda
+
+            while pilha:
+                no = pilha.pop()
+                if hi is not None and no.valor > hi:
+                    return
+                yield no
+
+                no = no.direita
+                while no is not nil:
+                    pilha.append(no)
+                    no = no.esquerda
+        else:
+            # Busca inicial: empilha apenas os nós <= hi no caminho até hi
+            while no is not nil:
+                if hi is not None and no.valor > hi:
+                    no = no.esquerda
+                else:
+                    pilha.append(no)
+                    no = no.direita
+
+            while pilha:
+                no = pilha.pop()
+                if lo is not None and no.valor < lo:
+                    return
+                yield no
+
+                no = no.esquerda
+                while no is not nil:
+                    pilha.append(no)
+                    no = no.direita
     
+    def ativar_estatisticas(self):
+        """
+        Liga os contadores de buscas, comparações, rotações, casos da
+        correção e recolorações (ver instrumentacao.py) e retorna o objeto
+        Estatisticas.
+
+        A classe do objeto passa a ser uma subclasse com
+        InstrumentacaoRedBlack; árvores sem estatísticas ligadas não pagam
+        nenhum custo extra.
+        """
+        return ativar(self, InstrumentacaoRedBlack)
+
+    def desativar_estatisticas(self):
+        """
+        Desliga os contadores e devolve a árvore à sua classe original.
+        """
+        desativar(self, InstrumentacaoRedBlack)
+
     def imprimir_arvore(self, no=None, nivel=0, prefixo="Raiz: "):
         """
         Imprime a árvore de forma visual para facilitar a compreensão.
@@ -209,12 +754,155 @@ class ArvoreRedBlack:
         if no is None:
             no = self.raiz
         
-        if no != self.NIL:
-            print(" " * (nivel * 4) + prefixo + f"{no.valor}({no.cor})")
-            if no.esquerda != self.NIL or no.direita != self.NIL:
+        if no is not self.NIL:
+            print(" " * (nivel * 4) + prefixo + f"{no.valor}({NOMES_COR[no.cor]})")
+            if no.esquerda is not self.NIL or no.direita is not self.NIL:
                 self.imprimir_arvore(no.esquerda, nivel + 1, "L--- ")
                 self.imprimir_arvore(no.direita, nivel + 1, "R--- ")
 
+class InstrumentacaoRedBlack:
+    """
+    Mixin usado por ArvoreRedBlack.ativar_estatisticas.
+
+    As correções de inserção e remoção são cópias das originais com os
+    contadores de caso e as trocas de cor feitas por _pintar, que só conta
+    quando a cor muda de fato. Manter as cópias aqui, e não um teste de
+    "estatísticas ligadas?" nos métodos originais, é o que deixa a árvore
+    sem custo quando a instrumentação está desligada. Qualquer mudança nas
+    correções originais precisa ser repetida aqui; tests/test_instrumentacao.py
+    confere que as duas versões produzem exatamente a mesma árvore.
+    """
+
+    def buscar(self, valor):
+        self.estatisticas.buscas += 1
+        return super().buscar(ValorContado(valor, self.estatisticas))
+
+    def _rotacao_esquerda(self, no):
+        self.estatisticas.rotacoes['esquerda'] += 1
+        super()._rotacao_esquerda(no)
+
+    def _rotacao_direita(self, no):
+        self.estatisticas.rotacoes['direita'] += 1
+        super()._rotacao_direita(no)
+
+    def _pintar(self, no, cor):
+        if no.cor is not cor:
+            no.cor = cor
+            self.estatisticas.recoloracoes += 1
+
+    def _corrigir_insercao(self, no):
+        casos = self.estatisticas.casos
+        pintar = self._pintar
+        pai = no.pai
+        while pai is not None and pai.cor is VERMELHO:
+            avo = pai.pai
+            if pai is avo.esquerda:
+                tio = avo.direita
+                if tio.cor is VERMELHO:
+                    casos['1a'] += 1
+                    pintar(pai, PRETO)
+                    pintar(tio, PRETO)
+                    pintar(avo, VERMELHO)
+                    no = avo
+                    pai = no.pai
+                else:
+                    if no is pai.direita:
+                        casos['1b'] += 1
+                        self._rotacao_esquerda(pai)
+                        pai = no
+                    casos['1c'] += 1
+                    pintar(pai, PRETO)
+                    pintar(avo, VERMELHO)
+                    self._rotacao_direita(avo)
+                    break
+            else:
+                tio = avo.esquerda
+                if tio.cor is VERMELHO:
+                    casos['2a'] += 1
+                    pintar(pai, PRETO)
+                    pintar(tio, PRETO)
+                    pintar(avo, VERMELHO)
+                    no = avo
+                    pai = no.pai
+                else:
+                    if no is pai.esquerda:
+                        casos['2b'] += 1
+                        self._rotacao_direita(pai)
+                        pai = no
+                    casos['2c'] += 1
+                    pintar(pai, PRETO)
+                    pintar(avo, VERMELHO)
+                    self._rotacao_esquerda(avo)
+                    break
+        pintar(self.raiz, PRETO)
+
+    def _corrigir_remocao(self, no):
+        casos = self.estatisticas.casos
+        pintar = self._pintar
+        while no is not self.raiz and no.cor is PRETO:
+            pai = no.pai
+            if no is pai.esquerda:
+                irmao = pai.direita
+                if irmao.cor is VERMELHO:
+                    casos['remocao_1a'] += 1
+                    pintar(irmao, PRETO)
+                    pintar(pai, VERMELHO)
+                    self._rotacao_esquerda(pai)
+                    irmao = pai.direita
+                if irmao.esquerda.cor is PRETO and irmao.direita.cor is PRETO:
+                    casos['remocao_1b'] += 1
+                    pintar(irmao, VERMELHO)
+                    no = pai
+                else:
+                    if irmao.direita.cor is PRETO:
+                        casos['remocao_1c'] += 1
+                        pintar(irmao.esquerda, PRETO)
+                        pintar(irmao, VERMELHO)
+                        self._rotacao_direita(irmao)
+                        irmao = pai.direita
+                    casos['remocao_1d'] += 1
+                    pintar(irmao, pai.cor)
+                    pintar(pai, PRETO)
+                    pintar(irmao.direita, PRETO)
+                    self._rotacao_esquerda(pai)
+                    no = self.raiz
+            else:
+                irmao = pai.esquerda
+                if irmao.cor is VERMELHO:
+                    casos['remocao_2a'] += 1
+                    pintar(irmao, PRETO)
+                    pintar(pai, VERMELHO)
+                    self._rotacao_direita(pai)
+                    irmao = pai.esquerda
+                if irmao.esquerda.cor is PRETO and irmao.direita.cor is PRETO:
+                    casos['remocao_2b'] += 1
+                    pintar(irmao, VERMELHO)
+                    no = pai
+                else:
+                    if irmao.esquerda.cor is PRETO:
+                        casos['remocao_2c'] += 1
+                        pintar(irmao.direita, PRETO)
+                        pintar(irmao, VERMELHO)
+                        self._rotacao_esquerda(irmao)
+                        irmao = pai.esquerda
+                    casos['remocao_2d'] += 1
+                    pintar(irmao, pai.cor)
+                    pintar(pai, PRETO)
+                    pintar(irmao.esquerda, PRETO)
+                    self._rotacao_direita(pai)
+                    no = self.raiz
+        pintar(no, PRETO)
+
+    def relatorio_estatisticas(self, com_forma=True):
+        """
+        Retorna os contadores e, se com_forma for True, a altura e a
+        profundidade média atuais da árvore.
+        """
+        if not com_forma:
+            return self.estatisticas.resumo()
+        return self.estatisticas.resumo(*medir_forma(self.raiz, 'esquerda', 'direita', self.NIL))
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Cria uma nova árvore Red-Black
@@ -233,12 +921,47 @@ if __name__ == "__main__":
     
     print("\nPercurso em ordem (valor, cor):")
     print(arvore.percorrer_em_ordem())
+
+    # Estatísticas opcionais
+    instrumentada = ArvoreRedBlack()
+    instrumentada.ativar_estatisticas()
+    for valor in range(1, 101):
+        instrumentada.inserir(valor)
+    for valor in range(1, 51):
+        instrumentada.remover(valor)
+    relatorio = instrumentada.relatorio_estatisticas()
+    print("\nEstatísticas após inserir 1..100 e remover 1..50:")
+    print("Casos da correção:", relatorio["casos"])
+    print(f"Rotações: {relatorio['rotacoes']}, recolorações: {relatorio['recoloracoes']}, "
+          f"altura: {relatorio['altura']}")
+    instrumentada.desativar_estatisticas()
+
+    # Construção direta a partir de valores (ordenados em O(n))
+    construida = ArvoreRedBlack.construir(range(1, 11))
+    print("\nÁrvore construída a partir de 1..10 (válida: "
+          f"{construida.validar()}):")
+    construida.imprimir_arvore()
+
+    print("\nConsultas de vizinhança:")
+    print(f"floor(9) = {arvore.floor(9)}, ceiling(9) = {arvore.ceiling(9)}")
+    print(f"lower(10) = {arvore.lower(10)}, higher(10) = {arvore.higher(10)}")
+    print(f"mínimo = {arvore.minimo()}, máximo = {arvore.maximo()}")
+
+    print("\nValores entre 4 e 12, do maior para o menor:")
+    print(list(arvore.iter_em_ordem(4, 12, reverse=True)))
     
     # Testa busca
     print("\nTestes de busca:")
     for valor in [5, 15, 25]:
         resultado = arvore.buscar(valor)
         if resultado:
-            print(f"Valor {valor} encontrado: {resultado.valor}({resultado.cor})")
+            print(f"Valor {valor} encontrado: {resultado.valor}({NOMES_COR[resultado.cor]})")
         else:
-            print(f"Valor {valor} não encontrado")
\ No newline at end of file
+            print(f"Valor {valor} não encontrado")
+
+    # Testa remoção
+    print("\nTestes de remoção:")
+    for valor in [5, 10, 25]:
+        print(f"Remover {valor}: {'Removido' if arvore.remover(valor) else 'Não encontrado'}")
+    print("Removidos em lote:", arvore.remover_muitos([1, 3, 4, 18, 20]))
+    arvore.imprimir_arvore()
\ No newline at end of file
@@ -0,0 +1,406 @@
+from serializacao import ChavesMapeadas, salvar_chaves
+
+
+class NoSplay:
+    """
+    Classe que representa um nó da árvore splay.
+    Diferente do NoAVL, não guarda altura: a árvore não tem balanceamento explícito.
+    """
+    __slots__ = ('valor', 'esquerdo', 'direito')
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.esquerdo = None
+        self.direito = None
+
+
+class ArvoreSplay:
+    """
+    Implementação de uma árvore splay (auto-ajustável), com a mesma API da ArvoreAVL.
+
+    Toda busca, inserção e remoção termina com a operação splay, que traz o
+    nó acessado para a raiz por meio de rotações. Valores acessados com
+    frequência ficam perto da raiz e o acesso a eles fica quase O(1); se o
+    tráfego se concentra em poucas chaves, as buscas custam bem menos do que
+    a altura de uma árvore balanceada. O custo amortizado de qualquer
+    sequência de operações continua O(log n) por operação, embora uma
+    operação isolada possa percorrer um caminho longo.
+
+    O splay é feito de cima para baixo (top-down), sem ponteiros para o pai
+    e sem recursão: enquanto desce, o caminho é separado numa árvore da
+    esquerda (valores menores) e numa da direita (valores maiores), que no
+    fim viram os filhos do nó encontrado.
+
+    Os percursos (iteração, iter_range, percorrer_*) não fazem splay, então
+    não alteram a forma da árvore.
+    """
+
+    def __init__(self):
+        self.raiz = None
+        self._quantidade = 0
+        self._cabeca = NoSplay(None)   # Nó auxiliar do splay, reaproveitado
+
+    def __len__(self):
+        """
+        Retorna a quantidade de valores na árvore.
+        """
+        return self._quantidade
+
+    def __contains__(self, valor):
+        """
+        Permite usar "valor in arvore". Assim como buscar, faz splay.
+        """
+        return self.buscar(valor)
+
+    @classmethod
+    def construir(cls, valores):
+        """
+        Constrói uma árvore balanceada a partir de um iterável.
+
+        Valores em ordem crescente são ligados em O(n); entradas fora de
+        ordem são ordenadas antes e valores repetidos são descartados.
+        """
+        valores = list(valores)
+        if any(valores[i + 1] <= valores[i] for i in range(len(valores) - 1)):
+            unicos = []
+            for valor in sorted(valores):
+                if not unicos or unicos[-1] < valor:
+                    unicos.append(valor)
+            valores = unicos
+
+        arvore = cls()
+        arvore.raiz = arvore._construir_recursivo(valores, 0, len(valores) - 1)
+        arvore._quantidade = len(valores)
+        return arvore
+
+    def _construir_recursivo(self, valores, inicio, fim):
+        """
+        Função auxiliar recursiva para a construção balanceada.
+        """
+        if inicio > fim:
+            return None
+        meio = (inicio + fim) // 2
+        no = NoSplay(valores[meio])
+        no.esquerdo = self._construir_recursivo(valores, inicio, meio - 1)
+        no.direito = self._construir_recursivo(valores, meio + 1, fim)
+        return no
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Salva os valores num arquivo binário compacto: um cabeçalho seguido
+        do array ordenado dos valores, com largura fixa (ver serializacao.py).
+        """
+        salvar_chaves(caminho, self, tipo)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Reconstrói uma árvore salva por salvar em O(n), já balanceada.
+        """
+        with ChavesMapeadas(caminho) as chaves:
+            return cls.construir(list(chaves))
+
+    def _splay(self, valor):
+        """
+        Traz para a raiz o nó com o valor dado ou, se ele não existir, o
+        último nó visitado na busca por ele (o antecessor ou o sucessor).
+
+        Nos casos zig-zig (o valor está dois níveis abaixo, do mesmo lado)
+        o nó é rotacionado antes de seguir; é essa rotação extra que reduz
+        pela metade, aproximadamente, a profundidade dos nós do caminho.
+        """
+        no = self.raiz
+        if no is None:
+            return
+
+        # cabeca.direito acumula a árvore da esquerda e cabeca.esquerdo a da direita
+        cabeca = self._cabeca
+        cabeca.esquerdo = cabeca.direito = None
+        ultimo_esquerda = ultimo_direita = cabeca
+
+        while True:
+            if valor < no.valor:
+                filho = no.esquerdo
+                if filho is None:
+                    break
+                if valor < filho.valor:
+                    # Zig-zig: rotação à direita
+                    no.esquerdo = filho.direito
+                    filho.direito = no
+                    no = filho
+                    if no.esquerdo is None:
+                        break
+                # Liga o nó à árvore da direita e desce para a esquerda
+                ultimo_direita.esquerdo = no
+                ultimo_direita = no
+                no = no.esquerdo
+            elif valor > no.valor:
+                filho = no.direito
+                if filho is None:
+                    break
+                if valor > filho.valor:
+                    # Zig-zig: rotação à esquerda
+                    no.direito = filho.esquerdo
+                    filho.esquerdo = no
+                    no = filho
+                    if no.direito is None:
+                        break
+                # Liga o nó à árvore da esquerda e desce para a direita
+                ultimo_esquerda.direito = no
+                ultimo_esquerda = no
+                no = no.direito
+            else:
+                break
+
+        # Remonta: as subárvores do nó encontrado completam as duas árvores
+        ultimo_esquerda.direito = no.esquerdo
+        ultimo_direita.esquerdo = no.direito
+        no.esquerdo = cabeca.direito
+        no.direito = cabeca.esquerdo
+        cabeca.esquerdo = cabeca.direito = None
+        self.raiz = no
+
+    def buscar(self, valor):
+        """
+        Busca um valor na árvore e traz para a raiz o último nó visitado.
+        Retorna True se encontrado, False caso contrário.
+        """
+        raiz = self.raiz
+        if raiz is None:
+            return False
+        if raiz.valor == valor:
+            return True     # Caso comum com chaves quentes: já está na raiz
+        self._splay(valor)
+        return self.raiz.valor == valor
+
+    def inserir(self, valor):
+        """
+        Insere um valor na árvore. O novo nó vira a raiz.
+        Retorna True se o valor foi inserido, False se ele já existia.
+
+        Depois do splay, a raiz é o vizinho mais próximo do valor, então
+        basta colocar o novo nó acima dela, dividindo-a em menores e maiores.
+        """
+        raiz = self.raiz
+        if raiz is None:
+            self.raiz = NoSplay(valor)
+        else:
+            self._splay(valor)
+            raiz = self.raiz
+            if raiz.valor == valor:
+                return False
+            novo = NoSplay(valor)
+            if valor < raiz.valor:
+                novo.esquerdo = raiz.esquerdo
+                novo.direito = raiz
+                raiz.esquerdo = None
+            else:
+                novo.direito = raiz.direito
+                novo.esquerdo = raiz
+                raiz.direito = None
+            self.raiz = novo
+
+        self._quantidade += 1
+        return True
+
+    def remover(self, valor):
+        """
+        Remove um valor da árvore.
+        Retorna True se o valor foi removido, False se ele não existia.
+
+        O nó é trazido para a raiz e retirado; o maior valor da subárvore
+        esquerda sobe (com outro splay) e recebe a subárvore direita.
+        """
+        if self.raiz is None:
+            return False
+        self._splay(valor)
+        raiz = self.raiz
+        if raiz.valor != valor:
+            return False
+
+        if raiz.esquerdo is None:
+            self.raiz = raiz.direito
+        else:
+            direito = raiz.direito
+            self.raiz = raiz.esquerdo
+            # Todos os valores da esquerda são menores: o splay traz o maior
+            # deles para a raiz, que fica sem filho direito
+            self._splay(valor)
+            self.raiz.direito = direito
+        self._quantidade -= 1
+        return True
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, sob demanda.
+        """
+        return self.iter_range()
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, sob demanda.
+        """
+        return self.iter_range(reverse=True)
+
+    def iter_inorder(self):
+        """
+        Versão preguiçosa de percorrer_inorder.
+        """
+        return iter(self)
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi, em ordem crescente
+        (ou decrescente, se reverse for True), com uma pilha explícita.
+
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+        A pilha tem o tamanho da altura atual, que numa árvore splay pode
+        passar de O(log n); por isso o percurso não usa recursão.
+        """
+        pilha = []
+        no = self.raiz
+
+        if not reverse:
+            # Busca inicial: empilha apenas os nós >= lo no caminho até lo
+            while no:
+                if lo is not None and no.valor < lo:
+                    no = no.direito
+                else:
+                    pilha.append(no)
+                    no = no.esquerdo
+
+            while pilha:
+                no = pilha.pop()
+                if hi is not None and no.valor > hi:
+                    return
+                yield no.valor
+
+                no = no.direito
+                while no:
+                    pilha.append(no)
+                    no = no.esquerdo
+        else:
+            # Busca inicial: empilha apenas os nós <= hi no caminho até hi
+            while no:
+                if hi is not None and no.valor > hi:
+                    no = no.esquerdo
+                else:
+                    pilha.append(no)
+                    no = no.direito
+
+            while pilha:
+                no = pilha.pop()
+                if lo is not None and no.valor < lo:
+                    return
+                yield no.valor
+
+                no = no.esquerdo
+                while no:
+                    pilha.append(no)
+                    no = no.direito
+
+    def iter_preorder(self):
+        """
+        Gera os valores em pré-ordem (raiz, esquerda, direita).
+        """
+        pilha = [self.raiz] if self.raiz else []
+        while pilha:
+            no = pilha.pop()
+            yield no.valor
+            if no.direito:
+                pilha.append(no.direito)
+            if no.esquerdo:
+                pilha.append(no.esquerdo)
+
+    def iter_postorder(self):
+        """
+        Gera os valores em pós-ordem (esquerda, direita, raiz).
+        """
+        pilha = []
+        ultimo_visitado = None
+        no = self.raiz
+        while no or pilha:
+            while no:
+                pilha.append(no)
+                no = no.esquerdo
+
+            topo = pilha[-1]
+            if topo.direito and topo.direito is not ultimo_visitado:
+                no = topo.direito
+            else:
+                yield topo.valor
+                ultimo_visitado = pilha.pop()
+
+    def percorrer_inorder(self):
+        """
+        Percorre a árvore em ordem (esquerda, raiz, direita).
+        Retorna os valores em ordem crescente.
+        """
+        return list(self)
+
+    def percorrer_preorder(self):
+        """
+        Percorre a árvore em pré-ordem (raiz, esquerda, direita).
+        """
+        return list(self.iter_preorder())
+
+    def percorrer_postorder(self):
+        """
+        Percorre a árvore em pós-ordem (esquerda, direita, raiz).
+        """
+        return list(self.iter_postorder())
+
+    def obter_altura(self):
+        """
+        Retorna a altura atual da árvore (0 se estiver vazia).
+        """
+        altura = 0
+        pilha = [(self.raiz, 1)] if self.raiz else []
+        while pilha:
+            no, profundidade = pilha.pop()
+            altura = max(altura, profundidade)
+            if no.esquerdo:
+                pilha.append((no.esquerdo, profundidade + 1))
+            if no.direito:
+                pilha.append((no.direito, profundidade + 1))
+        return altura
+
+    def imprimir_arvore(self):
+        """
+        Imprime a estrutura da árvore de forma visual.
+        """
+        if not self.raiz:
+            print("Árvore vazia")
+            return
+
+        print("Estrutura da árvore splay:")
+        # Pilha explícita: depois de inserções em sequência a árvore pode
+        # ter altura O(n), e a recursão estouraria o limite do Python
+        pilha = [(self.raiz, "", True)]
+        while pilha:
+            no, prefixo, eh_ultimo = pilha.pop()
+            print(f"{prefixo}{'└── ' if eh_ultimo else '├── '}{no.valor}")
+            filhos = [filho for filho in (no.esquerdo, no.direito) if filho]
+            novo_prefixo = prefixo + ("    " if eh_ultimo else "│   ")
+            # Empilhados ao contrário para o filho esquerdo sair primeiro
+            for i in range(len(filhos) - 1, -1, -1):
+                pilha.append((filhos[i], novo_prefixo, i == len(filhos) - 1))
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    arvore = ArvoreSplay.construir(range(1, 16))
+    print("Árvore construída com 1..15:")
+    arvore.imprimir_arvore()
+
+    print("\nBuscando 13 três vezes (ele sobe para a raiz):")
+    for _ in range(3):
+        arvore.buscar(13)
+    arvore.imprimir_arvore()
+
+    print("\nInserindo 20 e removendo 8:")
+    arvore.inserir(20)
+    arvore.remover(8)
+    arvore.imprimir_arvore()
+    print("Em ordem:", arvore.percorrer_inorder())
+    print("iter_range(5, 14, reverse=True):", list(arvore.iter_range(5, 14, reverse=True)))
@@ -0,0 +1,629 @@
+import gc
+import random
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from carregar_modulos import carregar_modulo
+from serializacao import ChavesMapeadas, salvar_chaves
+
+
+class NoTreap:
+    """
+    Classe que representa um nó da treap.
+    Além do valor, cada nó tem uma prioridade aleatória sorteada na inserção.
+    """
+    __slots__ = ('valor', 'prioridade', 'esquerdo', 'direito')
+
+    def __init__(self, valor, prioridade):
+        self.valor = valor
+        self.prioridade = prioridade
+        self.esquerdo = None
+        self.direito = None
+
+
+# As operações sobre nós ficam no nível do módulo, e não como métodos, para
+# poderem ser usadas nos processos do pool pelas operações de conjunto.
+
+def _dividir(no, valor):
+    """
+    Divide a subárvore de no em (menores, igual, maiores): as treaps com os
+    valores < valor e > valor, e o nó com o próprio valor (ou None).
+    Custo esperado O(log n).
+    """
+    if no is None:
+        return None, None, None
+    if valor < no.valor:
+        menores, igual, maiores = _dividir(no.esquerdo, valor)
+        no.esquerdo = maiores
+        return menores, igual, no
+    if valor > no.valor:
+        menores, igual, maiores = _dividir(no.direito, valor)
+        no.direito = menores
+        return no, igual, maiores
+    menores, maiores = no.esquerdo, no.direito
+    no.esquerdo = no.direito = None
+    return menores, no, maiores
+
+
+def _juntar(esquerda, direita):
+    """
+    Junta duas treaps em que todos os valores de esquerda são menores que
+    os de direita. A raiz de maior prioridade fica por cima.
+    """
+    if esquerda is None:
+        return direita
+    if direita is None:
+        return esquerda
+    if esquerda.prioridade > direita.prioridade:
+        esquerda.direito = _juntar(esquerda.direito, direita)
+        return esquerda
+    direita.esquerdo = _juntar(esquerda, direita.esquerdo)
+    return direita
+
+
+def _unir(primeira, segunda):
+    """
+    União de duas treaps: a raiz de maior prioridade divide a outra treap e
+    as metades são unidas recursivamente com as suas subárvores.
+    """
+    if primeira is None:
+        return segunda
+    if segunda is None:
+        return primeira
+    if primeira.prioridade < segunda.prioridade:
+        primeira, segunda = segunda, primeira
+    menores, _, maiores = _dividir(segunda, primeira.valor)
+    primeira.esquerdo = _unir(primeira.esquerdo, menores)
+    primeira.direito = _unir(primeira.direito, maiores)
+    return primeira
+
+
+def _intersectar(primeira, segunda):
+    """
+    Interseção de duas treaps, com o mesmo esquema de _unir. A raiz só é
+    mantida se o valor dela também estiver na outra treap.
+    """
+    if primeira is None or segunda is None:
+        return None
+    if primeira.prioridade < segunda.prioridade:
+        primeira, segunda = segunda, primeira
+    menores, igual, maiores = _dividir(segunda, primeira.valor)
+    esquerda = _intersectar(primeira.esquerdo, menores)
+    direita = _intersectar(primeira.direito, maiores)
+    if igual is None:
+        return _juntar(esquerda, direita)
+    primeira.esquerdo, primeira.direito = esquerda, direita
+    return primeira
+
+
+def _subtrair(primeira, segunda):
+    """
+    Valores de primeira que não estão em segunda. A raiz de primeira divide
+    segunda e só é mantida se o valor dela não estiver lá.
+    """
+    if primeira is None or segunda is None:
+        return primeira
+    menores, igual, maiores = _dividir(segunda, primeira.valor)
+    esquerda = _subtrair(primeira.esquerdo, menores)
+    direita = _subtrair(primeira.direito, maiores)
+    if igual is not None:
+        return _juntar(esquerda, direita)
+    primeira.esquerdo, primeira.direito = esquerda, direita
+    return primeira
+
+
+def _montar(valores, prioridades):
+    """
+    Monta a treap com os valores dados (em ordem crescente) e as suas
+    prioridades, em O(n). Cada novo nó entra no fim do caminho mais à
+    direita, depois de desempilhar os nós de prioridade menor, que viram a
+    sua subárvore esquerda. Retorna a raiz.
+    """
+    caminho_direito = []
+    for valor, prioridade in zip(valores, prioridades):
+        no = NoTreap(valor, prioridade)
+        ultimo = None
+        while caminho_direito and caminho_direito[-1].prioridade < prioridade:
+            ultimo = caminho_direito.pop()
+        no.esquerdo = ultimo
+        if caminho_direito:
+            caminho_direito[-1].direito = no
+        caminho_direito.append(no)
+    return caminho_direito[0] if caminho_direito else None
+
+
+def _achatar(raiz):
+    """
+    Retorna as listas (valores, prioridades) da subárvore em ordem, que
+    bastam para _montar reconstruí-la com a mesma forma.
+    """
+    valores = []
+    prioridades = []
+    pilha = []
+    no = raiz
+    while pilha or no:
+        while no:
+            pilha.append(no)
+            no = no.esquerdo
+        no = pilha.pop()
+        valores.append(no.valor)
+        prioridades.append(no.prioridade)
+        no = no.direito
+    return valores, prioridades
+
+
+_OPERACOES = {
+    'uniao': _unir,
+    'intersecao': _intersectar,
+    'diferenca': _subtrair,
+}
+
+
+@contextmanager
+def _sem_coleta_de_lixo():
+    """
+    Desliga o coletor de lixo do Python enquanto muitos nós são criados de
+    uma vez. Os nós da treap não formam ciclos, e sem isso cada coleta
+    completa percorre todos os nós já criados, o que chega a deixar a
+    montagem várias vezes mais lenta.
+    """
+    ligado = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ligado:
+            gc.enable()
+
+
+def _operar_achatadas(operacao, valores_a, prioridades_a, valores_b, prioridades_b):
+    """
+    Executada nos processos do pool: remonta as duas subárvores, aplica a
+    operação e devolve o resultado achatado. Listas de valores e de números
+    são serializadas muito mais rápido do que os nós um a um.
+    """
+    with _sem_coleta_de_lixo():
+        resultado = _OPERACOES[operacao](_montar(valores_a, prioridades_a),
+                                         _montar(valores_b, prioridades_b))
+        return _achatar(resultado)
+
+
+def _planejar(operacao, primeira, segunda, niveis, executor):
+    """
+    Executa os primeiros niveis da recursão de uma operação de conjunto no
+    processo atual e envia cada subproblema restante ao executor.
+
+    Retorna um plano: um nó pronto, um Future ou a tupla
+    (raiz, manter_raiz, plano_esquerdo, plano_direito) de um nível já feito.
+    """
+    if primeira is None or segunda is None:
+        return _OPERACOES[operacao](primeira, segunda)
+    if niveis == 0:
+        return executor.submit(_operar_achatadas, operacao, *_achatar(primeira), *_achatar(segunda))
+
+    if operacao != 'diferenca' and primeira.prioridade < segunda.prioridade:
+        primeira, segunda = segunda, primeira
+    menores, igual, maiores = _dividir(segunda, primeira.valor)
+    if operacao == 'uniao':
+        manter = True
+    elif operacao == 'intersecao':
+        manter = igual is not None
+    else:
+        manter = igual is None
+
+    esquerda = _planejar(operacao, primeira.esquerdo, menores, niveis - 1, executor)
+    direita = _planejar(operacao, primeira.direito, maiores, niveis - 1, executor)
+    return primeira, manter, esquerda, direita
+
+
+def _combinar(plano):
+    """
+    Espera os resultados dos subproblemas e remonta a treap de um plano.
+    """
+    if isinstance(plano, Future):
+        return _montar(*plano.result())
+    if not isinstance(plano, tuple):
+        return plano
+    raiz, manter, esquerda, direita = plano
+    esquerda = _combinar(esquerda)
+    direita = _combinar(direita)
+    if not manter:
+        return _juntar(esquerda, direita)
+    raiz.esquerdo, raiz.direito = esquerda, direita
+    return raiz
+
+
+class ArvoreTreap:
+    """
+    Implementação de uma treap (árvore + heap), com a mesma API da ArvoreAVL.
+
+    Os valores seguem a ordem de uma árvore de busca e as prioridades,
+    sorteadas na inserção, seguem a ordem de um heap (o pai tem prioridade
+    maior que os filhos). Com prioridades aleatórias, a forma da árvore é a
+    de uma árvore de busca montada em ordem aleatória, com altura esperada
+    O(log n), sem nenhuma informação de balanceamento guardada nos nós.
+
+    Tudo é feito com duas operações, dividir e juntar, o que deixa split,
+    join, union, intersection e difference simples. Nas operações de
+    conjunto os dois ramos da recursão são independentes; acima de
+    limite_paralelo valores somados, os primeiros níveis da recursão são
+    feitos no processo atual e os subproblemas que sobram vão para um
+    ProcessPoolExecutor, se isso for pedido. Cada subproblema vai e volta
+    como duas listas (valores e prioridades), e essa cópia custa da mesma
+    ordem que a própria operação; por isso o padrão é não usar processos.
+    """
+
+    limite_paralelo = 200000     # Tamanho somado a partir do qual as operações de conjunto usam processos
+
+    def __init__(self, semente=None):
+        self.raiz = None
+        self._quantidade = 0        # Quantidade de valores (None = recontar)
+        self._aleatorio = random.Random(semente)
+
+    def __len__(self):
+        """
+        Retorna a quantidade de valores na árvore.
+        Depois de split, join e das operações de conjunto a quantidade é
+        recontada (em O(n)) no primeiro len().
+        """
+        if self._quantidade is None:
+            self._quantidade = sum(1 for _ in self)
+        return self._quantidade
+
+    def __contains__(self, valor):
+        """
+        Permite usar "valor in arvore".
+        """
+        return self.buscar(valor)
+
+    @classmethod
+    def construir(cls, valores, semente=None):
+        """
+        Constrói uma treap a partir de um iterável, em O(n) se os valores
+        já estiverem em ordem crescente. Entradas fora de ordem são
+        ordenadas antes e valores repetidos são descartados.
+        """
+        valores = list(valores)
+        if any(valores[i + 1] <= valores[i] for i in range(len(valores) - 1)):
+            unicos = []
+            for valor in sorted(valores):
+                if not unicos or unicos[-1] < valor:
+                    unicos.append(valor)
+            valores = unicos
+
+        arvore = cls(semente)
+        sortear = arvore._aleatorio.random
+        arvore.raiz = _montar(valores, [sortear() for _ in valores])
+        arvore._quantidade = len(valores)
+        return arvore
+
+    def salvar(self, caminho, tipo='q'):
+        """
+        Salva os valores num arquivo binário compacto: um cabeçalho seguido
+        do array ordenado dos valores, com largura fixa (ver serializacao.py).
+        """
+        salvar_chaves(caminho, self, tipo)
+
+    @classmethod
+    def carregar(cls, caminho, semente=None):
+        """
+        Reconstrói uma treap salva por salvar em O(n), usando construir.
+        """
+        with ChavesMapeadas(caminho) as chaves:
+            return cls.construir(list(chaves), semente)
+
+    def _de_raiz(self, raiz):
+        """
+        Cria uma treap com a raiz dada, que continua sorteando prioridades
+        a partir do gerador desta.
+        """
+        arvore = type(self)()
+        arvore._aleatorio = self._aleatorio
+        arvore.raiz = raiz
+        arvore._quantidade = None
+        return arvore
+
+    def _esvaziar(self):
+        """
+        Deixa a árvore vazia depois que seus nós foram passados adiante.
+        """
+        self.raiz = None
+        self._quantidade = 0
+
+    def buscar(self, valor):
+        """
+        Busca um valor na árvore.
+        Retorna True se encontrado, False caso contrário.
+        """
+        no = self.raiz
+        while no:
+            if valor < no.valor:
+                no = no.esquerdo
+            elif valor > no.valor:
+                no = no.direito
+            else:
+                return True
+        return False
+
+    def inserir(self, valor):
+        """
+        Insere um valor na treap.
+        Retorna True se o valor foi inserido, False se ele já existia.
+
+        O novo nó desce até o primeiro nó de prioridade menor que a dele;
+        a subárvore desse nó é dividida pelo valor e as duas partes viram
+        os filhos do novo nó. Tudo numa única descida: se o valor já
+        existir acima desse ponto, a descida o encontra; se existir abaixo,
+        a divisão o encontra e é desfeita.
+        """
+        prioridade = self._aleatorio.random()
+        pai = None
+        no = self.raiz
+        while no is not None and no.prioridade > prioridade:
+            if valor < no.valor:
+                pai, no = no, no.esquerdo
+            elif valor > no.valor:
+                pai, no = no, no.direito
+            else:
+                return False
+
+        menores, igual, maiores = _dividir(no, valor)
+        if igual is None:
+            subarvore = NoTreap(valor, prioridade)
+            subarvore.esquerdo, subarvore.direito = menores, maiores
+        else:
+            # Valor repetido: juntar as partes refaz a mesma subárvore,
+            # porque a forma de uma treap só depende dos valores e prioridades
+            subarvore = _juntar(_juntar(menores, igual), maiores)
+
+        if pai is None:
+            self.raiz = subarvore
+        elif valor < pai.valor:
+            pai.esquerdo = subarvore
+        else:
+            pai.direito = subarvore
+
+        if igual is not None:
+            return False
+        if self._quantidade is not None:
+            self._quantidade += 1
+        return True
+
+    def remover(self, valor):
+        """
+        Remove um valor da treap.
+        Retorna True se o valor foi removido, False se ele não existia.
+        O nó é substituído pela junção das suas duas subárvores.
+        """
+        pai = None
+        no = self.raiz
+        while no is not None and no.valor != valor:
+            pai = no
+            no = no.esquerdo if valor < no.valor else no.direito
+        if no is None:
+            return False
+
+        substituto = _juntar(no.esquerdo, no.direito)
+        if pai is None:
+            self.raiz = substituto
+        elif pai.esquerdo is no:
+            pai.esquerdo = substituto
+        else:
+            pai.direito = substituto
+
+        if self._quantidade is not None:
+            self._quantidade -= 1
+        return True
+
+    def split(self, valor):
+        """
+        Divide a treap em tempo esperado O(log n) e retorna o par
+        (menores, maiores): menores com os valores < valor e maiores com
+        os valores >= valor. Esta árvore fica vazia.
+        """
+        menores, igual, maiores = _dividir(self.raiz, valor)
+        if igual is not None:
+            maiores = _juntar(igual, maiores)
+        self._esvaziar()
+        return self._de_raiz(menores), self._de_raiz(maiores)
+
+    @classmethod
+    def join(cls, esquerda, direita):
+        """
+        Junta duas treaps em tempo esperado O(log n), desde que todos os
+        valores de esquerda sejam menores que todos os de direita.
+        Retorna a nova treap; esquerda e direita ficam vazias.
+        """
+        if esquerda.raiz and direita.raiz:
+            maior = esquerda.raiz
+            while maior.direito:
+                maior = maior.direito
+            menor = direita.raiz
+            while menor.esquerdo:
+                menor = menor.esquerdo
+            if not maior.valor < menor.valor:
+                raise ValueError("os valores da esquerda devem ser menores que os da direita")
+
+        raiz = _juntar(esquerda.raiz, direita.raiz)
+        resultado = esquerda._de_raiz(raiz)
+        esquerda._esvaziar()
+        direita._esvaziar()
+        return resultado
+
+    def union(self, outra, trabalhadores=1):
+        """
+        Retorna a união desta treap com outra. Ambas ficam vazias.
+
+        O custo esperado é O(m log(n/m + 1)), sendo m e n os tamanhos da
+        menor e da maior. Com trabalhadores > 1 e pelo menos limite_paralelo
+        valores somados, a recursão é dividida entre esse número de
+        processos. O padrão é 1 (sem processos): achatar as subárvores e
+        remontar o resultado no processo atual já custa mais que a operação
+        sequencial inteira (ver perf_test/README.md).
+        """
+        return self._operacao_de_conjunto('uniao', outra, trabalhadores)
+
+    def intersection(self, outra, trabalhadores=1):
+        """
+        Retorna a interseção desta treap com outra, com o mesmo esquema de
+        union. Ambas ficam vazias.
+        """
+        return self._operacao_de_conjunto('intersecao', outra, trabalhadores)
+
+    def difference(self, outra, trabalhadores=1):
+        """
+        Retorna os valores desta treap que não estão em outra, com o mesmo
+        esquema de union. Ambas ficam vazias.
+        """
+        return self._operacao_de_conjunto('diferenca', outra, trabalhadores)
+
+    def _operacao_de_conjunto(self, operacao, outra, trabalhadores):
+        if trabalhadores > 1 and len(self) + len(outra) >= self.limite_paralelo:
+            # Cerca de quatro subproblemas por processo, para equilibrar a
+            # carga: a raiz de uma treap divide os valores em partes desiguais
+            niveis = (trabalhadores - 1).bit_length() + 2
+            with _sem_coleta_de_lixo(), ProcessPoolExecutor(
+                    trabalhadores, initializer=carregar_modulo,
+                    initargs=("arvore-treap.py",)) as executor:
+                raiz = _combinar(_planejar(operacao, self.raiz, outra.raiz, niveis, executor))
+        else:
+            raiz = _OPERACOES[operacao](self.raiz, outra.raiz)
+
+        resultado = self._de_raiz(raiz)
+        self._esvaziar()
+        outra._esvaziar()
+        return resultado
+
+    def __iter__(self):
+        """
+        Itera sobre os valores em ordem crescente, sob demanda.
+        """
+        return self.iter_range()
+
+    def __reversed__(self):
+        """
+        Itera sobre os valores em ordem decrescente, sob demanda.
+        """
+        return self.iter_range(reverse=True)
+
+    def iter_inorder(self):
+        """
+        Versão preguiçosa de percorrer_inorder.
+        """
+        return iter(self)
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi, em ordem crescente
+        (ou decrescente, se reverse for True), com uma pilha explícita.
+        lo ou hi iguais a None deixam o intervalo aberto daquele lado.
+        """
+        pilha = []
+        no = self.raiz
+
+        if not reverse:
+            # Busca inicial: empilha apenas os nós >= lo no caminho até lo
+            while no:
+                if lo is not None and no.valor < lo:
+                    no = no.direito
+                else:
+                    pilha.append(no)
+                    no = no.esquerdo
+
+            while pilha:
+                no = pilha.pop()
+                if hi is not None and no.valor > hi:
+                    return
+                yield no.valor
+
+                no = no.direito
+                while no:
+                    pilha.append(no)
+                    no = no.esquerdo
+        else:
+            # Busca inicial: empilha apenas os nós <= hi no caminho até hi
+            while no:
+                if hi is not None and no.valor > hi:
+                    no = no.esquerdo
+                else:
+                    pilha.append(no)
+                    no = no.direito
+
+            while pilha:
+                no = pilha.pop()
+                if lo is not None and no.valor < lo:
+                    return
+                yield no.valor
+
+                no = no.esquerdo
+                while no:
+                    pilha.append(no)
+                    no = no.direito
+
+    def percorrer_inorder(self):
+        """
+        Percorre a árvore em ordem (esquerda, raiz, direita).
+        Retorna os valores em ordem crescente.
+        """
+        return list(self)
+
+    def obter_altura(self):
+        """
+        Retorna a altura atual da árvore (0 se estiver vazia).
+        """
+        altura = 0
+        pilha = [(self.raiz, 1)] if self.raiz else []
+        while pilha:
+            no, profundidade = pilha.pop()
+            altura = max(altura, profundidade)
+            if no.esquerdo:
+                pilha.append((no.esquerdo, profundidade + 1))
+            if no.direito:
+                pilha.append((no.direito, profundidade + 1))
+        return altura
+
+    def imprimir_arvore(self):
+        """
+        Imprime a estrutura da árvore de forma visual, com as prioridades.
+        """
+        if not self.raiz:
+            print("Árvore vazia")
+            return
+
+        print("Estrutura da treap:")
+        self._imprimir_recursivo(self.raiz, "", True)
+
+    def _imprimir_recursivo(self, no, prefixo, eh_ultimo):
+        """
+        Função auxiliar recursiva para impressão visual da árvore.
+        """
+        if no:
+            print(f"{prefixo}{'└── ' if eh_ultimo else '├── '}{no.valor} (p:{no.prioridade:.2f})")
+            filhos = [filho for filho in (no.esquerdo, no.direito) if filho]
+            for i, filho in enumerate(filhos):
+                novo_prefixo = prefixo + ("    " if eh_ultimo else "│   ")
+                self._imprimir_recursivo(filho, novo_prefixo, i == len(filhos) - 1)
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    arvore = ArvoreTreap.construir(range(1, 11), semente=7)
+    arvore.imprimir_arvore()
+
+    arvore.inserir(15)
+    arvore.remover(4)
+    print("\nEm ordem:", arvore.percorrer_inorder())
+
+    menores, maiores = arvore.split(6)
+    print("split(6):", list(menores), list(maiores))
+    print("join:", list(ArvoreTreap.join(menores, maiores)))
+
+    pares = ArvoreTreap.construir(range(0, 30, 2))
+    triplos = ArvoreTreap.construir(range(0, 30, 3))
+    print("\nPares ∩ múltiplos de 3:", list(pares.intersection(triplos)))
+
+    # Operação grande o bastante para usar o pool de processos
+    grande = ArvoreTreap.construir(range(0, 300000, 2))
+    outra = ArvoreTreap.construir(range(0, 300000, 3))
+    uniao = grande.union(outra, trabalhadores=2)
+    print("União de 150000 com 100000 valores em 2 processos:", len(uniao), "valores")
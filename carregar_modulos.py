@@ -0,0 +1,29 @@
+import importlib.util
+import os
+import sys
+
+DIRETORIO_RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def carregar_modulo(nome_arquivo):
+    """
+    Carrega um módulo da raiz do repositório pelo nome do arquivo.
+
+    Os arquivos das árvores têm hífen no nome (arvore-adl.py,
+    arvore-red-black.py), então não podem ser importados com import comum.
+    O módulo é registrado em sys.modules com o hífen trocado por "_"
+    (arvore-adl.py vira arvore_adl), para ser carregado uma única vez.
+    """
+    nome = os.path.splitext(nome_arquivo)[0].replace("-", "_")
+    if nome in sys.modules:
+        return sys.modules[nome]
+
+    if DIRETORIO_RAIZ not in sys.path:
+        sys.path.insert(0, DIRETORIO_RAIZ)
+
+    caminho = os.path.join(DIRETORIO_RAIZ, nome_arquivo)
+    especificacao = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(especificacao)
+    sys.modules[nome] = modulo
+    especificacao.loader.exec_module(modulo)
+    return modulo
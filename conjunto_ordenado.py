@@ -0,0 +1,202 @@
+"""
+Conjunto ordenado com a interface de collections.abc.MutableSet e a
+árvore de armazenamento escolhida por configuração.
+
+O código que usa ConjuntoOrdenado só conhece add, discard, in, len e a
+iteração em ordem; a árvore por trás (AVL, Red-Black, B+...) é escolhida
+pelo parâmetro backend ou, se ele for omitido, pela variável de ambiente
+CONJUNTO_ORDENADO_BACKEND. Assim dá para comparar as árvores em produção
+trocando uma configuração, sem mudar as chamadas.
+
+Cada backend é um Backend que traduz as operações do conjunto para os
+métodos da árvore (que têm nomes e retornos diferentes: buscar devolve
+bool na AVL e um nó na Red-Black, por exemplo). Novas árvores entram com
+registrar_backend.
+
+tests/test_conjunto_ordenado.py confere todos os backends registrados
+contra um set do Python.
+"""
+import os
+from collections.abc import MutableSet
+
+from carregar_modulos import carregar_modulo
+
+
+class Backend:
+    """
+    Descreve como o conjunto usa uma árvore.
+
+    modulo e classe indicam onde a árvore está (o módulo só é carregado
+    no primeiro uso). As funções recebem a árvore e:
+
+    - adicionar(arvore, valor) insere e retorna True se o valor era novo;
+    - descartar(arvore, valor) remove e retorna True se o valor existia;
+    - contem(arvore, valor) retorna True/False;
+    - intervalo(arvore, lo, hi, reverse) gera os valores em [lo, hi].
+
+    A árvore também deve suportar len, iter, reversed e o método de
+    classe construir(valores) para valores ordenados e sem repetição.
+    """
+
+    def __init__(self, modulo, classe, adicionar, descartar, contem, intervalo):
+        self.modulo = modulo
+        self.classe = classe
+        self.adicionar = adicionar
+        self.descartar = descartar
+        self.contem = contem
+        self.intervalo = intervalo
+
+    def carregar_classe(self):
+        return getattr(carregar_modulo(self.modulo), self.classe)
+
+
+def _adicionar_sem_repetir(arvore, valor):
+    # A Red-Black aceita valores repetidos, então a verificação fica aqui
+    if arvore.buscar(valor) is not None:
+        return False
+    arvore.inserir(valor)
+    return True
+
+
+BACKENDS = {
+    "avl": Backend(
+        "arvore-adl.py", "ArvoreAVL",
+        adicionar=lambda arvore, valor: arvore.inserir(valor),
+        descartar=lambda arvore, valor: arvore.remover(valor),
+        contem=lambda arvore, valor: arvore.buscar(valor),
+        intervalo=lambda arvore, lo, hi, reverse: arvore.iter_range(lo, hi, reverse),
+    ),
+    "red-black": Backend(
+        "arvore-red-black.py", "ArvoreRedBlack",
+        adicionar=_adicionar_sem_repetir,
+        descartar=lambda arvore, valor: arvore.remover(valor),
+        contem=lambda arvore, valor: arvore.buscar(valor) is not None,
+        intervalo=lambda arvore, lo, hi, reverse: arvore.iter_em_ordem(lo, hi, reverse),
+    ),
+    "b-plus": Backend(
+        "arvore-b-plus.py", "ArvoreBPlus",
+        adicionar=lambda arvore, valor: arvore.inserir(valor),
+        descartar=lambda arvore, valor: arvore.remover(valor),
+        contem=lambda arvore, valor: arvore.buscar(valor),
+        intervalo=lambda arvore, lo, hi, reverse: arvore.iter_range(lo, hi, reverse),
+    ),
+    "splay": Backend(
+        "arvore-splay.py", "ArvoreSplay",
+        adicionar=lambda arvore, valor: arvore.inserir(valor),
+        descartar=lambda arvore, valor: arvore.remover(valor),
+        contem=lambda arvore, valor: arvore.buscar(valor),
+        intervalo=lambda arvore, lo, hi, reverse: arvore.iter_range(lo, hi, reverse),
+    ),
+    "treap": Backend(
+        "arvore-treap.py", "ArvoreTreap",
+        adicionar=lambda arvore, valor: arvore.inserir(valor),
+        descartar=lambda arvore, valor: arvore.remover(valor),
+        contem=lambda arvore, valor: arvore.buscar(valor),
+        intervalo=lambda arvore, lo, hi, reverse: arvore.iter_range(lo, hi, reverse),
+    ),
+}
+
+BACKEND_PADRAO = "avl"
+
+
+def registrar_backend(nome, backend):
+    """
+    Disponibiliza uma nova árvore para ConjuntoOrdenado com o nome dado.
+    """
+    BACKENDS[nome] = backend
+
+
+def _backend_configurado():
+    return os.environ.get("CONJUNTO_ORDENADO_BACKEND", BACKEND_PADRAO)
+
+
+class ConjuntoOrdenado(MutableSet):
+    """
+    Conjunto de valores comparáveis, iterado sempre em ordem crescente.
+
+    Além da interface de MutableSet (add, discard, remove, pop, clear,
+    |, &, -, ^, <=, isdisjoint...), oferece intervalo, minimo e maximo.
+    As operações de conjunto entre dois ConjuntoOrdenado devolvem um
+    conjunto com o mesmo backend do operando da esquerda.
+    """
+
+    def __init__(self, valores=(), backend=None):
+        self.backend = backend if backend is not None else _backend_configurado()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"backend desconhecido: {self.backend!r} "
+                             f"(disponíveis: {', '.join(sorted(BACKENDS))})")
+        self._operacoes = BACKENDS[self.backend]
+
+        # Ordena e remove repetições antes de construir a árvore de uma vez
+        unicos = []
+        for valor in sorted(valores):
+            if not unicos or unicos[-1] < valor:
+                unicos.append(valor)
+        self._arvore = self._operacoes.carregar_classe().construir(unicos)
+
+    def _from_iterable(self, valores):
+        # Usado por MutableSet para criar os resultados de |, &, - e ^
+        return type(self)(valores, backend=self.backend)
+
+    def __contains__(self, valor):
+        return self._operacoes.contem(self._arvore, valor)
+
+    def __iter__(self):
+        return iter(self._arvore)
+
+    def __reversed__(self):
+        return reversed(self._arvore)
+
+    def __len__(self):
+        return len(self._arvore)
+
+    def add(self, valor):
+        """
+        Adiciona valor ao conjunto (nada acontece se ele já estiver lá).
+        """
+        self._operacoes.adicionar(self._arvore, valor)
+
+    def discard(self, valor):
+        """
+        Remove valor do conjunto, se ele estiver lá.
+        """
+        self._operacoes.descartar(self._arvore, valor)
+
+    def clear(self):
+        """
+        Esvazia o conjunto de uma vez, sem remover valor a valor.
+        """
+        self._arvore = self._operacoes.carregar_classe().construir([])
+
+    def intervalo(self, lo=None, hi=None, reverse=False):
+        """
+        Gera os valores v com lo <= v <= hi, em ordem crescente
+        (ou decrescente, se reverse for True). None deixa o lado aberto.
+        """
+        return self._operacoes.intervalo(self._arvore, lo, hi, reverse)
+
+    def minimo(self):
+        """
+        Retorna o menor valor. Lança ValueError se o conjunto estiver vazio.
+        """
+        for valor in self:
+            return valor
+        raise ValueError("minimo de um conjunto vazio")
+
+    def maximo(self):
+        """
+        Retorna o maior valor. Lança ValueError se o conjunto estiver vazio.
+        """
+        for valor in reversed(self):
+            return valor
+        raise ValueError("maximo de um conjunto vazio")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r}, backend={self.backend!r})"
+
+
+if __name__ == "__main__":
+    conjunto = ConjuntoOrdenado([30, 10, 20], backend="red-black")
+    conjunto.add(15)
+    print(conjunto)
+    print("Entre 12 e 25:", list(conjunto.intervalo(12, 25)))
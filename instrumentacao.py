@@ -0,0 +1,230 @@
+"""
+Contadores opcionais para as árvores (rotações, recolorações, comparações).
+
+As árvores não carregam nenhum contador no caminho normal: ativar_estatisticas
+troca a classe do objeto por uma subclasse gerada na hora, que combina a
+classe original com um mixin de instrumentação (InstrumentacaoAVL em
+arvore-adl.py, InstrumentacaoRedBlack em arvore-red-black.py). Enquanto a
+instrumentação está desligada, nenhuma verificação extra é feita; ligada,
+os métodos sobrescritos pelo mixin contam os eventos antes de delegar para
+a classe original.
+
+DespejoPeriodico grava um resumo das estatísticas em intervalos regulares,
+em uma thread separada, para acompanhar um processo em execução.
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class Estatisticas:
+    """
+    Contadores de uma árvore instrumentada.
+
+    - buscas e comparacoes: chamadas a buscar e comparações de chaves feitas
+      por elas (na Red-Black, remover também localiza o nó com buscar);
+    - rotacoes: rotações por caso (LL, RR, LR, RL na AVL; esquerda e
+      direita na Red-Black);
+    - casos: quantas vezes cada caso da correção Red-Black foi aplicado
+      (1a a 2c na inserção, remocao_1a a remocao_2d na remoção);
+    - recoloracoes: trocas de cor de fato realizadas.
+    """
+
+    def __init__(self):
+        self.zerar()
+
+    def zerar(self):
+        """
+        Zera todos os contadores.
+        """
+        self.buscas = 0
+        self.comparacoes = 0
+        self.rotacoes = Counter()
+        self.casos = Counter()
+        self.recoloracoes = 0
+
+    def resumo(self, altura=None, profundidade_media=None):
+        """
+        Retorna os contadores num dicionário pronto para virar JSON.
+        """
+        return {
+            "buscas": self.buscas,
+            "comparacoes": self.comparacoes,
+            "comparacoes_por_busca": self.comparacoes / self.buscas if self.buscas else 0.0,
+            "rotacoes": dict(self.rotacoes),
+            "casos": dict(self.casos),
+            "recoloracoes": self.recoloracoes,
+            "altura": altura,
+            "profundidade_media": profundidade_media,
+        }
+
+
+class ValorContado:
+    """
+    Envolve o valor procurado e conta cada comparação feita com ele.
+
+    As buscas comparam o valor com as chaves dos nós dos dois lados
+    (valor < no.valor, no.valor > valor); nos dois casos o Python acaba
+    chamando um dos métodos abaixo, então o mesmo código de busca das
+    árvores serve para contar, sem uma cópia instrumentada.
+    """
+    __slots__ = ('valor', 'estatisticas')
+
+    def __init__(self, valor, estatisticas):
+        self.valor = valor
+        self.estatisticas = estatisticas
+
+    def __lt__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor < outro
+
+    def __le__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor <= outro
+
+    def __gt__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor > outro
+
+    def __ge__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor >= outro
+
+    def __eq__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor == outro
+
+    def __ne__(self, outro):
+        self.estatisticas.comparacoes += 1
+        return self.valor != outro
+
+    def __hash__(self):
+        return hash(self.valor)
+
+
+def medir_forma(raiz, esquerdo, direito, nil=None):
+    """
+    Percorre a árvore com uma pilha explícita e retorna o par
+    (altura, profundidade média dos nós), com a raiz na profundidade 1.
+    esquerdo e direito são os nomes dos atributos dos filhos e nil é o
+    nó que representa a ausência de filho (None ou a sentinela NIL).
+    """
+    altura = 0
+    total = 0
+    quantidade = 0
+    pilha = [(raiz, 1)]
+    while pilha:
+        no, profundidade = pilha.pop()
+        if no is None or no is nil:
+            continue
+        quantidade += 1
+        total += profundidade
+        if profundidade > altura:
+            altura = profundidade
+        pilha.append((getattr(no, esquerdo), profundidade + 1))
+        pilha.append((getattr(no, direito), profundidade + 1))
+    return altura, (total / quantidade if quantidade else 0.0)
+
+
+_classes_instrumentadas = {}
+
+
+def ativar(arvore, mixin):
+    """
+    Liga a instrumentação de uma árvore: troca a classe dela por uma
+    subclasse que combina mixin com a classe original (criada uma única
+    vez por par) e cria os contadores. Retorna os contadores.
+    """
+    if isinstance(arvore, mixin):
+        return arvore.estatisticas
+
+    original = type(arvore)
+    chave = (mixin, original)
+    if chave not in _classes_instrumentadas:
+        _classes_instrumentadas[chave] = _criar_classe_instrumentada(mixin, original)
+    arvore.estatisticas = Estatisticas()
+    arvore.__class__ = _classes_instrumentadas[chave]
+    return arvore.estatisticas
+
+
+def _criar_classe_instrumentada(mixin, original):
+    """
+    Cria a subclasse que combina mixin com a classe original.
+
+    A classe original fica guardada em _classe_original, para desativar.
+    O __init__ cria os contadores, porque as árvores criam árvores novas
+    com type(self)() (split, join, operações de conjunto, snapshot) e
+    essas árvores também precisam de estatisticas.
+    """
+    def __init__(self, *args, **kwargs):
+        original.__init__(self, *args, **kwargs)
+        self.estatisticas = Estatisticas()
+
+    return type(original.__name__ + "Instrumentada", (mixin, original),
+                {"__init__": __init__, "_classe_original": original})
+
+
+def desativar(arvore, mixin):
+    """
+    Desliga a instrumentação, devolvendo a árvore à sua classe original.
+    Não faz nada se ela não estiver instrumentada.
+    """
+    if isinstance(arvore, mixin):
+        arvore.__class__ = type(arvore)._classe_original
+        del arvore.estatisticas
+
+
+class DespejoPeriodico(threading.Thread):
+    """
+    Thread que grava, a cada intervalo segundos, uma linha JSON com o
+    relatório de cada árvore instrumentada de arvores (um dicionário
+    nome -> árvore) no arquivo destino (sys.stderr por padrão).
+
+    A altura e a profundidade média são medidas percorrendo a árvore no
+    momento do despejo; se outra thread estiver alterando a árvore ao
+    mesmo tempo, esses dois valores são aproximados. Com com_forma=False
+    só os contadores são gravados, sem percorrer nada.
+
+        despejo = DespejoPeriodico({"indice": arvore}, intervalo=10)
+        despejo.start()
+        ...
+        despejo.parar()
+    """
+
+    def __init__(self, arvores, intervalo=60.0, destino=None, com_forma=True):
+        super().__init__(daemon=True)
+        self.arvores = arvores
+        self.intervalo = intervalo
+        self.destino = destino
+        self.com_forma = com_forma
+        self._parada = threading.Event()
+
+    def run(self):
+        while not self._parada.wait(self.intervalo):
+            self.despejar()
+
+    def despejar(self):
+        """
+        Grava uma linha com o relatório atual de cada árvore.
+        """
+        registro = {
+            "instante": time.time(),
+            "arvores": {
+                nome: arvore.relatorio_estatisticas(self.com_forma)
+                for nome, arvore in self.arvores.items()
+                if hasattr(arvore, "estatisticas")
+            },
+        }
+        destino = self.destino if self.destino is not None else sys.stderr
+        destino.write(json.dumps(registro) + "\n")
+        destino.flush()
+
+    def parar(self):
+        """
+        Interrompe a thread depois de um último despejo.
+        """
+        self._parada.set()
+        self.join()
+        self.despejar()
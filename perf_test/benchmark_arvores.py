@@ -0,0 +1,253 @@
+"""
+Suíte de benchmarks das árvores sob cargas de trabalho configuráveis.
+
+Cada carga parte de uma árvore pré-carregada com --tamanho chaves e executa
+--operacoes operações geradas de antemão (a geração não entra na medição).
+Para cada par (árvore, carga) são medidos:
+
+- vazão total (ops/s);
+- latência por operação, p50 e p99, no geral e por tipo de operação;
+- pico de memória (tracemalloc), numa segunda rodada separada, porque o
+  tracemalloc deixa as alocações bem mais lentas;
+- altura da árvore ao final.
+
+O resultado é impresso como tabela e, com --saida, gravado em JSON junto
+com o commit atual, para comparar execuções entre commits.
+
+    python perf_test/benchmark_arvores.py --cargas leitura zipf --saida resultado.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+from instrumentacao import medir_forma
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+ArvoreRedBlack = carregar_modulo("arvore-red-black.py").ArvoreRedBlack
+ArvoreBPlus = carregar_modulo("arvore-b-plus.py").ArvoreBPlus
+
+
+# Como cada árvore faz as operações que os nomes genéricos abaixo representam
+ARVORES = {
+    "avl": {
+        "construir": ArvoreAVL.construir,
+        "intervalo": lambda arvore, lo, hi: arvore.iter_range(lo, hi),
+        "altura": lambda arvore: arvore.obter_altura(arvore.raiz),
+    },
+    "red-black": {
+        "construir": ArvoreRedBlack.construir,
+        "intervalo": lambda arvore, lo, hi: arvore.iter_em_ordem(lo, hi),
+        "altura": lambda arvore: medir_forma(arvore.raiz, "esquerda", "direita", arvore.NIL)[0],
+    },
+    "b-plus": {
+        "construir": ArvoreBPlus.construir,
+        "intervalo": lambda arvore, lo, hi: arvore.iter_range(lo, hi),
+        "altura": lambda arvore: arvore.obter_altura(),
+    },
+}
+
+# Proporção de cada operação em cada carga
+CARGAS = {
+    "insercao": {"inserir": 0.9, "buscar": 0.1},
+    "leitura": {"buscar": 0.95, "inserir": 0.05},
+    "misto": {"buscar": 0.4, "inserir": 0.3, "remover": 0.3},
+    "sequencial": {"inserir": 1.0},
+    "zipf": {"buscar": 1.0},
+    "intervalo": {"intervalo": 0.9, "inserir": 0.1},
+}
+
+
+def gerar_chaves_zipf(chaves, quantidade, expoente, gerador):
+    """
+    Sorteia quantidade chaves de chaves com distribuição de Zipf: a chave
+    de posição k (numa ordem embaralhada) tem peso 1 / k^expoente.
+    """
+    pesos_acumulados = list(accumulate(1.0 / (k ** expoente) for k in range(1, len(chaves) + 1)))
+    ordem = chaves[:]
+    gerador.shuffle(ordem)
+    return gerador.choices(ordem, cum_weights=pesos_acumulados, k=quantidade)
+
+
+def gerar_carga(nome, tamanho, quantidade, largura_intervalo, expoente_zipf, semente):
+    """
+    Gera as chaves iniciais e a lista de operações (operação, argumento).
+
+    As chaves iniciais são os pares de 0 a 2 * tamanho, então metade das
+    buscas e remoções aleatórias acerta, e as inserções usam ímpares
+    distintos, sem repetir nenhuma chave. Na carga sequencial as
+    inserções usam chaves crescentes acima de todas.
+    """
+    gerador = random.Random(semente)
+    iniciais = list(range(0, 2 * tamanho, 2))
+    limite = 2 * tamanho
+
+    if nome == "zipf":
+        return iniciais, [("buscar", chave) for chave in
+                          gerar_chaves_zipf(iniciais, quantidade, expoente_zipf, gerador)]
+
+    proporcoes = CARGAS[nome]
+    tipos = gerador.choices(list(proporcoes), weights=list(proporcoes.values()), k=quantidade)
+    proxima_sequencial = limite
+    # Ímpares distintos para as inserções: nenhuma repete uma chave inicial
+    # nem outra inserção, então as árvores que aceitam repetidos
+    # (Red-Black) fazem o mesmo trabalho das que os rejeitam
+    inseridas = 0 if nome == "sequencial" else tipos.count("inserir")
+    impares = iter(gerador.sample(range(1, 2 * max(tamanho, inseridas), 2), inseridas))
+    operacoes = []
+    for tipo in tipos:
+        if tipo == "intervalo":
+            lo = gerador.randrange(limite)
+            operacoes.append((tipo, (lo, lo + 2 * largura_intervalo)))
+        elif nome == "sequencial":
+            operacoes.append((tipo, proxima_sequencial))
+            proxima_sequencial += 1
+        elif tipo == "inserir":
+            operacoes.append((tipo, next(impares)))
+        else:
+            operacoes.append((tipo, gerador.randrange(limite)))
+    return iniciais, operacoes
+
+
+def executar(adaptador, iniciais, operacoes, medir_latencia=True):
+    """
+    Constrói a árvore e executa as operações. Retorna a árvore, o tempo
+    total e as latências (ns) de cada operação agrupadas por tipo.
+    """
+    arvore = adaptador["construir"](iniciais)
+    intervalo = adaptador["intervalo"]
+    funcoes = {
+        "inserir": arvore.inserir,
+        "buscar": arvore.buscar,
+        "remover": arvore.remover,
+        # Consome o gerador do intervalo inteiro
+        "intervalo": lambda limites: sum(1 for _ in intervalo(arvore, *limites)),
+    }
+    latencias = {tipo: [] for tipo in funcoes}
+    relogio = time.perf_counter_ns
+
+    inicio = relogio()
+    if medir_latencia:
+        for tipo, argumento in operacoes:
+            antes = relogio()
+            funcoes[tipo](argumento)
+            latencias[tipo].append(relogio() - antes)
+    else:
+        for tipo, argumento in operacoes:
+            funcoes[tipo](argumento)
+    total = relogio() - inicio
+
+    return arvore, total, {tipo: valores for tipo, valores in latencias.items() if valores}
+
+
+def percentil(ordenados, fracao):
+    """
+    Percentil pelo método do vizinho mais próximo sobre uma lista ordenada.
+    """
+    if not ordenados:
+        return 0
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+def resumir_latencias(valores):
+    ordenados = sorted(valores)
+    return {"p50": percentil(ordenados, 0.50), "p99": percentil(ordenados, 0.99),
+            "operacoes": len(ordenados)}
+
+
+def medir(nome_arvore, nome_carga, iniciais, operacoes):
+    adaptador = ARVORES[nome_arvore]
+
+    gc.collect()
+    arvore, total_ns, latencias = executar(adaptador, iniciais, operacoes)
+    altura = adaptador["altura"](arvore)
+    del arvore
+
+    # Segunda rodada só para a memória: construção mais operações
+    gc.collect()
+    tracemalloc.start()
+    arvore, _, _ = executar(adaptador, iniciais, operacoes, medir_latencia=False)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del arvore
+
+    todas = [valor for valores in latencias.values() for valor in valores]
+    return {
+        "arvore": nome_arvore,
+        "carga": nome_carga,
+        "tamanho_inicial": len(iniciais),
+        "operacoes": len(operacoes),
+        "ops_por_segundo": len(operacoes) / (total_ns / 1e9),
+        "latencia_ns": resumir_latencias(todas),
+        "latencia_por_operacao_ns": {tipo: resumir_latencias(valores)
+                                     for tipo, valores in latencias.items()},
+        "pico_memoria_bytes": pico,
+        "altura": altura,
+    }
+
+
+def commit_atual():
+    """
+    Hash do commit atual do repositório, ou None fora de um checkout git.
+    """
+    try:
+        saida = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--arvores", nargs="+", choices=list(ARVORES), default=["avl", "red-black"])
+    parser.add_argument("--cargas", nargs="+", choices=list(CARGAS), default=list(CARGAS))
+    parser.add_argument("--tamanho", type=int, default=100000,
+                        help="quantidade de chaves pré-carregadas")
+    parser.add_argument("--operacoes", type=int, default=100000,
+                        help="operações executadas por carga")
+    parser.add_argument("--largura-intervalo", type=int, default=100,
+                        help="quantidade aproximada de chaves em cada consulta por intervalo")
+    parser.add_argument("--expoente-zipf", type=float, default=1.1)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    argumentos = parser.parse_args()
+
+    resultados = []
+    print(f"{'Carga':<12}{'Árvore':<12}{'ops/s':>12}{'p50 (ns)':>11}{'p99 (ns)':>11}"
+          f"{'Pico (MB)':>11}{'Altura':>8}")
+    for nome_carga in argumentos.cargas:
+        iniciais, operacoes = gerar_carga(nome_carga, argumentos.tamanho, argumentos.operacoes,
+                                          argumentos.largura_intervalo, argumentos.expoente_zipf,
+                                          argumentos.semente)
+        for nome_arvore in argumentos.arvores:
+            resultado = medir(nome_arvore, nome_carga, iniciais, operacoes)
+            resultados.append(resultado)
+            print(f"{nome_carga:<12}{nome_arvore:<12}{resultado['ops_por_segundo']:>12.0f}"
+                  f"{resultado['latencia_ns']['p50']:>11}{resultado['latencia_ns']['p99']:>11}"
+                  f"{resultado['pico_memoria_bytes'] / 2**20:>11.1f}{resultado['altura']:>8}")
+
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "commit": commit_atual(),
+                "python": platform.python_version(),
+                "instante": time.time(),
+                "parametros": vars(argumentos),
+                "resultados": resultados,
+            }, arquivo, indent=2)
+        print(f"\nResultados gravados em {argumentos.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import gc
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+arvore_adl = carregar_modulo("arvore-adl.py")
+ArvoreAVL = arvore_adl.ArvoreAVL
+ArvoreAVLCompacta = arvore_adl.ArvoreAVLCompacta
+
+sizes = [10000, 100000, 1000000]
+
+
+def inserir_todos(classe, valores):
+    arvore = classe()
+    for valor in valores:
+        arvore.inserir(valor)
+    return arvore
+
+
+def medir(classe, valores):
+    """
+    Retorna o tempo de inserção dos valores numa árvore nova, os bytes
+    alocados por chave e o tempo de uma coleta completa do gc com a
+    árvore viva. A memória é medida numa segunda rodada, porque o
+    tracemalloc deixa as alocações bem mais lentas.
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    arvore = inserir_todos(classe, valores)
+    end_time = time.perf_counter()
+
+    start_gc = time.perf_counter()
+    gc.collect()
+    tempo_gc = time.perf_counter() - start_gc
+    del arvore
+
+    gc.collect()
+    tracemalloc.start()
+    arvore = inserir_todos(classe, valores)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return end_time - start_time, memoria / len(valores), tempo_gc
+
+
+for size in sizes:
+    # Chaves grandes o bastante para não caírem no cache de inteiros pequenos
+    valores = random.sample(range(10**9, 10**9 + size * 10), size)
+
+    tempo_objetos, bytes_objetos, gc_objetos = medir(ArvoreAVL, valores)
+    tempo_compacta, bytes_compacta, gc_compacta = medir(ArvoreAVLCompacta, valores)
+
+    print(f"{'Quantidade':<15}{'Versão':<12}{'Inserção (s)':<15}{'Bytes/chave':<15}{'gc.collect (s)':<15}")
+    print(f"{size:<15}{'NoAVL':<12}{tempo_objetos:<15.3f}{bytes_objetos:<15.1f}{gc_objetos:<15.4f}")
+    print(f"{size:<15}{'Compacta':<12}{tempo_compacta:<15.3f}{bytes_compacta:<15.1f}{gc_compacta:<15.4f}")
+    print()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+
+sizes = [1000, 10000, 100000]
+
+
+def inserir_recursivo(arvore, valores):
+    for valor in valores:
+        arvore.raiz = arvore._inserir_recursivo(arvore.raiz, valor)
+
+
+def inserir_iterativo(arvore, valores):
+    for valor in valores:
+        arvore.inserir(valor)
+
+
+def buscar_recursivo(arvore, valores):
+    for valor in valores:
+        arvore._buscar_recursivo(arvore.raiz, valor)
+
+
+def buscar_iterativo(arvore, valores):
+    for valor in valores:
+        arvore.buscar(valor)
+
+
+def remover_recursivo(arvore, valores):
+    for valor in valores:
+        arvore.raiz = arvore._remover_recursivo(arvore.raiz, valor)
+
+
+def remover_iterativo(arvore, valores):
+    for valor in valores:
+        arvore.remover(valor)
+
+
+def medir(funcao, arvore, valores):
+    start_time = time.perf_counter()
+    funcao(arvore, valores)
+    end_time = time.perf_counter()
+    return len(valores) / (end_time - start_time)
+
+
+for size in sizes:
+    valores = random.sample(range(size * 10), size)
+    buscas = random.sample(range(size * 10), size)
+    remocoes = random.sample(valores, size)
+
+    arvore_recursiva = ArvoreAVL()
+    arvore_iterativa = ArvoreAVL()
+
+    resultados = [
+        ("inserir", medir(inserir_recursivo, arvore_recursiva, valores),
+         medir(inserir_iterativo, arvore_iterativa, valores)),
+        ("buscar", medir(buscar_recursivo, arvore_recursiva, buscas),
+         medir(buscar_iterativo, arvore_iterativa, buscas)),
+        ("remover", medir(remover_recursivo, arvore_recursiva, remocoes),
+         medir(remover_iterativo, arvore_iterativa, remocoes)),
+    ]
+
+    print(f"{'Quantidade':<15}{'Operação':<15}{'Recursiva (ops/s)':<22}{'Iterativa (ops/s)':<22}{'Ganho':<10}")
+    for operacao, recursiva, iterativa in resultados:
+        print(f"{size:<15}{operacao:<15}{recursiva:<22.0f}{iterativa:<22.0f}{iterativa / recursiva:<10.2f}")
+    print()
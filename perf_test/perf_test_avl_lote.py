@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+
+tree_size = 100000
+batch_sizes = [100, 1000, 10000, 25000, 50000, 100000]
+
+base = random.sample(range(tree_size * 20), tree_size)
+
+
+def nova_arvore():
+    return ArvoreAVL.construir(base)
+
+
+def inserir_um_por_um(arvore, lote):
+    for valor in lote:
+        arvore.inserir(valor)
+
+
+def inserir_descidas_ordenadas(arvore, lote):
+    arvore._inserir_ordenados(sorted(lote))
+
+
+def inserir_reconstrucao(arvore, lote):
+    arvore._reconstruir_com_lote(sorted(lote), inserir=True)
+
+
+def inserir_automatico(arvore, lote):
+    arvore.inserir_muitos(lote)
+
+
+def remover_um_por_um(arvore, lote):
+    for valor in lote:
+        arvore.remover(valor)
+
+
+def remover_descidas_ordenadas(arvore, lote):
+    arvore._remover_ordenados(sorted(lote))
+
+
+def remover_reconstrucao(arvore, lote):
+    arvore._reconstruir_com_lote(sorted(lote), inserir=False)
+
+
+def remover_automatico(arvore, lote):
+    arvore.remover_muitos(lote)
+
+
+def medir(funcao, lote, repeticoes=3):
+    """
+    Retorna a melhor vazão (valores/s) entre algumas repetições,
+    cada uma sobre uma árvore nova.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        arvore = nova_arvore()
+        start_time = time.perf_counter()
+        funcao(arvore, lote)
+        end_time = time.perf_counter()
+        melhor = min(melhor, end_time - start_time)
+    return len(lote) / melhor
+
+
+for operacao, funcoes, gerar_lote in (
+    ("Inserção", (inserir_um_por_um, inserir_descidas_ordenadas, inserir_reconstrucao, inserir_automatico),
+     lambda batch_size: random.sample(range(tree_size * 20), batch_size)),
+    ("Remoção", (remover_um_por_um, remover_descidas_ordenadas, remover_reconstrucao, remover_automatico),
+     lambda batch_size: random.sample(base, batch_size)),
+):
+    print(f"{operacao} de lotes aleatórios numa árvore com {tree_size} valores (valores/s)")
+    print(f"{'Lote':<10}{'Um por um':<15}{'Descidas':<15}{'Reconstrução':<15}{'Automático':<15}")
+    for batch_size in batch_sizes:
+        lote = gerar_lote(batch_size)
+        resultados = [medir(funcao, lote) for funcao in funcoes]
+        print(f"{batch_size:<10}" + "".join(f"{resultado:<15.0f}" for resultado in resultados))
+    print()
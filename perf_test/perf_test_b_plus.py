@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+ArvoreRedBlack = carregar_modulo("arvore-red-black.py").ArvoreRedBlack
+ArvoreBPlus = carregar_modulo("arvore-b-plus.py").ArvoreBPlus
+
+sizes = [10000, 100000, 1000000]
+
+versoes = [
+    ("AVL", ArvoreAVL),
+    ("Red-Black", ArvoreRedBlack),
+    ("B+ (16)", lambda: ArvoreBPlus(16)),
+    ("B+ (64)", lambda: ArvoreBPlus(64)),
+    ("B+ (256)", lambda: ArvoreBPlus(256)),
+]
+
+
+def niveis_por_busca(arvore):
+    """
+    Quantidade de nós visitados por uma busca típica: a altura da árvore
+    B+ ou a profundidade média dos nós nas árvores binárias.
+    """
+    if isinstance(arvore, ArvoreBPlus):
+        return arvore.obter_altura()
+
+    nil = getattr(arvore, "NIL", None)
+    total = 0
+    pilha = [(arvore.raiz, 1)]
+    while pilha:
+        no, profundidade = pilha.pop()
+        if no is None or no is nil:
+            continue
+        total += profundidade
+        esquerdo = getattr(no, "esquerdo", None) or getattr(no, "esquerda", None)
+        direito = getattr(no, "direito", None) or getattr(no, "direita", None)
+        pilha.append((esquerdo, profundidade + 1))
+        pilha.append((direito, profundidade + 1))
+    return total / len(arvore)
+
+
+def medir(fabrica, valores, consultas, removidos):
+    arvore = fabrica()
+
+    start_time = time.perf_counter()
+    for valor in valores:
+        arvore.inserir(valor)
+    tempo_inserir = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for valor in consultas:
+        arvore.buscar(valor)
+    tempo_buscar = time.perf_counter() - start_time
+
+    # Percurso completo em ordem, sob demanda
+    start_time = time.perf_counter()
+    for _ in arvore:
+        pass
+    tempo_percorrer = time.perf_counter() - start_time
+
+    niveis = niveis_por_busca(arvore)
+
+    start_time = time.perf_counter()
+    for valor in removidos:
+        arvore.remover(valor)
+    tempo_remover = time.perf_counter() - start_time
+
+    return (len(valores) / tempo_inserir, len(consultas) / tempo_buscar,
+            len(valores) / tempo_percorrer, len(removidos) / tempo_remover, niveis)
+
+
+print(f"{'Tamanho':<10}{'Versão':<12}{'Inserir':<12}{'Buscar':<12}"
+      f"{'Percorrer':<12}{'Remover':<12}{'Nós/busca':<10}")
+for size in sizes:
+    valores = random.sample(range(size * 10), size)
+    consultas = random.sample(valores, min(size, 100000))
+    removidos = random.sample(valores, size // 2)
+
+    for nome, fabrica in versoes:
+        inserir, buscar, percorrer, remover, niveis = medir(fabrica, valores, consultas, removidos)
+        print(f"{size:<10}{nome:<12}{inserir:<12.0f}{buscar:<12.0f}"
+              f"{percorrer:<12.0f}{remover:<12.0f}{niveis:<10.1f}")
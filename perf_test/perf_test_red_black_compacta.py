@@ -0,0 +1,56 @@
+import gc
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+from arvore_red_black_original import ArvoreRedBlack as ArvoreRedBlackOriginal
+
+ArvoreRedBlack = carregar_modulo("arvore-red-black.py").ArvoreRedBlack
+
+sizes = [10000, 100000, 500000]
+
+
+def inserir_todos(classe, valores):
+    arvore = classe()
+    for valor in valores:
+        arvore.inserir(valor)
+    return arvore
+
+
+def medir(classe, valores):
+    """
+    Retorna a vazão de inserção (ops/s) numa árvore nova e os bytes
+    alocados por nó. A memória é medida numa segunda rodada, porque o
+    tracemalloc deixa as alocações bem mais lentas.
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    arvore = inserir_todos(classe, valores)
+    end_time = time.perf_counter()
+    del arvore
+
+    gc.collect()
+    tracemalloc.start()
+    arvore = inserir_todos(classe, valores)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(valores) / (end_time - start_time), memoria / len(valores)
+
+
+print(f"{'Quantidade':<15}{'Versão':<12}{'Inserção (ops/s)':<20}{'Bytes/nó':<15}")
+for size in sizes:
+    # Chaves grandes o bastante para não caírem no cache de inteiros pequenos
+    valores = random.sample(range(10**9, 10**9 + size * 10), size)
+
+    ops_original, bytes_original = medir(ArvoreRedBlackOriginal, valores)
+    ops_compacta, bytes_compacta = medir(ArvoreRedBlack, valores)
+
+    print(f"{size:<15}{'Original':<12}{ops_original:<20.0f}{bytes_original:<15.1f}")
+    print(f"{size:<15}{'Slots':<12}{ops_compacta:<20.0f}{bytes_compacta:<15.1f}")
+    print(f"{'':<15}{'Ganho':<12}{ops_compacta / ops_original:<20.2f}{bytes_original / bytes_compacta:<15.2f}")
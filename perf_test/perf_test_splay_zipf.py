@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+from benchmark_arvores import gerar_chaves_zipf
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+ArvoreRedBlack = carregar_modulo("arvore-red-black.py").ArvoreRedBlack
+ArvoreSplay = carregar_modulo("arvore-splay.py").ArvoreSplay
+
+tamanho = 100000
+buscas = 500000
+
+versoes = [("AVL", ArvoreAVL), ("Red-Black", ArvoreRedBlack), ("Splay", ArvoreSplay)]
+
+
+def trace_quente(chaves, quantidade, fracao_quente, fracao_trafego, gerador):
+    """
+    fracao_trafego das buscas vão para fracao_quente das chaves (sorteadas
+    uniformemente dentro do grupo quente) e o resto para as demais chaves.
+    """
+    embaralhadas = chaves[:]
+    gerador.shuffle(embaralhadas)
+    corte = max(1, int(len(chaves) * fracao_quente))
+    quentes, frias = embaralhadas[:corte], embaralhadas[corte:]
+    return [gerador.choice(quentes) if gerador.random() < fracao_trafego else gerador.choice(frias)
+            for _ in range(quantidade)]
+
+
+def profundidade(arvore, valor):
+    """
+    Quantidade de nós visitados até achar valor, sem alterar a árvore.
+    """
+    nil = getattr(arvore, "NIL", None)
+    no = arvore.raiz
+    visitados = 1
+    while no.valor != valor:
+        if valor < no.valor:
+            no = no.esquerdo if nil is None else no.esquerda
+        else:
+            no = no.direito if nil is None else no.direita
+        visitados += 1
+    return visitados
+
+
+gerador = random.Random(42)
+chaves = list(range(0, 2 * tamanho, 2))
+traces = [
+    ("Uniforme", [gerador.choice(chaves) for _ in range(buscas)]),
+    ("Zipf 0.8", gerar_chaves_zipf(chaves, buscas, 0.8, gerador)),
+    ("Zipf 1.1", gerar_chaves_zipf(chaves, buscas, 1.1, gerador)),
+    ("90% em 1%", trace_quente(chaves, buscas, 0.01, 0.9, gerador)),
+]
+
+print(f"{'Trace':<12}{'Árvore':<12}{'Buscas/s':<12}{'Nós/busca':<10}")
+for nome_trace, trace in traces:
+    for nome, classe in versoes:
+        arvore = classe.construir(chaves)
+        start_time = time.perf_counter()
+        for valor in trace:
+            arvore.buscar(valor)
+        end_time = time.perf_counter()
+
+        # Segunda rodada, numa árvore nova, medindo a profundidade de cada
+        # chave no momento em que ela é buscada
+        arvore = classe.construir(chaves)
+        visitados = 0
+        for valor in trace:
+            visitados += profundidade(arvore, valor)
+            arvore.buscar(valor)
+
+        print(f"{nome_trace:<12}{nome:<12}{len(trace) / (end_time - start_time):<12.0f}"
+              f"{visitados / len(trace):<10.1f}")
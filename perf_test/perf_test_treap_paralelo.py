@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreTreap = carregar_modulo("arvore-treap.py").ArvoreTreap
+
+tamanho = 500000
+trabalhadores = [1, 2, 4]      # 1 = sem processos (recursão sequencial)
+repeticoes = 3
+
+# Duas treaps com metade dos valores em comum
+gerador = random.Random(42)
+universo = list(range(3 * tamanho // 2))
+primeira = sorted(gerador.sample(universo, tamanho))
+segunda = sorted(gerador.sample(universo, tamanho))
+
+operacoes = ["union", "intersection", "difference"]
+
+print(f"Núcleos disponíveis: {os.cpu_count()}")
+print(f"{'Operação':<14}{'Processos':<11}{'Tempo (s)':<11}{'Speedup':<8}")
+for operacao in operacoes:
+    base = None
+    for quantidade in trabalhadores:
+        tempos = []
+        for _ in range(repeticoes):
+            # As operações esvaziam as treaps, então cada rodada constrói as suas
+            a = ArvoreTreap.construir(primeira, semente=1)
+            b = ArvoreTreap.construir(segunda, semente=2)
+            inicio = time.perf_counter()
+            getattr(a, operacao)(b, trabalhadores=quantidade)
+            tempos.append(time.perf_counter() - inicio)
+        tempo = min(tempos)
+        if base is None:
+            base = tempo
+        print(f"{operacao:<14}{quantidade:<11}{tempo:<11.3f}{base / tempo:<8.2f}")
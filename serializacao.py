@@ -0,0 +1,166 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Cabeçalho do arquivo:
+# - assinatura (4 bytes): b'ARVB'
+# - versão do formato (1 byte)
+# - código de tipo das chaves no módulo array (1 byte, ex.: b'q', b'd')
+# - ordem dos bytes (1 byte): b'<' (little-endian) ou b'>' (big-endian)
+# - 1 byte livre
+# - quantidade de chaves (8 bytes)
+# Depois do cabeçalho vêm as chaves em ordem crescente, com largura fixa.
+# O cabeçalho tem 16 bytes, então as chaves ficam alinhadas em 8 bytes.
+ASSINATURA = b'ARVB'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sBccxQ')
+ORDEM_NATIVA = b'<' if sys.byteorder == 'little' else b'>'
+
+
+def salvar_chaves(caminho, chaves, tipo='q'):
+    """
+    Grava as chaves (já em ordem crescente) num arquivo binário.
+
+    tipo é o código de tipo do módulo array: 'q' para inteiros de 64 bits,
+    'd' para floats, etc. Chaves que não cabem no tipo geram o mesmo
+    erro que o array geraria (OverflowError ou TypeError).
+    """
+    colunas = array(tipo, chaves)
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO, tipo.encode(),
+                                     ORDEM_NATIVA, len(colunas)))
+        colunas.tofile(arquivo)
+
+
+def ler_cabecalho(dados):
+    """
+    Valida o cabeçalho e retorna o par (tipo, quantidade).
+    """
+    if len(dados) < CABECALHO.size:
+        raise ValueError("arquivo muito curto para conter o cabeçalho")
+
+    assinatura, versao, tipo, ordem, quantidade = CABECALHO.unpack_from(dados)
+    if assinatura != ASSINATURA:
+        raise ValueError("o arquivo não é uma árvore serializada")
+    if versao != VERSAO:
+        raise ValueError(f"versão do formato não suportada: {versao}")
+
+    tipo = tipo.decode()
+    if CABECALHO.size + quantidade * array(tipo).itemsize > len(dados):
+        raise ValueError("arquivo truncado")
+    if ordem != ORDEM_NATIVA:
+        raise ValueError("o arquivo foi gravado com outra ordem de bytes")
+    return tipo, quantidade
+
+
+class ChavesMapeadas:
+    """
+    Sequência somente leitura com as chaves de um arquivo salvo por
+    salvar_chaves, lidas direto do arquivo mapeado em memória (mmap).
+
+    Abrir o arquivo não lê as chaves: o sistema operacional carrega as
+    páginas sob demanda, na primeira vez que cada parte é acessada.
+    """
+
+    def __init__(self, caminho):
+        with open(caminho, 'rb') as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            tipo, quantidade = ler_cabecalho(self._mapa)
+            largura = array(tipo).itemsize
+            self._chaves = memoryview(self._mapa)[
+                CABECALHO.size:CABECALHO.size + quantidade * largura].cast(tipo)
+        except BaseException:
+            # Arquivo inválido: desfaz o mapeamento antes de propagar o erro
+            self._mapa.close()
+            raise
+        self.tipo = tipo
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def __getitem__(self, indice):
+        return self._chaves[indice]
+
+    def __iter__(self):
+        return iter(self._chaves)
+
+    def fechar(self):
+        """
+        Libera a visão sobre o arquivo e desfaz o mapeamento.
+        """
+        self._chaves.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+class ArvoreSomenteLeitura:
+    """
+    Conjunto ordenado somente leitura sobre um arquivo de chaves mapeado.
+
+    Responde buscar com busca binária direto no array ordenado do arquivo,
+    sem construir nenhum nó: o "início a quente" custa só o mmap, e as
+    consultas são O(log n) como numa árvore balanceada.
+    """
+
+    def __init__(self, caminho):
+        self._chaves = ChavesMapeadas(caminho)
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def buscar(self, valor):
+        """
+        Retorna True se o valor estiver no arquivo, False caso contrário.
+        """
+        chaves = self._chaves
+        posicao = bisect_left(chaves, valor)
+        return posicao < len(chaves) and chaves[posicao] == valor
+
+    def __contains__(self, valor):
+        return self.buscar(valor)
+
+    def __iter__(self):
+        return iter(self._chaves)
+
+    def __reversed__(self):
+        chaves = self._chaves
+        for posicao in range(len(chaves) - 1, -1, -1):
+            yield chaves[posicao]
+
+    def iter_range(self, lo=None, hi=None, reverse=False):
+        """
+        Gera as chaves v com lo <= v <= hi, em ordem, sob demanda.
+        """
+        chaves = self._chaves
+        inicio = 0 if lo is None else bisect_left(chaves, lo)
+        fim = len(chaves) if hi is None else bisect_right(chaves, hi)
+        posicoes = range(fim - 1, inicio - 1, -1) if reverse else range(inicio, fim)
+        for posicao in posicoes:
+            yield chaves[posicao]
+
+    def percorrer_inorder(self):
+        """
+        Retorna uma lista com as chaves em ordem crescente.
+        """
+        return list(self._chaves)
+
+    def fechar(self):
+        """
+        Desfaz o mapeamento do arquivo.
+        """
+        self._chaves.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
@@ -0,0 +1,120 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from conjunto_ordenado import BACKENDS, ConjuntoOrdenado
+
+
+def verificar_conformidade(backend, operacoes=3000, semente=0):
+    """
+    Confere se ConjuntoOrdenado com o backend dado se comporta como um set
+    do Python mantido em ordem. Executa uma sequência aleatória de
+    operações comparando com o set de referência e depois testa os métodos
+    herdados de MutableSet, as consultas por intervalo e os casos de borda.
+    Lança AssertionError com a primeira divergência encontrada.
+    """
+    gerador = random.Random(semente)
+    conjunto = ConjuntoOrdenado(backend=backend)
+    referencia = set()
+
+    def conferir(contexto):
+        assert len(conjunto) == len(referencia), f"{contexto}: len {len(conjunto)} != {len(referencia)}"
+        assert list(conjunto) == sorted(referencia), f"{contexto}: iteração fora de ordem ou incompleta"
+        assert list(reversed(conjunto)) == sorted(referencia, reverse=True), f"{contexto}: reversed"
+
+    # Operações aleatórias comparadas com o set de referência
+    for passo in range(operacoes):
+        valor = gerador.randrange(200)
+        escolha = gerador.random()
+        if escolha < 0.45:
+            conjunto.add(valor)
+            referencia.add(valor)
+        elif escolha < 0.8:
+            conjunto.discard(valor)
+            referencia.discard(valor)
+        else:
+            assert (valor in conjunto) == (valor in referencia), f"passo {passo}: {valor} in"
+        if passo % 100 == 0:
+            conferir(f"passo {passo}")
+    conferir("fim das operações aleatórias")
+
+    # Métodos herdados de MutableSet
+    outro = set(gerador.sample(range(200), 60))
+    assert set(conjunto | outro) == referencia | outro, "união"
+    assert set(conjunto & outro) == referencia & outro, "interseção"
+    assert set(conjunto - outro) == referencia - outro, "diferença"
+    assert set(conjunto ^ outro) == referencia ^ outro, "diferença simétrica"
+    assert isinstance(conjunto | outro, ConjuntoOrdenado), "o resultado deve ser um ConjuntoOrdenado"
+    assert (conjunto | outro).backend == backend, "o resultado deve manter o backend"
+    assert conjunto.isdisjoint(outro) == referencia.isdisjoint(outro), "isdisjoint"
+    assert (conjunto & outro) <= conjunto, "subconjunto"
+    assert conjunto == ConjuntoOrdenado(referencia, backend=backend), "igualdade"
+    assert conjunto == referencia, "igualdade com set"
+
+    copia = ConjuntoOrdenado(conjunto, backend=backend)
+    copia |= outro
+    assert copia == referencia | outro, "|="
+    copia -= outro
+    assert copia == referencia - outro, "-="
+
+    # Construção com valores repetidos e fora de ordem
+    repetidos = ConjuntoOrdenado([5, 3, 5, 1, 3, 9, 1], backend=backend)
+    assert list(repetidos) == [1, 3, 5, 9], "construção com repetidos"
+    repetidos.add(5)
+    assert len(repetidos) == 4, "add de um valor existente"
+
+    # Intervalos, mínimo e máximo
+    ordenados = sorted(referencia)
+    for _ in range(50):
+        lo, hi = sorted(gerador.randrange(-10, 210) for _ in range(2))
+        esperado = [valor for valor in ordenados if lo <= valor <= hi]
+        assert list(conjunto.intervalo(lo, hi)) == esperado, f"intervalo({lo}, {hi})"
+        assert list(conjunto.intervalo(lo, hi, reverse=True)) == esperado[::-1], "intervalo reverso"
+    assert list(conjunto.intervalo()) == ordenados, "intervalo aberto"
+    if ordenados:
+        assert conjunto.minimo() == ordenados[0] and conjunto.maximo() == ordenados[-1], "minimo/maximo"
+
+    # pop retira o menor; remove lança KeyError para ausentes
+    if ordenados:
+        assert conjunto.pop() == ordenados[0], "pop"
+        referencia.discard(ordenados[0])
+    try:
+        conjunto.remove(-1)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("remove de valor ausente deveria lançar KeyError")
+
+    conjunto.clear()
+    referencia.clear()
+    conferir("clear")
+    for metodo in (conjunto.pop, conjunto.minimo, conjunto.maximo):
+        try:
+            metodo()
+        except (KeyError, ValueError):
+            pass
+        else:
+            raise AssertionError(f"{metodo.__name__} de conjunto vazio deveria falhar")
+
+
+def test_backends_esperados_registrados():
+    assert {"avl", "red-black", "b-plus", "splay", "treap"} <= set(BACKENDS)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_conformidade(backend):
+    verificar_conformidade(backend)
+
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        ConjuntoOrdenado(backend="inexistente")
+
+
+def test_backend_pela_variavel_de_ambiente(monkeypatch):
+    monkeypatch.setenv("CONJUNTO_ORDENADO_BACKEND", "splay")
+    assert ConjuntoOrdenado([3, 1, 2]).backend == "splay"
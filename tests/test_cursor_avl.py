@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreAVL = carregar_modulo("arvore-adl.py").ArvoreAVL
+
+
+def test_next_depois_de_remover_o_valor_atual():
+    arvore = ArvoreAVL.construir(range(0, 20, 2))
+    cursor = arvore.cursor(10)
+    arvore.remover(10)
+    assert cursor.next() == 12
+
+
+def test_next_depois_de_remover_no_com_dois_filhos():
+    # 108 tem dois filhos: a remoção copia o sucessor (110) para dentro do nó
+    arvore = ArvoreAVL.construir([100, 108, 110, 121])
+    cursor = arvore.cursor(108)
+    arvore.remover(108)
+    assert cursor.next() == 110
+
+
+def test_prev_depois_de_remover_o_valor_atual():
+    arvore = ArvoreAVL.construir([100, 108, 110, 121])
+    cursor = arvore.cursor(108)
+    arvore.remover(108)
+    assert cursor.prev() == 100
+
+    arvore = ArvoreAVL.construir(range(0, 20, 2))
+    cursor = arvore.cursor(18)
+    arvore.remover(18)
+    assert cursor.prev() == 16
+
+
+def test_iteracao_com_remocao_durante_o_percurso():
+    arvore = ArvoreAVL.construir(range(0, 20, 2))
+    vistos = []
+    for valor in arvore.cursor(4):
+        vistos.append(valor)
+        if valor == 12:
+            arvore.remover(12)
+    assert vistos == [4, 6, 8, 10, 12, 14, 16, 18]
+
+
+def test_next_e_prev_com_alteracoes_aleatorias():
+    gerador = random.Random(14)
+    for _ in range(200):
+        valores = set(gerador.sample(range(100), 40))
+        arvore = ArvoreAVL.construir(sorted(valores))
+        cursor = arvore.cursor(gerador.randrange(100))
+        # A posição esperada é o último valor devolvido pelo cursor, e não
+        # cursor.valor, para que uma posição corrompida não passe despercebida
+        posicao = cursor.valor
+        for _ in range(60):
+            escolha = gerador.random()
+            if escolha < 0.3 and valores:
+                # Metade das vezes remove justamente o valor sob o cursor
+                if posicao is not None and gerador.random() < 0.5:
+                    alvo = posicao
+                else:
+                    alvo = gerador.choice(sorted(valores))
+                arvore.remover(alvo)
+                valores.discard(alvo)
+            elif escolha < 0.4:
+                alvo = gerador.randrange(100)
+                arvore.inserir(alvo)
+                valores.add(alvo)
+            elif posicao is None:
+                posicao = cursor.seek(gerador.randrange(100))
+            elif escolha < 0.7:
+                esperado = min((v for v in valores if v > posicao), default=None)
+                posicao = cursor.next()
+                assert posicao == esperado
+            else:
+                esperado = max((v for v in valores if v < posicao), default=None)
+                posicao = cursor.prev()
+                assert posicao == esperado
@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+arvore_adl = carregar_modulo("arvore-adl.py")
+arvore_red_black = carregar_modulo("arvore-red-black.py")
+
+
+def forma_red_black(arvore):
+    """
+    Valores e cores em pré-ordem, com None marcando cada NIL.
+    """
+    resultado = []
+    pilha = [arvore.raiz]
+    while pilha:
+        no = pilha.pop()
+        if no is arvore.NIL:
+            resultado.append(None)
+            continue
+        resultado.append((no.valor, no.cor))
+        pilha.append(no.direita)
+        pilha.append(no.esquerda)
+    return resultado
+
+
+def aplicar_operacoes(arvore, semente, quantidade=5000):
+    gerador = random.Random(semente)
+    for _ in range(quantidade):
+        valor = gerador.randrange(1000)
+        if gerador.random() < 0.6:
+            arvore.inserir(valor)
+        else:
+            arvore.remover(valor)
+
+
+def test_correcoes_instrumentadas_produzem_a_mesma_red_black():
+    # As correções do mixin são cópias das originais: as duas versões
+    # precisam aplicar os mesmos casos, rotações e cores
+    for semente in range(5):
+        original = arvore_red_black.ArvoreRedBlack()
+        instrumentada = arvore_red_black.ArvoreRedBlack()
+        estatisticas = instrumentada.ativar_estatisticas()
+        aplicar_operacoes(original, semente)
+        aplicar_operacoes(instrumentada, semente)
+
+        assert forma_red_black(instrumentada) == forma_red_black(original)
+        assert instrumentada.validar()
+        assert sum(estatisticas.rotacoes.values()) > 0
+        assert sum(estatisticas.casos.values()) > 0
+        assert estatisticas.recoloracoes > 0
+
+
+def test_desativar_volta_a_classe_original():
+    for classe in (arvore_red_black.ArvoreRedBlack, arvore_adl.ArvoreAVL):
+        arvore = classe()
+        arvore.ativar_estatisticas()
+        arvore.desativar_estatisticas()
+        assert type(arvore) is classe
+        assert not hasattr(arvore, "estatisticas")
+
+
+def test_arvores_derivadas_de_uma_instrumentada_tem_contadores():
+    arvore = arvore_adl.ArvoreAVL.construir(range(20))
+    arvore.ativar_estatisticas()
+    menores, maiores = arvore.split(10)
+    for derivada in (menores, maiores):
+        assert derivada.buscar(derivada.percorrer_inorder()[0])
+        assert derivada.estatisticas.buscas == 1
+        derivada.desativar_estatisticas()
+        assert type(derivada) is arvore_adl.ArvoreAVL
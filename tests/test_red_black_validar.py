@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from carregar_modulos import carregar_modulo
+
+ArvoreRedBlack = carregar_modulo("arvore-red-black.py").ArvoreRedBlack
+
+# Tamanhos perfeitos (2^k - 1), em que construir deixa todos os níveis
+# completos e pretos, e tamanhos com o último nível incompleto
+TAMANHOS = [0, 1, 2, 1023, 1024, 5000, 2 ** 15 - 1, 50000]
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_validar_apos_construir_e_alteracoes(tamanho):
+    gerador = random.Random(tamanho)
+    valores = list(range(0, 2 * tamanho, 2))
+    arvore = ArvoreRedBlack.construir(valores)
+    assert arvore.validar()
+    assert len(arvore) == tamanho
+
+    referencia = Counter(valores)
+
+    # Fase 1: inserções, incluindo valores repetidos
+    for _ in range(max(100, tamanho // 4)):
+        valor = gerador.randrange(2 * tamanho + 10)
+        arvore.inserir(valor)
+        referencia[valor] += 1
+    assert arvore.validar()
+
+    # Fase 2: remoções isoladas, metade delas de valores ausentes
+    for _ in range(max(100, tamanho // 4)):
+        valor = gerador.randrange(2 * tamanho + 10)
+        if arvore.remover(valor):
+            referencia[valor] -= 1
+    assert arvore.validar()
+
+    # Fase 3: remover_muitos com lote pequeno (remoção a remoção)...
+    lote = gerador.sample(sorted(referencia.elements()), referencia.total() // 10)
+    arvore.remover_muitos(lote)
+    for valor in lote:
+        referencia[valor] -= 1
+    assert arvore.validar()
+
+    # ...e com lote grande (reconstrução)
+    lote = gerador.sample(sorted(referencia.elements()), referencia.total() * 2 // 3)
+    arvore.remover_muitos(lote)
+    for valor in lote:
+        referencia[valor] -= 1
+    assert arvore.validar()
+
+    # Fase 4: inserções e remoções misturadas depois da reconstrução
+    for _ in range(max(100, tamanho // 4)):
+        valor = gerador.randrange(2 * tamanho + 10)
+        if gerador.random() < 0.5:
+            arvore.inserir(valor)
+            referencia[valor] += 1
+        elif arvore.remover(valor):
+            referencia[valor] -= 1
+    assert arvore.validar()
+    assert list(arvore) == sorted(referencia.elements())
+    assert len(arvore) == referencia.total()
+
+
+def test_validar_detecta_violacoes():
+    arvore = ArvoreRedBlack.construir(range(100))
+    arvore.raiz.esquerda.cor = not arvore.raiz.esquerda.cor
+    with pytest.raises(ValueError):
+        arvore.validar()